@@ -14,6 +14,11 @@ __status__ = "Development"
 #import random
 #import itertools
 import copy
+import hashlib
+import heapq
+import imp
+import marshal
+import operator
 import re
 from datetime import date
 import time
@@ -74,19 +79,280 @@ def get_dec_from_bin_arr(arr):
 	Return values:
 	res -- the decimal number equal to the binary value (int)
 	"""
-	i = 0
 	res = 0
-	for val in arr[::-1]:
-		res += val*(2**i)
-		i += 1
+	for val in arr:
+		res = 2*res + val
 	return res
 
+LANE_BITS = 64
+
+def pack_lanes(states):
+	"""
+	Pack the states of entities across scenarios into bit-sliced words, one bit per scenario.
+	
+	Arguments:
+	states -- 0/1 states, one row per scenario and one column per entity
+	
+	Return values:
+	words -- the states of each entity across scenarios, scenario s in bit s%64 of word s//64
+	         (uint64 numpy array, one row per entity)
+	"""
+	states = np.asarray(states, dtype=np.uint64)
+	n_lanes, n_ent = states.shape
+	n_words = -(-n_lanes//LANE_BITS)
+	padded = np.zeros((n_words*LANE_BITS, n_ent), dtype=np.uint64)
+	padded[:n_lanes] = states & np.uint64(1)
+	shifts = np.arange(LANE_BITS, dtype=np.uint64)[:, np.newaxis]
+	words = (padded.reshape(n_words, LANE_BITS, n_ent) << shifts).sum(axis=1, dtype=np.uint64)
+	return np.ascontiguousarray(words.T)
+
+def unpack_lanes(words, n_lanes):
+	"""
+	Unpack bit-sliced words into the states of entities across scenarios.
+	
+	Arguments:
+	words -- the states of each entity across scenarios (uint64 numpy array, one row per entity)
+	n_lanes -- the number of scenarios packed in the words
+	
+	Return values:
+	states -- 0/1 states, one row per scenario and one column per entity (uint8 numpy array)
+	"""
+	words = np.asarray(words, dtype=np.uint64)
+	shifts = np.arange(LANE_BITS, dtype=np.uint64)
+	bits = (words[:, :, np.newaxis] >> shifts) & np.uint64(1)
+	return bits.reshape(words.shape[0], -1)[:, :n_lanes].T.astype(np.uint8)
+
+def add_lanes(words, weights):
+	"""
+	Add up whole-number weights of bit-sliced 0/1 inputs, scenario by scenario, with a bit-sliced
+	adder: each bit of a weight is added into the column of its place value, carrying upwards.
+	
+	Arguments:
+	words -- the inputs across scenarios (uint64 numpy array, one row per input)
+	weights -- the non-negative whole-number weight of each input (list of ints)
+	
+	Return values:
+	the bits of the weighted sums across scenarios, least significant first (list of uint64
+	numpy arrays)
+	"""
+	sum_words = []
+	for input_words, weight in zip(words, weights):
+		column = 0
+		while weight > 0:
+			if weight & 1:
+				while len(sum_words) < column:
+					sum_words.append(np.zeros_like(input_words))
+				carry = input_words
+				j = column
+				while carry.any():
+					if j == len(sum_words):
+						sum_words.append(carry)
+						break
+					sum_words[j], carry = sum_words[j] ^ carry, sum_words[j] & carry
+					j += 1
+			weight >>= 1
+			column += 1
+	return sum_words
+
+def lanes_at_least(sum_words, k, n_words):
+	"""
+	Compare bit-sliced sums with a whole number, from the least significant bit up.
+	
+	Arguments:
+	sum_words -- the bits of the sums across scenarios, least significant first (see add_lanes)
+	k -- the whole number
+	n_words -- the number of words per row
+	
+	Return values:
+	the scenarios whose sum is at least k (uint64 numpy array)
+	"""
+	zeros = np.zeros(n_words, dtype=np.uint64)
+	result = ~zeros
+	if k <= 0:
+		return result
+	for j in range(max(len(sum_words), k.bit_length())):
+		bit = sum_words[j] if j < len(sum_words) else zeros
+		result = (bit & result) if (k >> j) & 1 else (bit | result)
+	return result
+
+class PackedTruthTable(object):
+	"""
+	Resultant states of an entity stored one bit per state, state i in bit i%64 of word i//64.
+	Can be used wherever a numpy array of resultant states is accepted: it has a length, indexed
+	lookup of single states, iteration, and converts to a uint8 numpy array with np.asarray.
+
+	Public methods:
+	to_array, to_json, set_from_json
+
+	Instance variables:
+	length -- the number of states
+	words -- the packed states (uint64 numpy array, unused bits of the last word are 0)
+	"""
+	__slots__ = ['length', 'words']
+	__hash__ = None
+
+	def __init__(self, states=()):
+		"""
+		Pack a sequence of 0/1 states.
+
+		Keyword arguments:
+		states -- the states (default (); no states)
+		"""
+		bits = np.asarray(states, dtype=np.uint8).ravel()
+		self.length = len(bits)
+		padded = np.zeros(-(-self.length//LANE_BITS)*LANE_BITS, dtype=np.uint8)
+		padded[:self.length] = bits != 0
+		# packbits puts the first bit in the most significant place, so reverse each byte
+		self.words = np.packbits(padded.reshape(-1, 8)[:, ::-1]).view('<u8').astype(np.uint64)
+
+	def __len__(self):
+		return self.length
+
+	def _get_position(self, index):
+		"""
+		Find the word and bit of a state.
+
+		Arguments:
+		index -- the position of the state (negative counts from the end)
+
+		Return values:
+		the word index and the bit within the word (tuple)
+
+		Exceptions:
+		IndexError -- raised when index is out of range
+		"""
+		index = operator.index(index)
+		if index < 0:
+			index += self.length
+		if not 0 <= index < self.length:
+			raise IndexError('truth table index out of range')
+		return index >> 6, index & 63
+
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			return self.to_array()[index]
+		word, bit = self._get_position(index)
+		return int(self.words[word] >> np.uint64(bit)) & 1
+
+	def __setitem__(self, index, value):
+		word, bit = self._get_position(index)
+		mask = np.uint64(1) << np.uint64(bit)
+		if value:
+			self.words[word] |= mask
+		else:
+			self.words[word] &= ~mask
+
+	def __iter__(self):
+		return iter(self.to_array().tolist())
+
+	def __array__(self, dtype=None):
+		states = self.to_array()
+		if dtype is not None:
+			return states.astype(dtype)
+		return states
+
+	def __eq__(self, other):
+		if isinstance(other, PackedTruthTable):
+			return self.length == other.length and np.array_equal(self.words, other.words)
+		return self.to_array() == other
+
+	def __ne__(self, other):
+		if isinstance(other, PackedTruthTable):
+			return not self == other
+		return self.to_array() != other
+
+	def __copy__(self):
+		table = PackedTruthTable()
+		table.length = self.length
+		table.words = self.words.copy()
+		return table
+
+	def __deepcopy__(self, memo):
+		return self.__copy__()
+
+	def __repr__(self):
+		return 'PackedTruthTable(%r)' % self.to_array().tolist()
+
+	def _valid(self):
+		"""
+		Check that the words hold exactly length states.
+
+		Return values:
+		True -- if words has the right size and its unused bits are 0
+		False -- otherwise
+		"""
+		if not (isinstance(self.words, np.ndarray) and self.words.dtype == np.uint64 and
+		        self.words.shape == (-(-self.length//LANE_BITS),)):
+			return False
+		if self.length % LANE_BITS != 0:
+			unused = ~((np.uint64(1) << np.uint64(self.length % LANE_BITS)) - np.uint64(1))
+			return not self.words[-1] & unused
+		return True
+
+	def to_array(self):
+		"""
+		Return values:
+		the states (uint8 numpy array)
+		"""
+		bits = np.unpackbits(self.words.astype('<u8').view(np.uint8)).reshape(-1, 8)[:, ::-1]
+		return bits.ravel()[:self.length]
+
+	def _to_obj(self):
+		"""
+		Return values:
+		the length and the hex digits of the little-endian words, as stored in JSON (dict)
+		"""
+		return {'length': self.length, 'words': self.words.astype('<u8').tostring().encode('hex')}
+
+	def _set_from_obj(self, obj):
+		"""
+		Set the table from the object stored in JSON.
+
+		Arguments:
+		obj -- the length and the hex digits of the little-endian words (dict)
+
+		Exceptions:
+		ValueError -- raised when obj is not in the proper form or does not hold length states
+		"""
+		try:
+			length = int(obj['length'])
+			words = np.frombuffer(str(obj['words']).decode('hex'), dtype='<u8').astype(np.uint64)
+		except (KeyError, TypeError, ValueError):
+			raise ValueError('json text must be of form "length": ..., "words": ...')
+		table = PackedTruthTable()
+		table.length = length
+		table.words = words
+		if length < 0 or not table._valid():
+			raise ValueError('words do not hold length states')
+		self.length = length
+		self.words = words
+
+	def to_json(self):
+		"""
+		Return values:
+		the table as JSON text (str)
+		"""
+		return json.dumps(self._to_obj())
+
+	def set_from_json(self, json_text):
+		"""
+		Set the table with given values from JSON text.
+
+		Arguments:
+		json_text -- the JSON text containing the table, from to_json
+
+		Exceptions:
+		ValueError -- raised when JSON text is not in the proper form
+		"""
+		self._set_from_obj(json.loads(json_text))
+
 def valid_state(state, st_len, verbose=False):
 	"""
 	Determine if the state is properly formed.
 	
 	Arguments:
-	state -- a list of zeros and or ones representing entity states
+	state -- a list of zeros and or ones representing entity states, or a PackedTruthTable or
+	         BDDTruthTable
 	st_len -- the length that state should be
 	
 	Keyword arguments:
@@ -99,10 +365,26 @@ def valid_state(state, st_len, verbose=False):
 	Exceptions:
 	ValueError -- raised when verbose mode on and states are invalid
 	"""
-	if len(state) != st_len:
+	if isinstance(state, BDDTruthTable):
+		length = state.length  # may be too many states for len
+	else:
+		length = len(state)
+	if length != st_len:
 		if verbose:
 			raise ValueError('Length of states should be ', st_len)
 		return False
+	if isinstance(state, BDDTruthTable):
+		if not state._valid():
+			if verbose:
+				raise ValueError('BDD states test variables other than their own')
+			return False
+		return True
+	if isinstance(state, PackedTruthTable):
+		if not state._valid():
+			if verbose:
+				raise ValueError('Packed states do not match their length')
+			return False
+		return True
 	if not (set(state) == set([0, 1]) or set(state) == set([0]) or set(state) == set([1])):
 		if verbose:
 			raise ValueError('Each state must be 0 or 1')
@@ -137,1924 +419,6108 @@ class ENTTYPE:
 	TIME = 'time'
 	TYPES = (FUNCTION, ANTECEDENT, RESOURCE, SYSTEM, EVENT, TIME)
 
-class GMORModel(object):
+class PROGSTATUS:
+	"""
+	PROGSTATUS: Outcomes of a progression, in the order they are checked, except that a deadline
+	that passes before a dependency exit halts the progression is missed first
 	"""
-	Builds and modifies a GMOR entity model.
 	
-	Public methods:
-	set_and_check, set_and_check_json, is_ent, are_ents, is_dep, valid_res_sts,
-	n_dep_of_ent, num_res_sts, num_ents, get_ents_with_internal_dep, valid_parent,
-	ents_ready, deps_ready, res_sts_ready, res_lm_ready, op_p_ready, ready,
-	add_entity, add_dep, merge_models, set_res_sts, set_op_perf_levs, set_res_lim,
-	del_entity,	del_dep, edit_entity
+	OK = 0
+	DEPENDENCY_EXIT = 1
+	NOT_ENOUGH_TIME = 2
+	NOT_ENOUGH_RESOURCES = 3
+	NAMES = ('ok', 'dependency exit', 'not enough time', 'not enough resources')
+
+class SCREENSTATUS:
+	"""
+	SCREENSTATUS: Outcomes of screening a scenario without progressing it
+	"""
 	
+	FEASIBLE = 0
+	INFEASIBLE = 1
+	AMBIGUOUS = 2
+	NAMES = ('feasible', 'infeasible', 'ambiguous')
+
+class GATETYPE:
+	"""
+	GATETYPE: Permitted types of gate giving the resultant state of an entity, as an alternative to
+	a table of resultant states. A gate is a dict with the gate 'type' and a list of 'inputs', each
+	either a dependency of the entity or another gate; k_of_n gates also have the number 'k' of
+	inputs that must be 1, and threshold gates the non-negative 'weights' of the inputs and the
+	'threshold' their weighted sum must reach.
+	"""
+
+	AND = 'and'
+	OR = 'or'
+	K_OF_N = 'k_of_n'
+	THRESHOLD = 'threshold'
+	TYPES = (AND, OR, K_OF_N, THRESHOLD)
+
+GATE_TOLERANCE = 1e-9  # weighted sums within this of a gate's threshold reach it
+
+def _prune_gate(gate, dep):
+	"""
+	Remove a dependency from the inputs of a gate, along with any gates left with no inputs.
+	k_of_n gates need at most as many inputs to be 1 as they have left.
+
+	Arguments:
+	gate -- the gate
+	dep -- the dependency
+
+	Return values:
+	the pruned gate (dict), or None if no inputs are left
+	"""
+	inputs = []
+	weights = []
+	for k, gate_input in enumerate(gate['inputs']):
+		if isinstance(gate_input, dict):
+			gate_input = _prune_gate(gate_input, dep)
+		if gate_input is not None and gate_input != dep:
+			inputs.append(gate_input)
+			if gate['type'] == GATETYPE.THRESHOLD:
+				weights.append(gate['weights'][k])
+	if len(inputs) == 0:
+		return None
+	pruned = dict(gate)
+	pruned['inputs'] = inputs
+	if gate['type'] == GATETYPE.THRESHOLD:
+		pruned['weights'] = weights
+	elif gate['type'] == GATETYPE.K_OF_N:
+		pruned['k'] = min(gate['k'], len(inputs))
+	return pruned
+
+def _get_gate_weights(gate):
+	"""
+	Express a gate as a threshold gate.
+
+	Arguments:
+	gate -- the gate
+
+	Return values:
+	the weight of each input (list of floats) and the threshold their weighted sum must reach
+	(float)
+	"""
+	n_inputs = len(gate['inputs'])
+	if gate['type'] == GATETYPE.THRESHOLD:
+		return [float(weight) for weight in gate['weights']], float(gate['threshold'])
+	if gate['type'] == GATETYPE.AND:
+		threshold = float(n_inputs)
+	elif gate['type'] == GATETYPE.OR:
+		threshold = 1.0
+	else:
+		threshold = float(gate['k'])
+	return [1.0]*n_inputs, threshold
+
+class BDDManager(object):
+	"""
+	Shared reduced ordered binary decision diagram (BDD) nodes over the states of entities.
+	Node 0 is the constant 0 and node 1 the constant 1. Every other node n tests the variable
+	order[levels[n]], going to lows[n] when it is 0 and to highs[n] when it is 1, and tests it
+	before any variable later in order. Nodes are never repeated, so two nodes are equal exactly
+	when their functions are, and the functions of many entities can share nodes.
+
+	Public methods:
+	add_variable, get_node, get_var_node, from_table, from_gate, from_manager, ite, evaluate,
+	is_monotone, probability, cut_sets, count_nodes
+
 	Instance variables:
-	entities, ent_types, parents, dependencies, resultant_states,
-	resource_limits, op_performance_levels
+	order -- the variables, in the order they are tested
+	levels -- the position in order of the variable tested by each node (TERMINAL_LEVEL for 0 and 1)
+	lows -- the node each node goes to when its variable is 0
+	highs -- the node each node goes to when its variable is 1
 	"""
-	
-	def __init__(self):
-		"""
-		Constructs a new (and initially empty) model.
+	TERMINAL_LEVEL = 2**62
+
+	def __init__(self, order=()):
 		"""
-		self.entities = []
-		self.ent_types = {}
-		self.parents = {}
-		self.dependencies = {}
-		self.resultant_states = {}
-		self.resource_limits = {}
-		self.op_performance_levels = {}
+		Constructs a new manager with only the constant nodes.
 
-	def set_and_check(self, entities, ent_types, parents, dependencies, resultant_states, 
-	                  resource_limits, op_performance_levels):
+		Keyword arguments:
+		order -- the variables, in the order they are tested (default (); variables are added
+		         in the order they are first used)
+		"""
+		self.order = []
+		self.levels = [self.TERMINAL_LEVEL, self.TERMINAL_LEVEL]
+		self.lows = [0, 1]
+		self.highs = [0, 1]
+		self._positions = {}
+		self._unique = {}
+		self._ite_cache = {}
+		for var in order:
+			self.add_variable(var)
+
+	def __len__(self):
+		return len(self.levels)
+
+	def add_variable(self, var):
 		"""
-		Set model with given values and check that it's ready for analysis.
-		
+		Add a variable after all others, unless it is already in the order.
+
 		Arguments:
-		entities -- the entities that will populate the model
-		ent_types -- the type of each entity in the model
-		parents -- the parent of each entity (can be another entity, a type, or blank)
-		dependencies -- for each entity, the list of entities it depends on
-		resultant_states -- for each entity, a list of states resulting from the state of it's dependencies
-		resource_limits -- the total amount available of each resource entity
-		op_performance_levels -- the performance level of each function entity when active
-		
+		var -- the variable
+
 		Return values:
-		True -- if the model is ready for analysis
-		False -- otherwise
+		the position of var in the order (int)
 		"""
-		self._set(entities, ent_types, parents, dependencies, resultant_states, 
-		          resource_limits, op_performance_levels)
+		if var not in self._positions:
+			self._positions[var] = len(self.order)
+			self.order.append(var)
+		return self._positions[var]
 
-		if self.ready():
-			return True
-		return False
+	def get_node(self, level, low, high):
+		"""
+		Get the node testing a variable, creating it if needed.
 
-	def set_and_check_json(self, json_text):
+		Arguments:
+		level -- the position in the order of the variable
+		low -- the node to go to when the variable is 0
+		high -- the node to go to when the variable is 1
+
+		Return values:
+		the node (int), which is low itself when low and high are the same
+		"""
+		if low == high:
+			return low
+		key = (level, low, high)
+		node = self._unique.get(key)
+		if node is None:
+			node = len(self.levels)
+			self.levels.append(level)
+			self.lows.append(low)
+			self.highs.append(high)
+			self._unique[key] = node
+		return node
+
+	def get_var_node(self, var):
 		"""
-		Set model with given values from JSON text and check that it's ready for analysis.
-		
+		Return values:
+		the node that is 1 exactly when var is 1 (int)
+		"""
+		return self.get_node(self.add_variable(var), 0, 1)
+
+	def from_table(self, variables, states):
+		"""
+		Build the node for a table of states, such as the resultant states of an entity.
+
 		Arguments:
-		json_text -- the JSON text containing values for the model variables
-		
+		variables -- the variables of the table; state i has variables[k] equal to bit
+		             len(variables)-1-k of i
+		states -- the 0/1 states (2**len(variables) of them)
+
 		Return values:
-		True -- if the model is ready for analysis
-		False -- otherwise
-		
+		the node (int)
+
 		Exceptions:
-		ValueError -- raised when JSON text is not in the proper form
+		ValueError -- raised when there are not 2**len(variables) states
+		"""
+		states = np.asarray(states, dtype=np.int64).ravel()
+		n_var = len(variables)
+		if len(states) != 2**n_var:
+			raise ValueError('need 2**len(variables) states')
+		var_levels = [self.add_variable(var) for var in variables]
+		# put the axes in the order the variables are tested, and merge the last one first
+		axes = sorted(range(n_var), key=lambda k: var_levels[k])
+		nodes = (states != 0).astype(np.int64)
+		if n_var > 0:
+			nodes = nodes.reshape((2,)*n_var).transpose(axes).ravel()
+		for k in reversed(axes):
+			# merge each distinct (low, high) pair once, found as distinct low*n_nodes+high keys
+			n_nodes = len(self.levels)
+			pairs = nodes.reshape(-1, 2)
+			keys, inverse = np.unique(pairs[:, 0]*n_nodes + pairs[:, 1], return_inverse=True)
+			merged = [self.get_node(var_levels[k], *divmod(key, n_nodes)) for key in keys.tolist()]
+			nodes = np.array(merged, dtype=np.int64)[inverse]
+		return int(nodes[0])
+
+	def from_gate(self, gate):
 		"""
-		try:
-			obj = json.loads(json_text)
-			entities = obj['entities']
-			ent_types = obj['ent_types']
-			parents = obj['parents']
-			dependencies = obj['dependencies']
-			resultant_states = obj['resultant_states']
-			resource_limits = obj['resource_limits']
-			op_performance_levels = obj['op_performance_levels']
-			
-			for ent in entities:
-				if type(resultant_states[ent]).__module__ != np.__name__:
-					resultant_states[ent] = np.array(resultant_states[ent])
-			
-			return self.set_and_check(entities, ent_types, parents, dependencies, resultant_states, 
-			                          resource_limits, op_performance_levels)
-		except:
-			raise ValueError('json text must be of form' + \
-				'"entities": [], ' + \
-				'"ent_types": {}, ' + \
-				'"parents": {}, ' + \
-				'"dependencies": {}, ' + \
-				'"resultant_states": {}, ' + \
-				'"resource_limits": {}, ' + \
-				'"op_performance_levels": {}')
+		Build the node for a gate (see GATETYPE), whose inputs are variables or gates.
 
+		Arguments:
+		gate -- the gate
 
-	def _set(self, entities, ent_types, parents, dependencies, resultant_states, 
-	             resource_limits, op_performance_levels):
+		Return values:
+		the node (int)
 		"""
-		Set the model variables with the given values.
+		inputs = [self.from_gate(gate_input) if isinstance(gate_input, dict)
+		          else self.get_var_node(gate_input) for gate_input in gate['inputs']]
+		weights, threshold = _get_gate_weights(gate)
+		remaining = [sum(weights[k:]) for k in range(len(weights)+1)]
+		nodes = {}
 		
+		def _get_node(k, total):
+			"""
+			Build the node for inputs k on, with total the weight of the earlier inputs that are 1.
+			"""
+			if total >= threshold - GATE_TOLERANCE:
+				return 1
+			if total + remaining[k] < threshold - GATE_TOLERANCE:
+				return 0
+			if (k, total) not in nodes:
+				nodes[(k, total)] = self.ite(inputs[k], _get_node(k+1, total + weights[k]), 
+				                             _get_node(k+1, total))
+			return nodes[(k, total)]
+		
+		return _get_node(0, 0.0)
+
+	def from_manager(self, manager, node, variables=None):
+		"""
+		Copy a node of another manager into this one, in this manager's order.
+
 		Arguments:
-		entities -- the entities that will populate the model
-		ent_types -- the type of each entity in the model
-		parents -- the parent of each entity (can be another entity, a type, or blank)
-		dependencies -- for each entity, the list of entities it depends on
-		resultant_states -- for each entity, a list of states resulting from the state of it's dependencies
-		resource_limits -- the total amount available of each resource entity
-		op_performance_levels -- the performance level of each function entity when active
+		manager -- the other BDDManager
+		node -- the node of manager
+
+		Keyword arguments:
+		variables -- the variable of this manager for each variable of manager (dict; default
+		             None; the same variables)
+
+		Return values:
+		the node in this manager (int)
 		"""
-		self.entities = entities
-		self.ent_types = ent_types
-		self.parents = parents
-		self.dependencies = dependencies
-		self.resultant_states = resultant_states
-		self.resource_limits = resource_limits
-		self.op_performance_levels = op_performance_levels
+		nodes = {0: 0, 1: 1}
+		
+		def _copy(node):
+			"""
+			Copy a node, its low and high nodes first.
+			"""
+			if node not in nodes:
+				var = manager.order[manager.levels[node]]
+				if variables is not None:
+					var = variables[var]
+				var_node = self.get_var_node(var)
+				nodes[node] = self.ite(var_node, _copy(manager.highs[node]),
+				                       _copy(manager.lows[node]))
+			return nodes[node]
+		
+		if manager is self and variables is None:
+			return node
+		return _copy(node)
 
-	def formatted_json_text(self):
+	def _cofactors(self, node, level):
 		"""
-		Useful for saving GMORModel models as json strings that are human readable.
-		Creates a string that prints nicely in json format (but is not a json loaded object). 
+		Return values:
+		the nodes of node with the variable at level in the order 0 and 1 (tuple)
 		"""
-		out = ''
-		out += '{\n'
-		for key in self.__dict__:
-			if key != "entities":
-				out += "\t\""+key+"\":{\n"
-				do_fix = False
-				for ent in self.__dict__[key]:
-					do_fix = True
-					out += "\t\t\""+ent+"\":"
-					if key == "resultant_states":
-						out += str(list(self.resultant_states[ent]))+",\n"
-					elif key == "dependencies" or key == "parents" or key == "ent_types":
-						out += json.dumps(self.__dict__[key][ent]) + ',\n'
-					else:
-						out += str(self.__dict__[key][ent])+",\n"
-				if do_fix:
-					out = out[:-2]
-					out += '\n'
-				out += "\t},\n"
-			else:
-				out += "\t\""+key+"\":[\n"
-				for ent in self.entities:
-					out += "\t\t\""+ent+"\","
-					out += '\n'
-				out = out[:-2]
-				out += '\n'
-				out += '\t],\n'
-		out = out[:-2]
-		out += '\n'
-		out += '}'
-		return out
-	#CHECKS
+		if self.levels[node] == level:
+			return self.lows[node], self.highs[node]
+		return node, node
 
-	def is_ent(self, ent):
+	def ite(self, f, g, h):
 		"""
-		Check if it is an entity of the model.
-		
+		Build the node for 'if f then g else h'; with constants, this gives and (ite(f, g, 0)),
+		or (ite(f, 1, h)), not (ite(f, 0, 1)) and implication (ite(f, g, 1)).
+
 		Arguments:
-		ent -- the string name of the potential entity
-		
+		f, g, h -- nodes
+
 		Return values:
-		True -- if ent is an entity
-		False -- otherwise
+		the node (int)
+		"""
+		if f == 1 or g == h:
+			return g
+		if f == 0:
+			return h
+		if g == 1 and h == 0:
+			return f
+		key = (f, g, h)
+		node = self._ite_cache.get(key)
+		if node is None:
+			level = min(self.levels[f], self.levels[g], self.levels[h])
+			f_low, f_high = self._cofactors(f, level)
+			g_low, g_high = self._cofactors(g, level)
+			h_low, h_high = self._cofactors(h, level)
+			node = self.get_node(level, self.ite(f_low, g_low, h_low),
+			                     self.ite(f_high, g_high, h_high))
+			self._ite_cache[key] = node
+		return node
+
+	def _get_reachable(self, node):
 		"""
-		if ent in self.entities:
-			return True
-		return False
+		Return values:
+		the nodes other than 0 and 1 reachable from node, each after the nodes it goes to (list)
+		"""
+		reachable = []
+		seen = set([0, 1])
+		stack = [node]
+		while len(stack) > 0:
+			node = stack[-1]
+			if node in seen:
+				stack.pop()
+				continue
+			children = [child for child in (self.lows[node], self.highs[node]) if child not in seen]
+			if len(children) > 0:
+				stack.extend(children)
+			else:
+				stack.pop()
+				seen.add(node)
+				reachable.append(node)
+		return reachable
 
-	def are_ents(self, ents):
+	def count_nodes(self, node=None):
 		"""
-		Checks if all are entities of the model.
-		
-		Arguments:
-		ents -- a list of names for potential entities
-		
+		Keyword arguments:
+		node -- the node (default None; all nodes of the manager)
+
 		Return values:
-		True -- if all values in ents exist in model
-		Fales -- otherwise
+		the number of nodes, other than 0 and 1, reachable from node (int)
 		"""
-		for ent in ents:
-			if self.is_ent(ent) is False:
-				return False
-		return True
+		if node is None:
+			return len(self.levels) - 2
+		return len(self._get_reachable(node))
 
-	def is_dep(self, ent, dep):
+	def evaluate(self, node, states):
 		"""
-		Check if one entity is a dependency of another.
-		
+		Evaluate the function of a node.
+
 		Arguments:
-		ent -- an entity with a possible dependency on dep
-		dep -- a possible dependency of ent
-		
+		node -- the node
+		states -- the 0/1 state of each variable the node tests (dict)
+
 		Return values:
-		True -- if dep is a dependency of ent
-		False -- otherwise
+		the value of the function (either 0 or 1)
 		"""
-		if dep in self.dependencies[ent]:
-			return True
-		return False
+		while node > 1:
+			if states[self.order[self.levels[node]]]:
+				node = self.highs[node]
+			else:
+				node = self.lows[node]
+		return node
 
-	def valid_res_sts(self, ent, state, verbose=False):
+	def is_monotone(self, node):
 		"""
-		Check if they are valid resultant states for the entity.
-		
+		Check if the function of a node never goes from 1 to 0 when a variable goes from 0 to 1.
+
 		Arguments:
-		ent -- the entity
-		state -- the list of resultant states being checked
-		
-		Keyword arguments:
-		verbose -- activate throwing errors with descriptive messages (default False)
-		
+		node -- the node
+
 		Return values:
-		True -- if state is a valid list of resultant states for ent
-		        (a numpy array of the right length with values equal to 0 or 1)
+		True -- if each node reachable from node is 1 at least whenever its low node is
 		False -- otherwise
-		
-		Exceptions:
-		ValueError -- raised when verbose mode on and the resultant states are invalid
 		"""
-		if not type(state).__module__ == np.__name__:
-			if verbose:
-				raise ValueError('States must be in a numpy array')
-			return False
-		if not self.is_ent(ent):
-			if verbose:
-				raise ValueError('Not an entity of the model')
-			return False
-		return valid_state(state, self.num_res_sts(ent), verbose)
-		
-
-
-	#INFO
+		for reachable in self._get_reachable(node):
+			if self.ite(self.lows[reachable], self.highs[reachable], 1) != 1:
+				return False
+		return True
 
-	def n_dep_of_ent(self, ent):
+	def probability(self, node, probabilities):
 		"""
-		Calculate number of dependencies of an entity.
-		
+		Find the probability that the function of a node is 1.
+
 		Arguments:
-		ent -- the entity
-		
+		node -- the node
+		probabilities -- the probability that each variable the node tests is 1, independently
+		                 of the others (dict)
+
 		Return values:
-		the number of dependencies of ent (int)
-		
-		Exceptions:
-		ValueError -- raised if ent not in model
-		"""
-		if self.is_ent(ent):
-			return len(self.dependencies[ent])
-		raise ValueError('ent invalid for num of dep check')
+		the probability (float)
+		"""
+		values = {0: 0.0, 1: 1.0}
+		for reachable in self._get_reachable(node):
+			p_high = probabilities[self.order[self.levels[reachable]]]
+			values[reachable] = (p_high*values[self.highs[reachable]] + 
+			                     (1.0 - p_high)*values[self.lows[reachable]])
+		return values[node]
 
-	def num_res_sts(self, ent):
+	def cut_sets(self, node, max_size=None):
 		"""
-		Calculate number of resultant states of an entity.
-		
+		Find the minimal cut sets of a monotone function: the smallest sets of variables that make
+		it 0 when they are all 0, whatever the other variables are.
+
 		Arguments:
-		ent -- the entity
-		
+		node -- the node
+
+		Keyword arguments:
+		max_size -- the largest cut set to find (default None; no limit)
+
 		Return values:
-		the number of entity resultant states for ent (int)
-		
+		the minimal cut sets, smallest first, each a list of variables in the order (list)
+
 		Exceptions:
-		ValueError -- raised if ent not in model
+		ValueError -- raised when the function of node is not monotone
+		"""
+		if not self.is_monotone(node):
+			raise ValueError('cut sets need a monotone function')
+		cuts = {0: [frozenset()], 1: []}
+		for reachable in self._get_reachable(node):
+			# a cut set either does not need the variable (a cut set of the high node), or is the
+			# variable with a cut set of the low node that no cut set of the high node is within
+			high_cuts = cuts[self.highs[reachable]]
+			node_cuts = list(high_cuts)
+			for cut in cuts[self.lows[reachable]]:
+				if ((max_size is None or len(cut) < max_size) and
+				    not any(high_cut <= cut for high_cut in high_cuts)):
+					node_cuts.append(cut | frozenset([self.levels[reachable]]))
+			cuts[reachable] = node_cuts
+		return [[self.order[level] for level in sorted(cut)] 
+		        for cut in sorted(cuts[node], key=lambda cut: (len(cut), sorted(cut)))]
+
+class BDDTruthTable(object):
+	"""
+	Resultant states of an entity stored as a node of a shared BDDManager, without a table of
+	2**n states. State i has dependency k (and variable k) equal to bit n-1-k of i, as in
+	numpy arrays of resultant states. Can be used wherever a numpy array of resultant states is
+	accepted, like a PackedTruthTable, but cannot be changed; converting one to a numpy array
+	builds the whole table.
+
+	Public methods:
+	to_array
+
+	Instance variables:
+	manager -- the BDDManager holding the nodes
+	root -- the node of the resultant states
+	variables -- the variables of the manager standing for the dependencies, in order
+	length -- the number of states
+	"""
+	__slots__ = ['manager', 'root', 'variables', 'length', '_shifts']
+	__hash__ = None
+
+	def __init__(self, manager, root, variables):
 		"""
-		if self.is_ent(ent):
-			return 2**self.n_dep_of_ent(ent)
-		raise ValueError('ent invalid for num states check')
+		Arguments:
+		manager -- the BDDManager holding the nodes
+		root -- the node of the resultant states
+		variables -- the variables of the manager standing for the dependencies, in order
+		"""
+		self.manager = manager
+		self.root = root
+		self.variables = list(variables)
+		self.length = 2**len(self.variables)
+		self._shifts = dict((var, len(self.variables)-1-k) for k, var in enumerate(self.variables))
 
-	def num_ents(self):
+	def __len__(self):
+		return self.length
+
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			return self.to_array()[index]
+		index = operator.index(index)
+		if index < 0:
+			index += self.length
+		if not 0 <= index < self.length:
+			raise IndexError('truth table index out of range')
+		manager = self.manager
+		node = self.root
+		while node > 1:
+			if (index >> self._shifts[manager.order[manager.levels[node]]]) & 1:
+				node = manager.highs[node]
+			else:
+				node = manager.lows[node]
+		return node
+
+	def __iter__(self):
+		return iter(self.to_array().tolist())
+
+	def __array__(self, dtype=None):
+		states = self.to_array()
+		if dtype is not None:
+			return states.astype(dtype)
+		return states
+
+	def __eq__(self, other):
+		if (isinstance(other, BDDTruthTable) and other.manager is self.manager and 
+		    other.variables == self.variables):
+			return self.root == other.root
+		return self.to_array() == np.asarray(other)
+
+	def __ne__(self, other):
+		if isinstance(other, BDDTruthTable) and other.manager is self.manager:
+			return not self == other
+		return self.to_array() != np.asarray(other)
+
+	def __copy__(self):
+		return BDDTruthTable(self.manager, self.root, self.variables)
+
+	def __deepcopy__(self, memo):
+		return BDDTruthTable(copy.deepcopy(self.manager, memo), self.root, self.variables)
+
+	def __repr__(self):
+		return 'BDDTruthTable(<%d states, %d nodes>)' % (self.length,
+		                                                  self.manager.count_nodes(self.root))
+
+	def _valid(self):
 		"""
-		Calculate the number of entities in the model.
-		
+		Check that the root is a node of the manager that only tests the variables.
+
 		Return values:
-		the number of entities (int)
+		True -- if the root is a node of the manager testing no other variables
+		False -- otherwise
 		"""
-		return len(self.entities)
-		
-	def get_ents_with_internal_dep(self):
+		if not (isinstance(self.root, (int, long)) and 0 <= self.root < len(self.manager)):
+			return False
+		manager = self.manager
+		return all(manager.order[manager.levels[node]] in self._shifts 
+		           for node in manager._get_reachable(self.root))
+
+	def to_array(self):
 		"""
-		Find entities with an internal dependency (that depend on an internal state).
-		
 		Return values:
-		the entities with an internal dependency (list)
+		the states (uint8 numpy array)
+		"""
+		manager = self.manager
+		indices = np.arange(self.length, dtype=np.int64)
+		nodes = np.full(self.length, self.root, dtype=np.int64)
+		lows = np.array(manager.lows, dtype=np.int64)
+		highs = np.array(manager.highs, dtype=np.int64)
+		shifts = np.array([self._shifts.get(manager.order[level], 0)
+		                   if level < len(manager.order) else 0 for level in manager.levels],
+		                  dtype=np.int64)
+		while (nodes > 1).any():
+			nodes = np.where((indices >> shifts[nodes]) & 1, highs[nodes], lows[nodes])
+		return nodes.astype(np.uint8)
+
+_TYPE_CODES = dict((ent_type, code) for code, ent_type in enumerate(ENTTYPE.TYPES))
+_MODEL_VARIABLES = ('entities', 'ent_types', 'parents', 'dependencies', 'resultant_states',
+                    'resource_limits', 'op_performance_levels', 'gates')
+
+def _invalidating(method):
+	"""
+	Wrap a container method so that calling it marks the owning model as changed.
+
+	Arguments:
+	method -- the unbound list or dict method
+
+	Return values:
+	the wrapped method (function)
+	"""
+	def wrapper(self, *args, **kwargs):
 		"""
-		return [ent for ent in self.entities if ent in self.dependencies[ent]]
+		Mark the owning model as changed, then call the wrapped method.
+		"""
+		self._changing(method.__name__, args)
+		return method(self, *args, **kwargs)
+	wrapper.__name__ = method.__name__
+	return wrapper
 
-	def _valid_parent(self, parent):
+class _ObservedList(list):
+	"""
+	List attribute of a GMORModel that marks the model as changed whenever it is modified.
+	Copies and pickles of it are plain lists.
+	"""
+	__slots__ = ['_model']
+
+	def __init__(self, model, values=()):
+		list.__init__(self, values)
+		self._model = model
+
+	def __reduce__(self):
+		return (list, (list(self),))
+
+	def _changing(self, name, args):
 		"""
-		Check if it is a valid parent name.
-		
+		Mark the model as changed before the list is modified.
+
 		Arguments:
-		parent -- the string name being checked
-		
-		Return values:
-		True -- if parent is an eligible parent name
-		False -- otherwise
+		name -- the name of the list method modifying it
+		args -- the arguments of the method
 		"""
-		return parent == '' or self.is_ent(parent) or parent in ENTTYPE.TYPES
+		self._model._touch()
 
-	def valid_parent(self, ent, parent):
+	append = _invalidating(list.append)
+	extend = _invalidating(list.extend)
+	insert = _invalidating(list.insert)
+	remove = _invalidating(list.remove)
+	pop = _invalidating(list.pop)
+	reverse = _invalidating(list.reverse)
+	sort = _invalidating(list.sort)
+	__setitem__ = _invalidating(list.__setitem__)
+	__delitem__ = _invalidating(list.__delitem__)
+	__setslice__ = _invalidating(list.__setslice__)
+	__delslice__ = _invalidating(list.__delslice__)
+	__iadd__ = _invalidating(list.__iadd__)
+	__imul__ = _invalidating(list.__imul__)
+
+class _EntityList(_ObservedList):
+	"""
+	Entities attribute of a GMORModel. Appending or removing a single entity updates the model
+	index in place; other changes to the order of the entities drop it, to be rebuilt when needed.
+	"""
+	__slots__ = []
+
+	def _changing(self, name, args):
+		"""
+		Mark the model as changed and update its index before the list is modified
+		(see _ObservedList).
+		"""
+		self._model._touch()
+		index = self._model._index
+		if index is None:
+			return
+		if not index.is_unique() or (args and not isinstance(args[0], (basestring, int, long))):
+			self._model._index = None
+		elif name == 'append':
+			if args[0] in index.ent_set:
+				self._model._index = None
+			else:
+				index.add_entity(args[0])
+		elif name == 'remove':
+			if args[0] in index.ent_set:
+				index.del_entity(args[0])
+		elif name in ('pop', '__delitem__'):
+			position = args[0] if args else -1
+			if -len(self) <= position < len(self):
+				index.del_entity(self[position])
+		else:
+			self._model._index = None
+
+class _DependencyList(_ObservedList):
+	"""
+	Dependency list of an entity of a GMORModel. Modifying it marks the entity for re-indexing.
+	"""
+	__slots__ = ['_ent']
+
+	def __init__(self, model, ent, values=()):
+		_ObservedList.__init__(self, model, values)
+		self._ent = ent
+
+	def _changing(self, name, args):
 		"""
-		Check if it is a valid parent for the entity.
-		
-		Arguments:
-		ent -- the entity
-		parent -- the parent name being checked
-		
-		Return values:
-		True -- if parent is an eligible parent name (either another entity, a type, or blank)
-		False -- otherwise
-		
-		Exceptions:
-		ValueError -- raised if ent not in model or ent and parent are the same
+		Mark the model as changed and the entity as needing re-indexing (see _ObservedList).
 		"""
-		if self.is_ent(ent) and ent != parent:
-			return self._valid_parent(parent)
-		raise ValueError('ent invalid')
+		self._model._touch()
+		if self._model._index is not None:
+			self._model._index.stale.add(self._ent)
 
-	def _are_functions(self, ents):
+class _ObservedDict(dict):
+	"""
+	Dict attribute of a GMORModel that marks the model as changed whenever it is modified.
+	Copies and pickles of it are plain dicts.
+	"""
+	__slots__ = ['_model']
+
+	def __init__(self, model, values=()):
+		dict.__init__(self)
+		self._model = model
+		for key, value in dict(values).iteritems():
+			dict.__setitem__(self, key, self._wrap(key, value))
+
+	def __reduce__(self):
+		return (dict, (dict(self),))
+
+	def _wrap(self, key, value):
 		"""
-		Check whether all are of type function.
-		
+		Prepare a value for storage (values are stored as given).
+		"""
+		return value
+
+	def _changing(self, name, args):
+		"""
+		Mark the model as changed before the dict is modified.
+
 		Arguments:
-		ents -- the list of entities being checked
-		
-		Return values:
-		True -- if all entities in ents are functions
-		False -- otherwise
+		name -- the name of the dict method modifying it
+		args -- the arguments of the method
 		"""
-		for ent in ents:
-			if self.ent_types[ent] != ENTTYPE.FUNCTION:
-				return False
-		return True
+		self._model._touch()
 
+	def __setitem__(self, key, value):
+		self._changing('__setitem__', (key, value))
+		dict.__setitem__(self, key, self._wrap(key, value))
 
+	def setdefault(self, key, value=None):
+		if key not in self:
+			self[key] = value
+		return dict.__getitem__(self, key)
 
+	def update(self, *args, **kwargs):
+		for key, value in dict(*args, **kwargs).iteritems():
+			self[key] = value
 
-	#FINAL CHECKS
+	__delitem__ = _invalidating(dict.__delitem__)
+	pop = _invalidating(dict.pop)
+	popitem = _invalidating(dict.popitem)
+	clear = _invalidating(dict.clear)
 
-	def ents_ready(self, verbose=False):
+class _IndexedDict(_ObservedDict):
+	"""
+	Dict attribute of a GMORModel, keyed by entity, that the model index is built from. Changing
+	the value of an entity marks the entity for re-indexing.
+	"""
+	__slots__ = []
+
+	def _changing(self, name, args):
 		"""
-		Check if entities are ready.
-		
-		Keyword arguments:
-		verbose -- activate throwing errors with descriptive messages (default False)
-		
-		Return values:
-		True -- if entities are valid (at least one exists in model, at least one is a function,
-		        and all names do not contain any of the following chars: \, /, *, ?, <, >, |, %, ")
-		False -- otherwise
-		
-		Exceptions:
-		ValueError -- raised when verbose mode on and entities are not valid
+		Mark the model as changed and the entity as needing re-indexing (see _ObservedDict).
 		"""
-		if len(self.entities) == 0:
-			if verbose:
-				raise ValueError('Model has no entities')
-			return False
-		illegal = re.compile('[/*?<>|%"\\\\]')
-		for ent in self.entities:
-			if re.search(illegal, "%r"%ent):
-				if verbose:
-					msg = 'Entity names cannot contain the following: \\, /, *, ?, <, >, |, %, "'
-					raise ValueError(msg)
-				return False
-		if not ENTTYPE.FUNCTION in self.ent_types.values():
-			if verbose:
-				raise ValueError('Model has no functions')
-			return False
-		return True
+		self._model._touch()
+		index = self._model._index
+		if index is not None:
+			if name in ('__setitem__', '__delitem__', 'pop'):
+				index.stale.add(args[0])
+			else:
+				self._model._index = None
 
-	def deps_ready(self, verbose=False):
+class _DependencyDict(_IndexedDict):
+	"""
+	Dependencies attribute of a GMORModel. Dependency lists stored in it are observed as well, so
+	that appending to or removing from them also marks the model as changed.
+	"""
+	__slots__ = []
+
+	def _wrap(self, key, value):
 		"""
-		Check if dependencies are ready.
-		
-		Keyword arguments:
-		verbose -- activate throwing errors with descriptive messages (default False)
-		
-		Return values:
-		True -- if dependencies of each entity are valid (every entity has at least one dependency, at least
-        		one entity has an internal dependency, and resources do not depend on other resources)
-		False -- otherwise
-		
-		Exceptions:
-		ValueError -- raised when verbose mode on and dependencies are not valid
+		Prepare a dependency list for storage (lists are observed, other values are stored as
+		given).
 		"""
-		internal_deps = 0
-		for ent in self.entities:
-			if len(self.dependencies[ent]) == 0:
-				if verbose:
-					raise ValueError('Entity with no dependency')
-				return False #every entity must have at least one dependency
-			if self.ent_types[ent] == ENTTYPE.RESOURCE:
-				for dep in self.dependencies[ent]:
-					if self.ent_types[dep] == ENTTYPE.RESOURCE and ent != dep:
-						if verbose:
-							raise ValueError('Resource depending on another distinct resource')
-						return False  # resource cannot depend on a different resource
-			if ent in self.dependencies[ent]:
-				internal_deps += 1
-		if internal_deps == 0:
-			if verbose:
-				raise ValueError('No entities with internal dependency')
-			return False  # must have at least one internally-dependent entity
-		return True
+		if isinstance(value, list) and not (isinstance(value, _DependencyList) and
+		                                    value._model is self._model and value._ent == key):
+			return _DependencyList(self._model, key, value)
+		return value
 
-	def res_sts_ready(self, verbose=False):
+class _TableDict(_ObservedDict):
+	"""
+	Resultant states attribute of a GMORModel. Numpy arrays and PackedTruthTables stored in it are
+	made read-only, so that a table cannot be edited in place without the model seeing it.
+	"""
+	__slots__ = []
+
+	def _wrap(self, key, value):
 		"""
-		Check if resultant states are ready.
-		
-		Keyword arguments:
-		verbose -- activate throwing errors with descriptive messages (default False)
-		
-		Return values:
-		True -- if resultant states of each entity are valid
-		        (a numpy array of the right length with values equal to 0 or 1)
-		False -- otherwise
+		Prepare a table of resultant states for storage (the array holding its states is made
+		read-only).
 		"""
-		for ent in self.entities:
-			if not self.valid_res_sts(ent, self.resultant_states[ent], verbose):
-				return False
-		return True
+		if isinstance(value, np.ndarray):
+			value.flags.writeable = False
+		elif isinstance(value, PackedTruthTable) and isinstance(value.words, np.ndarray):
+			value.words.flags.writeable = False
+		return value
 
-	def res_lm_ready(self, verbose=False):
+_OBSERVED_TYPES = {'entities': _EntityList, 'ent_types': _IndexedDict,
+                   'dependencies': _DependencyDict, 'resultant_states': _TableDict}
+
+class _ModelIndex(object):
+	"""
+	Integer index over the entities and dependencies of a GMORModel. Entity ids are positions
+	in the model's list of entities.
+
+	Instance variables:
+	ent_ids -- the id of each entity name (dict)
+	ent_set -- the entity names (set)
+	dep_ids -- for each entity id, the ids of its dependencies, with -1 for a name that is not an
+	           entity (int numpy array, or None when the entity has no list of dependencies)
+	dep_sets -- for each entity id, the names of its dependencies (set, or None as for dep_ids)
+	type_codes -- for each entity id, the position of its type in ENTTYPE.TYPES, or -1 (list)
+	n_dangling -- the number of dependencies on names that are not entities (int)
+	stale -- the entities whose dependencies and type have changed since they were indexed (set)
+	"""
+	__slots__ = ['ent_ids', 'ent_set', 'dep_ids', 'dep_sets', 'type_codes', 'n_dangling', 'stale']
+
+	def __init__(self, model):
 		"""
-		Check if resource limits are ready.
-		
-		Keyword arguments:
-		verbose -- activate throwing errors with descriptive messages (default False)
-		
+		Build the index of a model.
+
+		Arguments:
+		model -- the GMORModel
+		"""
+		self.ent_ids = {}
+		for ent_id, ent in enumerate(model.entities):
+			self.ent_ids.setdefault(ent, ent_id)
+		self.ent_set = set(self.ent_ids)
+		self.n_dangling = 0
+		self.dep_ids = []
+		self.dep_sets = []
+		self.type_codes = []
+		self.stale = set()
+		for ent in model.entities:
+			self.dep_ids.append(None)
+			self.dep_sets.append(None)
+			self.type_codes.append(-1)
+			self._set(len(self.dep_ids)-1, model.dependencies.get(ent), model.ent_types.get(ent))
+
+	def _set(self, ent_id, deps, ent_type):
+		"""
+		Index the dependencies and type of an entity.
+
+		Arguments:
+		ent_id -- the id of the entity
+		deps -- the dependencies of the entity
+		ent_type -- the type of the entity
+		"""
+		if self.dep_ids[ent_id] is not None:
+			self.n_dangling -= int(np.count_nonzero(self.dep_ids[ent_id] < 0))
+		if isinstance(deps, list):
+			self.dep_ids[ent_id] = np.array([self.ent_ids.get(dep, -1) for dep in deps],
+			                                dtype=np.int64)
+			self.dep_sets[ent_id] = set(deps)
+			self.n_dangling += int(np.count_nonzero(self.dep_ids[ent_id] < 0))
+		else:
+			self.dep_ids[ent_id] = None
+			self.dep_sets[ent_id] = None
+		self.type_codes[ent_id] = _TYPE_CODES.get(ent_type, -1)
+
+	def is_unique(self):
+		"""
+		Check if no entity of the model appears twice, which the index can only be updated for.
+
 		Return values:
-		True -- if resource limits are valid (non-negative and only for resource entities)
+		True -- if each entity has its own id
 		False -- otherwise
 		"""
-		return self._res_lm_ready(self.resource_limits, verbose)
+		return len(self.ent_set) == len(self.dep_ids)
 
-	def _res_lm_ready(self, res_lims, verbose=False):
+	def add_entity(self, ent):
 		"""
-		Check if resource limits are ready.
-				
+		Index an entity about to be appended to the end of the model's entities. Its dependencies
+		and type, and those of the entities depending on it, are indexed when next refreshed.
+
 		Arguments:
-		res_lims -- the resource limits for the resources in the model
-		
-		Keyword arguments:
-		verbose -- activate throwing errors with descriptive messages (default False)
-		
-		Return values:
-		True -- if resource limits are valid (non-negative and only for resource entities)
-		False -- otherwise
-		
-		Exceptions:
-		ValueError -- raised when verbose mode on and limits are not valid
+		ent -- the entity
 		"""
-		if not self.are_ents(res_lims.keys()):
-			if verbose:
-				raise ValueError('Not all entities of the model')
-			return False
-		if not is_all_non_neg(res_lims.values()):
-			if verbose:
-				raise ValueError('Not all non-negative values')
-			return False
-		for res_ent in res_lims.keys():
-			if self.ent_types[res_ent] != ENTTYPE.RESOURCE:#ENTTYPE_RESOURCE:
-				if verbose:
-					raise ValueError('Not all resources')
-				return False
-		return True
+		self.ent_ids[ent] = len(self.dep_ids)
+		self.ent_set.add(ent)
+		self.dep_ids.append(None)
+		self.dep_sets.append(None)
+		self.type_codes.append(-1)
+		self.stale.add(ent)
+		if self.n_dangling > 0:
+			self.stale.update(other for other, ent_id in self.ent_ids.iteritems()
+			                  if self.dep_sets[ent_id] is not None and ent in self.dep_sets[ent_id])
 
-	def op_p_ready(self, verbose=False):
+	def del_entity(self, ent):
 		"""
-		Check if performance levels are ready.
-		
-		Keyword arguments:
-		verbose -- activate throwing errors with descriptive messages (default False)
-		
-		Return values:
-		True -- if performance levels are valid (only for function entities
-		        and sum of values is between 0.9999999999 and 0.0000000001)
-		False -- otherwise
+		Drop an entity about to be removed from the model's entities, moving the entities after it
+		down one id. Dependencies on it are left as dependencies on a name that is not an entity.
+
+		Arguments:
+		ent -- the entity
 		"""
-		return self._op_p_ready(self.op_performance_levels, verbose)
+		del_id = self.ent_ids.pop(ent)
+		self.ent_set.discard(ent)
+		for other, ent_id in self.ent_ids.iteritems():
+			if ent_id > del_id:
+				self.ent_ids[other] = ent_id-1
+		if self.dep_ids[del_id] is not None:
+			self.n_dangling -= int(np.count_nonzero(self.dep_ids[del_id] < 0))
+		del self.dep_ids[del_id], self.dep_sets[del_id], self.type_codes[del_id]
+		for ent_id, dep_ids in enumerate(self.dep_ids):
+			if dep_ids is not None and (dep_ids >= del_id).any():
+				removed = dep_ids == del_id
+				self.dep_ids[ent_id] = np.where(removed, -1, dep_ids-(dep_ids > del_id))
+				self.n_dangling += int(np.count_nonzero(removed))
 
-	def _op_p_ready(self, op_perf_levs, verbose=False):
+	def refresh(self, model):
 		"""
-		Check if performance levels are ready.
-		
+		Re-index the dependencies and type of the stale entities. Only valid while no entity appears
+		twice (see is_unique).
+
 		Arguments:
-		op_perf_levs -- the performance levels of the functions in the model
-		
-		Keyword arguments:
-		verbose -- activate throwing errors with descriptive messages (default False)
-		
-		Return values:
-		True -- if performance levels are valid (only for function entities
-		        and sum of values is between 0.9999999999 and 0.0000000001)
-		False -- otherwise
-		
-		Exceptions:
-		ValueError -- raised when verbose mode on and levels are not valid
+		model -- the GMORModel
 		"""
-		if not self._are_functions(op_perf_levs.keys()):
-			if verbose:
-				raise ValueError('Not all functions')
-			return False
-		if abs(sum(op_perf_levs.values())-1.0) > 1.0e-10:
-			if verbose:
-				raise ValueError('Sum of levels not between 0.9999999999 and 0.0000000001')
-			return False
-		return True
+		for ent in self.stale:
+			ent_id = self.ent_ids.get(ent)
+			if ent_id is not None:
+				self._set(ent_id, model.dependencies.get(ent), model.ent_types.get(ent))
+		self.stale = set()
 
-	def ready(self, verbose=False):
+class GMORModel(object):
+	"""
+	Builds and modifies a GMOR entity model.
+	
+	Public methods:
+	set_and_check, set_and_check_json, is_ent, are_ents, is_dep, valid_res_sts,
+	n_dep_of_ent, num_res_sts, num_ents, get_ents_with_internal_dep, valid_parent,
+	ents_ready, deps_ready, res_sts_ready, res_lm_ready, op_p_ready, gates_ready, ready,
+	add_entity, add_dep, merge_models, set_res_sts, set_op_perf_levs, set_res_lim,
+	del_entity,	del_dep, edit_entity, get_ent_id, get_dep_ids, mark_changed, valid_gate, set_gate,
+	get_bdd_order, compile_bdds, get_cut_sets, get_up_probability
+	
+	Instance variables:
+	entities, ent_types, parents, dependencies, resultant_states,
+	resource_limits, op_performance_levels, gates, version
+	
+	Entities in gates have their resultant state given by a gate (see GATETYPE) rather than by
+	resultant states, so that no table of 2**n states is needed for them. compile_bdds stores the
+	resultant states of the other entities as BDDs (see BDDTruthTable), which need no table either.
+	
+	version counts the changes made to the model, whether through the editing methods or by
+	assigning to or editing the attributes above. The readiness checks are cached until it changes,
+	except for the gate checks, which are redone each time since gates can be edited in place.
+	Numpy arrays and PackedTruthTables are made read-only when stored in resultant_states, so
+	replace a table rather than editing it.
+	"""
+	
+	def __init__(self):
 		"""
-		Check if model is ready for analysis.
-		
-		Keyword arguments:
-		verbose -- activate throwing errors with descriptive messages (default False)
-		
-		Return values:
-		True -- if minimum entry requirements complete (entities, dependencies,
-			    resultant states, performance levels, and resource limits all ready)
-		False -- otherwise
+		Constructs a new (and initially empty) model.
 		"""
-		if self.ents_ready(verbose) and self.deps_ready(verbose) and self.res_sts_ready(verbose):
-			if self.op_p_ready(verbose) and self.res_lm_ready(verbose):
-				return True
-		return False
+		self.version = 0
+		self._index = None
+		self._checks = {}
+		self.entities = []
+		self.ent_types = {}
+		self.parents = {}
+		self.dependencies = {}
+		self.resultant_states = {}
+		self.resource_limits = {}
+		self.op_performance_levels = {}
+		self.gates = {}
+		self.version = 0
 
+	def __setattr__(self, name, value):
+		"""
+		Set an attribute, keeping the model variables observed so that changes to them are counted.
+		"""
+		if name in _MODEL_VARIABLES:
+			observed = _OBSERVED_TYPES.get(name, _ObservedDict)
+			if not (type(value) is observed and value._model is self):
+				value = observed(self, value)
+			object.__setattr__(self, name, value)
+			self._touch()
+			if name in ('entities', 'ent_types', 'dependencies'):
+				self._index = None
+		else:
+			object.__setattr__(self, name, value)
 
+	def __getstate__(self):
+		state = self.__dict__.copy()
+		state['_index'] = None
+		state['_checks'] = {}
+		return state
 
+	def __setstate__(self, state):
+		object.__setattr__(self, 'version', state.get('version', 0))
+		object.__setattr__(self, '_index', None)
+		object.__setattr__(self, '_checks', {})
+		self.gates = {}  # for models saved before gates
+		for name, value in state.iteritems():
+			if name in _MODEL_VARIABLES:
+				setattr(self, name, value)
+			elif name not in ('_index', '_checks'):
+				object.__setattr__(self, name, value)
+		object.__setattr__(self, 'version', state.get('version', 0))
 
-	#ADDITIONS
-	def add_entity(self, name, ent_type, parent=''):
+	def _touch(self):
 		"""
-		Add a new entity to the model.
+		Count a change to the model, dropping its cached readiness checks. The observed attributes
+		keep the index up to date themselves.
+		"""
+		self.version += 1
+		self._checks = {}
+
+	def mark_changed(self):
+		"""
+		Count a change to the model that it cannot see by itself (such as calling set_from_json
+		on one of its PackedTruthTables), so that its index is rebuilt and the readiness checks
+		are redone.
+		"""
+		self._touch()
+		self._index = None
+
+	def _cached_check(self, section, check, verbose):
+		"""
+		Run a readiness check, or reuse its result if the model has not changed since it last ran.
+		A failed check is run again in verbose mode so that it can raise its descriptive error.
 		
 		Arguments:
-		name -- string name of the new entity
-		ent_type -- the type of the new entity
-		
-		Keyword arguments:
-		parent -- the parent name of the new entity (default '';
-		          parent will be set to same value as ent_type)
+		section -- the name the result is cached under
+		check -- the check, called with verbose
+		verbose -- activate throwing errors with descriptive messages
 		
 		Return values:
-		True -- if entity added
-		False -- if entity already exists, type is invalid, or parent is invalid
+		the result of the check (bool)
 		"""
-		if (not self.is_ent(name) and ent_type in ENTTYPE.TYPES and
-			   self._valid_parent(parent) and parent != name):
+		result = self._checks.get(section)
+		if result is None or (verbose and not result):
+			result = check(verbose)
+			self._checks[section] = result
+		return result
 
-			self.entities.append(name)
-			self.ent_types[name] = ent_type
-			if parent == '':
-				parent = ent_type
-			self.parents[name] = parent
-			self.dependencies[name] = []
-			self.resultant_states[name] = []
-			return True
-		else:
-			return False
-			
-	def add_dep(self, ent, dep_name):
+	def _get_index(self):
 		"""
-		Add a new dependency relationship between two entities.
+		Get the model index, building it if it was dropped and re-indexing any entities changed
+		since it was last used.
+
+		Return values:
+		the index of the model (_ModelIndex)
+		"""
+		if self._index is None or (self._index.stale and not self._index.is_unique()):
+			self._index = _ModelIndex(self)
+		elif self._index.stale:
+			self._index.refresh(self)
+		return self._index
+
+	def set_and_check(self, entities, ent_types, parents, dependencies, resultant_states, 
+	                  resource_limits, op_performance_levels, gates=None):
+		"""
+		Set model with given values and check that it's ready for analysis.
 		
 		Arguments:
-		ent -- the entity with the new dependency on dep_name
-		dep_name -- the entity that will be added to ent's list of dependencies
+		entities -- the entities that will populate the model
+		ent_types -- the type of each entity in the model
+		parents -- the parent of each entity (can be another entity, a type, or blank)
+		dependencies -- for each entity, the list of entities it depends on
+		resultant_states -- for each entity, a list of states resulting from the state of it's dependencies
+		                    (numpy array, PackedTruthTable or BDDTruthTable)
+		resource_limits -- the total amount available of each resource entity
+		op_performance_levels -- the performance level of each function entity when active
+		
+		Keyword arguments:
+		gates -- the gate giving the resultant state of each entity without resultant states
+		         (default None; no gates)
 		
 		Return values:
-		True -- if dependency on dep_name added to ent 
-		False -- if the dependency already exists, if ent or dep_name are not entities,
-				 or if they're both resources that are distinct from one another
+		True -- if the model is ready for analysis
+		False -- otherwise
 		"""
-		if self.is_ent(ent) and self.is_ent(dep_name) and self.is_dep(ent, dep_name) == False:
-			if self.ent_types[ent] == ENTTYPE.RESOURCE and self.ent_types[dep_name] == ENTTYPE.RESOURCE:
-				if ent != dep_name:
-					return False
-			self.dependencies[ent].append(dep_name)
-			self._set_default_res_sts(ent)
+		self._set(entities, ent_types, parents, dependencies, resultant_states, 
+		          resource_limits, op_performance_levels, gates)
+
+		if self.ready():
 			return True
 		return False
-		
-	def merge_models(self, new_model, weight=0.5):
+
+	def set_and_check_json(self, json_text):
 		"""
-		Add entities of another model to this model.
+		Set model with given values from JSON text and check that it's ready for analysis.
 		
 		Arguments:
-		new_model -- the other GMORModel being merged into this model
-		
-		Keyword arguments:
-		weight -- used to adjust performance levels to sum to 1 after merge (default 0.5)
+		json_text -- the JSON text containing values for the model variables (resultant states
+		             are lists, or objects as written by PackedTruthTable.to_json)
+		
+		Return values:
+		True -- if the model is ready for analysis
+		False -- otherwise
+		
+		Exceptions:
+		ValueError -- raised when JSON text is not in the proper form
+		"""
+		try:
+			obj = json.loads(json_text)
+			entities = obj['entities']
+			ent_types = obj['ent_types']
+			parents = obj['parents']
+			dependencies = obj['dependencies']
+			resultant_states = obj['resultant_states']
+			resource_limits = obj['resource_limits']
+			op_performance_levels = obj['op_performance_levels']
+			gates = obj.get('gates', {})
+			
+			for ent in entities:
+				if ent in gates and ent not in resultant_states:
+					continue
+				if isinstance(resultant_states[ent], dict):
+					packed = PackedTruthTable()
+					packed._set_from_obj(resultant_states[ent])
+					resultant_states[ent] = packed
+				elif type(resultant_states[ent]).__module__ != np.__name__:
+					resultant_states[ent] = np.array(resultant_states[ent])
+			
+			return self.set_and_check(entities, ent_types, parents, dependencies, resultant_states, 
+			                          resource_limits, op_performance_levels, gates)
+		except:
+			raise ValueError('json text must be of form' + \
+				'"entities": [], ' + \
+				'"ent_types": {}, ' + \
+				'"parents": {}, ' + \
+				'"dependencies": {}, ' + \
+				'"resultant_states": {}, ' + \
+				'"resource_limits": {}, ' + \
+				'"op_performance_levels": {}, ' + \
+				'"gates": {} (optional)')
+
+
+	def _set(self, entities, ent_types, parents, dependencies, resultant_states, 
+	             resource_limits, op_performance_levels, gates=None):
+		"""
+		Set the model variables with the given values.
+		
+		Arguments:
+		entities -- the entities that will populate the model
+		ent_types -- the type of each entity in the model
+		parents -- the parent of each entity (can be another entity, a type, or blank)
+		dependencies -- for each entity, the list of entities it depends on
+		resultant_states -- for each entity, a list of states resulting from the state of it's dependencies
+		                    (numpy array, PackedTruthTable or BDDTruthTable)
+		resource_limits -- the total amount available of each resource entity
+		op_performance_levels -- the performance level of each function entity when active
+		
+		Keyword arguments:
+		gates -- the gate giving the resultant state of each entity without resultant states
+		         (default None; no gates)
+		"""
+		self.entities = entities
+		self.ent_types = ent_types
+		self.parents = parents
+		self.dependencies = dependencies
+		self.resultant_states = resultant_states
+		self.resource_limits = resource_limits
+		self.op_performance_levels = op_performance_levels
+		if gates is None:
+			gates = {}
+		self.gates = gates
+
+	def formatted_json_text(self):
+		"""
+		Useful for saving GMORModel models as json strings that are human readable.
+		Creates a string that prints nicely in json format (but is not a json loaded object). 
+		"""
+		out = ''
+		out += '{\n'
+		for key in self.__dict__:
+			if key not in _MODEL_VARIABLES:
+				continue
+			if key != "entities":
+				out += "\t\""+key+"\":{\n"
+				do_fix = False
+				for ent in self.__dict__[key]:
+					do_fix = True
+					out += "\t\t\""+ent+"\":"
+					if (key == "resultant_states" and
+					    isinstance(self.resultant_states[ent], PackedTruthTable)):
+						out += self.resultant_states[ent].to_json()+",\n"
+					elif (key == "resultant_states" and
+					      isinstance(self.resultant_states[ent], BDDTruthTable)):  # written packed
+						out += PackedTruthTable(self.resultant_states[ent]).to_json()+",\n"
+					elif key == "resultant_states":
+						out += str(list(self.resultant_states[ent]))+",\n"
+					elif key in ("dependencies", "parents", "ent_types", "gates"):
+						out += json.dumps(self.__dict__[key][ent]) + ',\n'
+					else:
+						out += str(self.__dict__[key][ent])+",\n"
+				if do_fix:
+					out = out[:-2]
+					out += '\n'
+				out += "\t},\n"
+			else:
+				out += "\t\""+key+"\":[\n"
+				for ent in self.entities:
+					out += "\t\t\""+ent+"\","
+					out += '\n'
+				out = out[:-2]
+				out += '\n'
+				out += '\t],\n'
+		out = out[:-2]
+		out += '\n'
+		out += '}'
+		return out
+	#CHECKS
+
+	def is_ent(self, ent):
+		"""
+		Check if it is an entity of the model.
+		
+		Arguments:
+		ent -- the string name of the potential entity
+		
+		Return values:
+		True -- if ent is an entity
+		False -- otherwise
+		"""
+		try:
+			return ent in self._get_index().ent_set
+		except TypeError:
+			return False
+
+	def are_ents(self, ents):
+		"""
+		Checks if all are entities of the model.
+		
+		Arguments:
+		ents -- a list of names for potential entities
+		
+		Return values:
+		True -- if all values in ents exist in model
+		Fales -- otherwise
+		"""
+		ent_set = self._get_index().ent_set
+		for ent in ents:
+			try:
+				if ent not in ent_set:
+					return False
+			except TypeError:
+				return False
+		return True
+
+	def is_dep(self, ent, dep):
+		"""
+		Check if one entity is a dependency of another.
+		
+		Arguments:
+		ent -- an entity with a possible dependency on dep
+		dep -- a possible dependency of ent
+		
+		Return values:
+		True -- if dep is a dependency of ent
+		False -- otherwise
+		"""
+		index = self._get_index()
+		ent_id = index.ent_ids.get(ent)
+		if ent_id is None or index.dep_sets[ent_id] is None:
+			return dep in self.dependencies[ent]
+		return dep in index.dep_sets[ent_id]
+
+	def valid_res_sts(self, ent, state, verbose=False):
+		"""
+		Check if they are valid resultant states for the entity.
+		
+		Arguments:
+		ent -- the entity
+		state -- the list of resultant states being checked
+		
+		Keyword arguments:
+		verbose -- activate throwing errors with descriptive messages (default False)
+		
+		Return values:
+		True -- if state is a valid list of resultant states for ent (a numpy array,
+		        PackedTruthTable or BDDTruthTable of the right length with values equal to 0 or 1)
+		False -- otherwise
+		
+		Exceptions:
+		ValueError -- raised when verbose mode on and the resultant states are invalid
+		"""
+		if not (type(state).__module__ == np.__name__ or
+		        isinstance(state, (PackedTruthTable, BDDTruthTable))):
+			if verbose:
+				raise ValueError('States must be in a numpy array, a PackedTruthTable or a '
+				                 'BDDTruthTable')
+			return False
+		if not self.is_ent(ent):
+			if verbose:
+				raise ValueError('Not an entity of the model')
+			return False
+		return valid_state(state, self.num_res_sts(ent), verbose)
+
+	def valid_gate(self, ent, gate, verbose=False):
+		"""
+		Check if it is a valid gate for the entity.
+		
+		Arguments:
+		ent -- the entity
+		gate -- the gate being checked (see GATETYPE)
+		
+		Keyword arguments:
+		verbose -- activate throwing errors with descriptive messages (default False)
+		
+		Return values:
+		True -- if gate is a dict with a type in GATETYPE.TYPES and a non-empty list of inputs,
+		        each a dependency of ent or a valid gate, along with a k between 1 and the number
+		        of inputs for k_of_n gates, and a non-negative weight for each input and a threshold
+		        for threshold gates
+		False -- otherwise
+		
+		Exceptions:
+		ValueError -- raised when verbose mode on and the gate is invalid
+		"""
+		if not self.is_ent(ent):
+			if verbose:
+				raise ValueError('Not an entity of the model')
+			return False
+		return self._valid_gate(ent, gate, verbose)
+
+	def _valid_gate(self, ent, gate, verbose=False):
+		"""
+		Check if it is a valid gate for the entity, which is known to be in the model
+		(see valid_gate).
+		"""
+		msg = None
+		if not isinstance(gate, dict) or gate.get('type') not in GATETYPE.TYPES:
+			msg = 'Gate must be a dict with a type in GATETYPE.TYPES'
+		elif not isinstance(gate.get('inputs'), list) or len(gate['inputs']) == 0:
+			msg = 'Gate must have a non-empty list of inputs'
+		elif gate['type'] == GATETYPE.K_OF_N and not (isinstance(gate.get('k'), (int, long)) and
+		                                               1 <= gate['k'] <= len(gate['inputs'])):
+			msg = 'k_of_n gate must have a k between 1 and the number of inputs'
+		elif gate['type'] == GATETYPE.THRESHOLD:
+			weights = gate.get('weights')
+			if (not isinstance(weights, list) or len(weights) != len(gate['inputs']) or
+			    not all(isinstance(weight, (int, long, float)) for weight in weights) or
+			    not is_all_non_neg(weights) or
+			    not isinstance(gate.get('threshold'), (int, long, float))):
+				msg = ('threshold gate must have a non-negative weight for each input and a '
+				       'threshold')
+		if msg is None:
+			for gate_input in gate['inputs']:
+				if isinstance(gate_input, dict):
+					if not self._valid_gate(ent, gate_input, verbose):
+						return False
+				elif not isinstance(gate_input, basestring) or not self.is_dep(ent, gate_input):
+					msg = 'Gate inputs must be dependencies of the entity or gates'
+					break
+		if msg is not None:
+			if verbose:
+				raise ValueError(msg)
+			return False
+		return True
+
+
+
+	#INFO
+
+	def n_dep_of_ent(self, ent):
+		"""
+		Calculate number of dependencies of an entity.
+		
+		Arguments:
+		ent -- the entity
+		
+		Return values:
+		the number of dependencies of ent (int)
+		
+		Exceptions:
+		ValueError -- raised if ent not in model
+		"""
+		if self.is_ent(ent):
+			return len(self.dependencies[ent])
+		raise ValueError('ent invalid for num of dep check')
+
+	def num_res_sts(self, ent):
+		"""
+		Calculate number of resultant states of an entity.
+		
+		Arguments:
+		ent -- the entity
+		
+		Return values:
+		the number of entity resultant states for ent (int)
+		
+		Exceptions:
+		ValueError -- raised if ent not in model
+		"""
+		if self.is_ent(ent):
+			return 2**self.n_dep_of_ent(ent)
+		raise ValueError('ent invalid for num states check')
+
+	def num_ents(self):
+		"""
+		Calculate the number of entities in the model.
+		
+		Return values:
+		the number of entities (int)
+		"""
+		return len(self.entities)
+		
+	def get_ents_with_internal_dep(self):
+		"""
+		Find entities with an internal dependency (that depend on an internal state).
+		
+		Return values:
+		the entities with an internal dependency (list)
+		"""
+		index = self._get_index()
+		return [ent for ent in self.entities
+		        if ent in (index.dep_sets[index.ent_ids[ent]] or self.dependencies[ent])]
+
+	def get_ent_id(self, ent):
+		"""
+		Get the integer id of an entity (its position in the model's entities).
+		
+		Arguments:
+		ent -- the entity
+		
+		Return values:
+		the id of ent (int)
+		
+		Exceptions:
+		ValueError -- raised if ent not in model
+		"""
+		if self.is_ent(ent):
+			return self._get_index().ent_ids[ent]
+		raise ValueError('not an entity')
+
+	def get_dep_ids(self, ent):
+		"""
+		Get the integer ids of the dependencies of an entity, in the order of its dependencies.
+		
+		Arguments:
+		ent -- the entity
+		
+		Return values:
+		the ids of the dependencies of ent, with -1 for any that is not an entity (int numpy array)
+		
+		Exceptions:
+		ValueError -- raised if ent not in model or its dependencies are not a list
+		"""
+		if self.is_ent(ent):
+			dep_ids = self._get_index().dep_ids[self._get_index().ent_ids[ent]]
+			if dep_ids is not None:
+				return dep_ids.copy()
+		raise ValueError('not an entity with a list of dependencies')
+
+	def get_bdd_order(self):
+		"""
+		Order the entities for BDDs, depth first from each entity in turn with each entity after
+		its dependencies, so that the dependencies of an entity, and theirs, are close together.
+		
+		Return values:
+		the entities in order (list)
+		"""
+		order = []
+		seen = set()
+		for start in self.entities:
+			if start in seen:
+				continue
+			seen.add(start)
+			stack = [(start, iter(self.dependencies[start]))]
+			while len(stack) > 0:
+				ent, deps = stack[-1]
+				for dep in deps:
+					if dep not in seen and self.is_ent(dep):
+						seen.add(dep)
+						stack.append((dep, iter(self.dependencies[dep])))
+						break
+				else:
+					stack.pop()
+					order.append(ent)
+		return order
+
+	def _get_bdd(self, ent):
+		"""
+		Get a BDD of the resultant state of an entity, testing its dependencies.
+		
+		Arguments:
+		ent -- the entity
+		
+		Return values:
+		the BDDManager and the node of the resultant state (tuple)
+		
+		Exceptions:
+		ValueError -- raised if ent not in model or its resultant states or gate are not valid
+		"""
+		if not self.is_ent(ent):
+			raise ValueError('not an entity')
+		deps = list(self.dependencies[ent])
+		if ent in self.gates:
+			self.valid_gate(ent, self.gates[ent], True)
+			manager = BDDManager(deps)
+			return manager, manager.from_gate(self.gates[ent])
+		states = self.resultant_states.get(ent)
+		self.valid_res_sts(ent, states, True)
+		if isinstance(states, BDDTruthTable):
+			if states.variables == deps:
+				return states.manager, states.root
+			manager = BDDManager(deps)
+			return manager, manager.from_manager(states.manager, states.root,
+			                                     dict(zip(states.variables, deps)))
+		manager = BDDManager(deps)
+		return manager, manager.from_table(deps, states)
+
+	def get_cut_sets(self, ent, max_size=None):
+		"""
+		Find the minimal cut sets of an entity: the smallest sets of its dependencies that make
+		its resultant state 0 when they are all 0, whatever its other dependencies are.
+		
+		Arguments:
+		ent -- the entity
+		
+		Keyword arguments:
+		max_size -- the largest cut set to find (default None; no limit)
+		
+		Return values:
+		the minimal cut sets, smallest first and then in dependency order, each a list of
+		dependencies in dependency order (list)
+		
+		Exceptions:
+		ValueError -- raised if ent not in model, its resultant states or gate are not valid, or
+		              its resultant states are not monotone
+		"""
+		manager, root = self._get_bdd(ent)
+		positions = dict((dep, k) for k, dep in enumerate(self.dependencies[ent]))
+		cuts = [sorted(cut, key=positions.get) for cut in manager.cut_sets(root, max_size)]
+		return sorted(cuts, key=lambda cut: (len(cut), [positions[dep] for dep in cut]))
+
+	def get_up_probability(self, ent, probabilities):
+		"""
+		Find the probability that the resultant state of an entity is 1.
+		
+		Arguments:
+		ent -- the entity
+		probabilities -- the probability that each dependency of ent is 1, independently of the
+		                 others (dict)
+		
+		Return values:
+		the probability (float)
+		
+		Exceptions:
+		ValueError -- raised if ent not in model, its resultant states or gate are not valid, or
+		              a dependency its resultant state depends on has no probability
+		"""
+		manager, root = self._get_bdd(ent)
+		try:
+			return manager.probability(root, probabilities)
+		except KeyError:
+			raise ValueError('need the probability of each dependency')
+
+	def _valid_parent(self, parent):
+		"""
+		Check if it is a valid parent name.
+		
+		Arguments:
+		parent -- the string name being checked
+		
+		Return values:
+		True -- if parent is an eligible parent name
+		False -- otherwise
+		"""
+		return parent == '' or self.is_ent(parent) or parent in ENTTYPE.TYPES
+
+	def valid_parent(self, ent, parent):
+		"""
+		Check if it is a valid parent for the entity.
+		
+		Arguments:
+		ent -- the entity
+		parent -- the parent name being checked
+		
+		Return values:
+		True -- if parent is an eligible parent name (either another entity, a type, or blank)
+		False -- otherwise
+		
+		Exceptions:
+		ValueError -- raised if ent not in model or ent and parent are the same
+		"""
+		if self.is_ent(ent) and ent != parent:
+			return self._valid_parent(parent)
+		raise ValueError('ent invalid')
+
+	def _are_functions(self, ents):
+		"""
+		Check whether all are of type function.
+		
+		Arguments:
+		ents -- the list of entities being checked
+		
+		Return values:
+		True -- if all entities in ents are functions
+		False -- otherwise
+		"""
+		for ent in ents:
+			if self.ent_types[ent] != ENTTYPE.FUNCTION:
+				return False
+		return True
+
+
+
+
+	#FINAL CHECKS
+
+	def ents_ready(self, verbose=False):
+		"""
+		Check if entities are ready.
+		
+		Keyword arguments:
+		verbose -- activate throwing errors with descriptive messages (default False)
+		
+		Return values:
+		True -- if entities are valid (at least one exists in model, at least one is a function,
+		        and all names do not contain any of the following chars: \, /, *, ?, <, >, |, %, ")
+		False -- otherwise
+		
+		Exceptions:
+		ValueError -- raised when verbose mode on and entities are not valid
+		"""
+		return self._cached_check('ents', self._ents_ready, verbose)
+
+	def _ents_ready(self, verbose=False):
+		"""
+		Check if entities are ready, without using the cached result (see ents_ready).
+		"""
+		if len(self.entities) == 0:
+			if verbose:
+				raise ValueError('Model has no entities')
+			return False
+		illegal = re.compile('[/*?<>|%"\\\\]')
+		for ent in self.entities:
+			if re.search(illegal, "%r"%ent):
+				if verbose:
+					msg = 'Entity names cannot contain the following: \\, /, *, ?, <, >, |, %, "'
+					raise ValueError(msg)
+				return False
+		if not ENTTYPE.FUNCTION in self.ent_types.values():
+			if verbose:
+				raise ValueError('Model has no functions')
+			return False
+		return True
+
+	def deps_ready(self, verbose=False):
+		"""
+		Check if dependencies are ready.
+		
+		Keyword arguments:
+		verbose -- activate throwing errors with descriptive messages (default False)
+		
+		Return values:
+		True -- if dependencies of each entity are valid (every entity has at least one dependency, at least
+        		one entity has an internal dependency, and resources do not depend on other resources)
+		False -- otherwise
+		
+		Exceptions:
+		ValueError -- raised when verbose mode on and dependencies are not valid
+		"""
+		return self._cached_check('deps', self._deps_ready, verbose)
+
+	def _deps_ready(self, verbose=False):
+		"""
+		Check if dependencies are ready, without using the cached result (see deps_ready).
+		"""
+		internal_deps = 0
+		for ent in self.entities:
+			if len(self.dependencies[ent]) == 0:
+				if verbose:
+					raise ValueError('Entity with no dependency')
+				return False #every entity must have at least one dependency
+			if self.ent_types[ent] == ENTTYPE.RESOURCE:
+				for dep in self.dependencies[ent]:
+					if self.ent_types[dep] == ENTTYPE.RESOURCE and ent != dep:
+						if verbose:
+							raise ValueError('Resource depending on another distinct resource')
+						return False  # resource cannot depend on a different resource
+			if ent in self.dependencies[ent]:
+				internal_deps += 1
+		if internal_deps == 0:
+			if verbose:
+				raise ValueError('No entities with internal dependency')
+			return False  # must have at least one internally-dependent entity
+		return True
+
+	def res_sts_ready(self, verbose=False):
+		"""
+		Check if resultant states are ready.
+		
+		Keyword arguments:
+		verbose -- activate throwing errors with descriptive messages (default False)
+		
+		Return values:
+		True -- if resultant states of each entity without a gate are valid (a numpy array,
+		        PackedTruthTable or BDDTruthTable of the right length with values equal to 0 or 1)
+		False -- otherwise
+		"""
+		return self._cached_check('res_sts', self._res_sts_ready, verbose)
+
+	def _res_sts_ready(self, verbose=False):
+		"""
+		Check if resultant states are ready, without using the cached result (see res_sts_ready).
+		"""
+		for ent in self.entities:
+			if (ent not in self.gates and
+			    not self.valid_res_sts(ent, self.resultant_states[ent], verbose)):
+				return False
+		return True
+
+	def gates_ready(self, verbose=False):
+		"""
+		Check if gates are ready.
+		
+		Keyword arguments:
+		verbose -- activate throwing errors with descriptive messages (default False)
+		
+		Return values:
+		True -- if gates are only for entities of the model, and are valid for them (see valid_gate)
+		False -- otherwise
+		"""
+		for ent in self.gates.keys():
+			if not self.valid_gate(ent, self.gates[ent], verbose):
+				return False
+		return True
+
+	def res_lm_ready(self, verbose=False):
+		"""
+		Check if resource limits are ready.
+		
+		Keyword arguments:
+		verbose -- activate throwing errors with descriptive messages (default False)
+		
+		Return values:
+		True -- if resource limits are valid (non-negative and only for resource entities)
+		False -- otherwise
+		"""
+		res_lims = self.resource_limits
+		return self._cached_check('res_lm', lambda verbose: self._res_lm_ready(res_lims, verbose),
+		                          verbose)
+
+	def _res_lm_ready(self, res_lims, verbose=False):
+		"""
+		Check if resource limits are ready.
+				
+		Arguments:
+		res_lims -- the resource limits for the resources in the model
+		
+		Keyword arguments:
+		verbose -- activate throwing errors with descriptive messages (default False)
+		
+		Return values:
+		True -- if resource limits are valid (non-negative and only for resource entities)
+		False -- otherwise
+		
+		Exceptions:
+		ValueError -- raised when verbose mode on and limits are not valid
+		"""
+		if not self.are_ents(res_lims.keys()):
+			if verbose:
+				raise ValueError('Not all entities of the model')
+			return False
+		if not is_all_non_neg(res_lims.values()):
+			if verbose:
+				raise ValueError('Not all non-negative values')
+			return False
+		for res_ent in res_lims.keys():
+			if self.ent_types[res_ent] != ENTTYPE.RESOURCE:#ENTTYPE_RESOURCE:
+				if verbose:
+					raise ValueError('Not all resources')
+				return False
+		return True
+
+	def op_p_ready(self, verbose=False):
+		"""
+		Check if performance levels are ready.
+		
+		Keyword arguments:
+		verbose -- activate throwing errors with descriptive messages (default False)
+		
+		Return values:
+		True -- if performance levels are valid (only for function entities
+		        and sum of values is between 0.9999999999 and 0.0000000001)
+		False -- otherwise
+		"""
+		op_perf_levs = self.op_performance_levels
+		return self._cached_check('op_p', lambda verbose: self._op_p_ready(op_perf_levs, verbose),
+		                          verbose)
+
+	def _op_p_ready(self, op_perf_levs, verbose=False):
+		"""
+		Check if performance levels are ready.
+		
+		Arguments:
+		op_perf_levs -- the performance levels of the functions in the model
+		
+		Keyword arguments:
+		verbose -- activate throwing errors with descriptive messages (default False)
+		
+		Return values:
+		True -- if performance levels are valid (only for function entities
+		        and sum of values is between 0.9999999999 and 0.0000000001)
+		False -- otherwise
+		
+		Exceptions:
+		ValueError -- raised when verbose mode on and levels are not valid
+		"""
+		if not self._are_functions(op_perf_levs.keys()):
+			if verbose:
+				raise ValueError('Not all functions')
+			return False
+		if abs(sum(op_perf_levs.values())-1.0) > 1.0e-10:
+			if verbose:
+				raise ValueError('Sum of levels not between 0.9999999999 and 0.0000000001')
+			return False
+		return True
+
+	def ready(self, verbose=False):
+		"""
+		Check if model is ready for analysis.
+		
+		Keyword arguments:
+		verbose -- activate throwing errors with descriptive messages (default False)
+		
+		Return values:
+		True -- if minimum entry requirements complete (entities, dependencies, resultant
+			    states, gates, performance levels, and resource limits all ready)
+		False -- otherwise
+		"""
+		if (self.ents_ready(verbose) and self.deps_ready(verbose) and
+		    self.res_sts_ready(verbose) and self.gates_ready(verbose)):
+			if self.op_p_ready(verbose) and self.res_lm_ready(verbose):
+				return True
+		return False
+
+
+
+
+	#ADDITIONS
+	def add_entity(self, name, ent_type, parent=''):
+		"""
+		Add a new entity to the model.
+		
+		Arguments:
+		name -- string name of the new entity
+		ent_type -- the type of the new entity
+		
+		Keyword arguments:
+		parent -- the parent name of the new entity (default '';
+		          parent will be set to same value as ent_type)
+		
+		Return values:
+		True -- if entity added
+		False -- if entity already exists, type is invalid, or parent is invalid
+		"""
+		if (not self.is_ent(name) and ent_type in ENTTYPE.TYPES and
+			   self._valid_parent(parent) and parent != name):
+
+			self.entities.append(name)
+			self.ent_types[name] = ent_type
+			if parent == '':
+				parent = ent_type
+			self.parents[name] = parent
+			self.dependencies[name] = []
+			self.resultant_states[name] = []
+			return True
+		else:
+			return False
+			
+	def add_dep(self, ent, dep_name):
+		"""
+		Add a new dependency relationship between two entities.
+		
+		Arguments:
+		ent -- the entity with the new dependency on dep_name
+		dep_name -- the entity that will be added to ent's list of dependencies
+		
+		Return values:
+		True -- if dependency on dep_name added to ent 
+		False -- if the dependency already exists, if ent or dep_name are not entities,
+				 or if they're both resources that are distinct from one another
+		"""
+		if self.is_ent(ent) and self.is_ent(dep_name) and self.is_dep(ent, dep_name) == False:
+			if self.ent_types[ent] == ENTTYPE.RESOURCE and self.ent_types[dep_name] == ENTTYPE.RESOURCE:
+				if ent != dep_name:
+					return False
+			self.dependencies[ent].append(dep_name)
+			if ent not in self.gates:  # a gate is left as it is, not using the new dependency
+				self._set_default_res_sts(ent)
+			return True
+		return False
+		
+	def merge_models(self, new_model, weight=0.5):
+		"""
+		Add entities of another model to this model.
+		
+		Arguments:
+		new_model -- the other GMORModel being merged into this model
+		
+		Keyword arguments:
+		weight -- used to adjust performance levels to sum to 1 after merge (default 0.5)
+		
+		Exceptions:
+		ValueError -- raised when new_model is not ready
+		"""
+		if not new_model.ready():
+			raise ValueError('Must pass in a model ready for analysis')
+		for ent in new_model.entities:
+			if self.is_ent(ent):
+				raise ValueError('Models cannot share any entities')
+			
+		#adjust performance levels of functions in this model	
+		for ent in self.op_performance_levels.keys():
+			self.op_performance_levels[ent] = self.op_performance_levels[ent]*weight
+		for ent in new_model.entities:
+			self.entities.append(ent)
+			self.ent_types[ent] = new_model.ent_types[ent]
+			self.parents[ent] = new_model.parents[ent]
+			self.dependencies[ent] = new_model.dependencies[ent]
+			if ent in new_model.gates:
+				self.gates[ent] = copy.deepcopy(new_model.gates[ent])
+			else:
+				self.resultant_states[ent] = new_model.resultant_states[ent]
+			if ent in new_model.resource_limits:
+				self.resource_limits[ent] = new_model.resource_limits[ent]
+			if ent in new_model.op_performance_levels:
+				self.op_performance_levels[ent] = new_model.op_performance_levels[ent]*(1.0-weight)
+	
+	
+	#SETTINGS
+	def _set_default_res_sts(self, ent):
+		"""
+		Set default resultant states for an entity (states will all be zero).
+		
+		Arguments:
+		ent -- the entity
+		
+		Exceptions:
+		ValueError -- raised if ent is not in model
+		"""
+		if self.is_ent(ent):
+			self.resultant_states[ent] = np.zeros(self.num_res_sts(ent), dtype=int)
+		else:
+			raise ValueError('resultant states default cannot be set for invalid ent')
+			
+	def set_res_sts(self, ent, states, verbose=False):
+		"""
+		Set new resultant states for an entity.
+		
+		Arguments:
+		ent -- the entity
+		states -- the new resultant states for ent (numpy array, PackedTruthTable or BDDTruthTable)
+		
+		Keyword arguments:
+		verbose -- activate throwing errors with descriptive messages (default False)
+		
+		Return values:
+		True -- if states copied in
+		False -- if ent does not exist, states length is not 2**len(dep of ent)
+			     or values of states are not all 0 or 1
+		"""
+		if self.valid_res_sts(ent, states, verbose):
+			self.resultant_states[ent] = copy.copy(states)
+			if ent in self.gates:
+				del self.gates[ent]
+			return True
+		return False
+
+	def set_gate(self, ent, gate, verbose=False):
+		"""
+		Set a gate giving the resultant state of an entity in place of its resultant states.
+		
+		Arguments:
+		ent -- the entity
+		gate -- the new gate for ent (see GATETYPE)
+		
+		Keyword arguments:
+		verbose -- activate throwing errors with descriptive messages (default False)
+		
+		Return values:
+		True -- if gate copied in
+		False -- if ent does not exist or gate is not valid for it (see valid_gate)
+		"""
+		if self.valid_gate(ent, gate, verbose):
+			self.gates[ent] = copy.deepcopy(gate)
+			if ent in self.resultant_states:
+				del self.resultant_states[ent]
+			return True
+		return False
+
+	def compile_bdds(self, order=None):
+		"""
+		Store the resultant states of each entity without a gate as a BDDTruthTable, all sharing
+		the nodes of one BDDManager, so that no table of 2**n states is kept for them.
+		
+		Keyword arguments:
+		order -- the entities in the order the BDDs test them (default None; see get_bdd_order)
+		
+		Return values:
+		the BDDManager holding the nodes
+		
+		Exceptions:
+		ValueError -- raised when the resultant states are not ready
+		"""
+		if not self.res_sts_ready():
+			raise ValueError('resultant states must be ready to compile BDDs')
+		if order is None:
+			order = self.get_bdd_order()
+		manager = BDDManager(order)
+		for ent in self.entities:
+			if ent in self.gates:
+				continue
+			deps = list(self.dependencies[ent])
+			states = self.resultant_states[ent]
+			if isinstance(states, BDDTruthTable):
+				root = manager.from_manager(states.manager, states.root,
+				                            dict(zip(states.variables, deps)))
+			else:
+				root = manager.from_table(deps, states)
+			self.resultant_states[ent] = BDDTruthTable(manager, root, deps)
+		return manager
+		
+	def set_op_perf_levs(self, op_perf_levs, verbose=False):
+		"""
+		Set new performance levels.
+		
+		Arguments:
+		op_perf_levs -- the new levels
+		
+		Keyword arguments:
+		verbose -- activate throwing errors with descriptive messages (default False)
+		
+		Return values:
+		True -- if op_perf_levs copied in
+		False -- if some keys of op_perf_levs are not functions,
+		         or the sum of values is not between 0.9999999999 and 0.0000000001
+		"""
+		if self._op_p_ready(op_perf_levs, verbose):
+			self.op_performance_levels = copy.copy(op_perf_levs)
+			return True
+		return False
+		
+	def set_res_lim(self, res_lim, verbose=False):
+		"""
+		Set new resource limits.
+		
+		Arguments:
+		res_lim -- the new resource limits
+		
+		Keyword arguments:
+		verbose -- activate throwing errors with descriptive messages (default False)
+		
+		Return values:
+		True -- if res_lim copied in
+		False -- if some keys of res_lim are not resources,
+		         or values are not all non-negative
+		"""
+		if self._res_lm_ready(res_lim, verbose):
+			self.resource_limits = copy.copy(res_lim)
+			return True
+		return False
+	
+	
+	
+	
+	#DELETIONS
+	def del_entity(self, name):
+		"""
+		Delete entity and track affected entities.
+		
+		Arguments:
+		name -- the name of the entity
+		
+		Return values:
+		all the entities that used to depend on the deleted entity (list)
+		
+		Exceptions:
+		ValueError -- raised if ent does not exist in model
+		"""
+		if self.is_ent(name):
+			affected_ents = []
+			self.entities.remove(name)
+			self.dependencies.pop(name)
+			self.parents.pop(name)
+			self.resultant_states.pop(name, None)
+			self.gates.pop(name, None)
+			if self.ent_types[name] == ENTTYPE.FUNCTION:
+				self.op_performance_levels.pop(name)
+			elif self.ent_types[name] == ENTTYPE.RESOURCE:
+				self.resource_limits.pop(name)
+			self.ent_types.pop(name)
+			for ent in self.entities:
+				if name in self.dependencies[ent]:
+					affected_ents.append(ent)
+					self.dependencies[ent].remove(name)
+					if ent in self.gates:
+						self._remove_gate_input(ent, name)
+					else:
+						self._set_default_res_sts(ent)
+			return affected_ents
+		raise ValueError('not an entity')
+	
+	def del_dep(self, ent, dep):
+		"""
+		Delete dependency relationship between two entities.
+		
+		Arguments:
+		ent -- the entity that used to depend on dep
+		dep_name -- the entity that will be removed from ent's list of dependencies
+		
+		Return values:
+		True -- if dependency removed (and ent's resultant states set to all zeros, or
+		        dep removed from ent's gate)
+		False -- if ent or dep is not an entity, or the dependency relationship doesn't exist
+		"""
+		if self.is_ent(ent) and self.is_ent(dep) and self.is_dep(ent, dep):
+			self.dependencies[ent].remove(dep)
+			#self.resultantStates[ent] = []
+			if ent in self.gates:
+				self._remove_gate_input(ent, dep)
+			else:
+				self._set_default_res_sts(ent)
+			return True
+		return False
+
+	def _remove_gate_input(self, ent, dep):
+		"""
+		Remove a dependency that an entity no longer has from the inputs of its gate. If no inputs
+		are left, the gate is replaced by default resultant states.
+		
+		Arguments:
+		ent -- the entity with a gate
+		dep -- the dependency
+		"""
+		if dep in self.dependencies[ent]:
+			return  # still a dependency
+		gate = _prune_gate(self.gates[ent], dep)
+		if gate is None:
+			del self.gates[ent]
+			self._set_default_res_sts(ent)
+		else:
+			self.gates[ent] = gate
+	
+
+
+	
+	#EDITS
+	def _edit_ent_type(self, ent, new_ent_type):
+		"""
+		Change the type of an entity.
+		
+		Arguments:
+		ent -- the entity
+		new_ent_type -- the new type of ent
+		
+		Return values:
+		True -- if ent's type has been changed to new_ent_type
+		False -- if ent is not an entity, new_ent_type is not a valid type,
+		         new_ent_type is the same as ent's current type, or the new type
+				 is resource and ent depends on another resource
+		"""
+		if self.is_ent(ent) and new_ent_type in ENTTYPE.TYPES and new_ent_type != self.ent_types[ent]:
+			if new_ent_type == ENTTYPE.FUNCTION:
+				self.op_performance_levels[ent] = 0.0
+			elif new_ent_type == ENTTYPE.RESOURCE:
+				for dep in self.dependencies[ent]:
+					if dep != ent and self.ent_types[dep] == ENTTYPE.RESOURCE:
+						return False
+				self.resource_limits[ent] = 0
+				
+			if self.ent_types[ent] == ENTTYPE.FUNCTION:
+				del self.op_performance_levels[ent]
+			elif self.ent_types[ent] == ENTTYPE.RESOURCE:
+				del self.resource_limits[ent]			
+
+			self.ent_types[ent] = new_ent_type
+				
+			return True
+		return False
+		
+	def _edit_parent(self, ent, new_parent):
+		"""
+		Change the parent of an entity.
+		
+		Arguments:
+		ent -- the entity
+		new_parent -- the new parent of ent
+		
+		Return values:
+		True -- if ent's parent has been changed to new_parent
+		False -- if new_parent is not a valid parent name or is the same
+		         as ent's current parent
+		"""
+		if self.valid_parent(ent, new_parent) and new_parent != self.parents[ent]:
+			self.parents[ent] = new_parent
+			return True
+		return False
+		
+	def edit_entity(self, ent, new_ent_type, new_ent_parent):
+		"""
+		Change the parent or the type (or both) of an entity.
+		
+		Arguments:
+		ent -- the entity
+		new_ent_type -- the new type of ent
+		new_ent_parent -- the new parent of ent
+		
+		Return values:
+		True -- if the parent or the type of ent changed
+		False -- otherwise
+		"""		
+		edited = False
+		
+		if self._edit_parent(ent, new_ent_parent):
+			edited = True
+		if self._edit_ent_type(ent, new_ent_type):
+			edited = True			
+		return edited
+		
+class GMORScenarioModel(object):
+	"""
+	Builds and modifies a scenario model based on the properties of a GMORModel.
+	
+	Public methods:
+	reset, set_and_check, set, valid_states, valid_internal_states,
+	valid_realized_timelines, valid_efforts, valid_deadlines, cur_int_st_ready, rlzd_time_ready,
+	rlzd_ex_ready, eff_ready, deads_ready, ready, set_current_internal_states, set_realized_timelines,
+	set_realized_exit_by_ent, set_realized_exits, set_effort_by_resource, set_deadlines, set_new_scen_model
+						
+	Instance variables:
+	model, name, current_internal_states, realized_timelines, realized_exits, efforts, deadlines
+	"""
+	
+	def __init__(self, model, name):
+		"""
+		Constructs a scenario model.
+		
+		Arguments:
+		model -- GMORModel the scenario will be based on
+		name -- identifier of scenario model
+		
+		Exceptions:
+		ValueError -- raised when GMORModel is not ready for analysis
+		"""
+		if model.ready():
+			self.model = model
+		else:
+			raise ValueError('must send in a model ready for analysis')
+		self.reset(model)
+		self.name = name
+		
+	def reset(self, model):
+		"""
+		Reset scenario conditions.
+		
+		Arguments:
+		model -- GMORModel the scenario is based on		
+		"""
+		self.current_internal_states = {}
+		self.realized_timelines = {}
+		self.realized_exits = {}
+		self.efforts = {}
+		self.deadlines = {}
+		for ent in model.entities:
+			if ent in model.dependencies[ent]:  # if entity is dependent of itself
+				self.current_internal_states[ent] = 1
+				self.realized_exits[ent] = -1
+			self.realized_timelines[ent] = 0.0
+			if model.ent_types[ent] != ENTTYPE.RESOURCE:  # if entity is not a resource
+				for dep in model.dependencies[ent]:
+					if model.ent_types[dep] == ENTTYPE.RESOURCE:  # if dependency of entity is a resource
+						if self.efforts.has_key(ent) == False:  # if first found resource dependency of ent
+							self.efforts[ent] = {}
+						self.efforts[ent][dep] = 0  #{ent:{dep:0},...}
+			if model.ent_types[ent] == ENTTYPE.FUNCTION:
+				self.deadlines[ent] = 0.0
+				
+	def set_and_check(self, model, current_internal_states,
+					              realized_timelines, realized_exits, efforts, deadlines):
+		"""
+		Set up scenario model and check if it's ready for analysis.
+		
+		Arguments:
+		model -- GMORModel the scenario is based on
+		current_internal_states -- state of internally dependent entities
+								   (0 for unavailable, 1 for available)
+		realized_timelines -- time it takes for an entity's state to change once it's dependencies are met
+		realized_exits -- amount of time an internal dependency of an entity is available
+		efforts -- number of units of a resource dependency an entity requires
+		deadlines -- for function entities, the time that the entity must be active by
+		
+		Return values:
+		True -- if scenario model is ready for analysis
+		False -- otherwise
+		"""
+		self.set(model, current_internal_states, realized_timelines, realized_exits, efforts, deadlines)
+		if self.ready():
+			return True
+		return False
+		
+	def set(self, model, current_internal_states, realized_timelines, realized_exits, efforts, deadlines):
+		"""
+		Set up scenario model with given conditions.
+		
+		Arguments:
+		model -- GMORModel the scenario is based on
+		current_internal_states -- state of internally dependent entities
+								   (0 for unavailable, 1 for available)
+		realized_timelines -- time it takes for an entity's state to change once it's dependencies are met
+		realized_exits -- amount of time an internal dependency of an entity is available
+		efforts -- number of units of a resource dependency an entity requires
+		deadlines -- for function entities, the time that the entity must be active by
+		
+		Exceptions:
+		ValueError -- raised when GMORModel is not ready for analysis
+		"""
+		if model.ready():
+			self.model = model
+		else:
+			raise ValueError('must send in a model ready for analysis')
+		self.current_internal_states = current_internal_states
+		self.realized_timelines = realized_timelines
+		self.realized_exits = realized_exits
+		self.efforts = efforts
+		self.deadlines = deadlines
+		
+	#CHECKS
+	def valid_states(self, arr):
+		"""
+		Check states of entities are valid.
+		
+		Arguments:
+		arr -- the states
+		
+		Return values:
+		True -- if states are valid (i.e. either 0 or 1 and not empty)
+		False -- otherwise
+		"""
+		if set(arr) == set([0, 1]) or set(arr) == set([0]) or set(arr) == set([1]): 
+			return True
+		return False
+		
+	def _valid_internal_states(self, int_states, model, verbose=False):
+		"""
+		Check internal states of entities are valid and match with dependencies.
+		
+		Arguments:
+		int_states -- current internal states of the entities
+		model -- GMORModel scenario is based on
+		
+		Keyword arguments:
+		verbose -- activate throwing errors with descriptive messages (default False)
+		
+		Return values:
+		True -- if states are valid (i.e. either 0 or 1) and match dependencies
+		False -- otherwise
+		
+		Exceptions:
+		ValueError -- raised when verbose mode on and internal states are invalid
+		"""
+		if not model.are_ents(int_states.keys()):
+			if verbose:
+				raise ValueError('Not all entities of the model')
+			return False
+		if not self.valid_states(int_states.values()):
+			if verbose:
+				raise ValueError('Invalid states (must be 0 or 1)')
+			return False
+		for ent in int_states.keys():
+			if ent not in model.dependencies[ent]:
+				if verbose:
+					raise ValueError('Not an internally-dependent entity')
+				return False
+		return True
+		
+	def valid_internal_states(self, int_states, verbose=False):
+		"""
+		Check internal states of entities are valid and match with dependencies.
+		
+		Arguments:
+		int_states -- current internal states of the entities
+		
+		Keyword arguments:
+		verbose -- activate throwing errors with descriptive messages (default False)
+		
+		Return values:
+		True -- if states are valid (i.e. either 0 or 1) and match dependencies
+		False -- otherwise
+		"""
+		return self._valid_internal_states(int_states, self.model, verbose)
+		
+	def valid_realized_timelines(self, timelines, verbose=False):
+		"""
+		Check time lines of entities are valid.
+		
+		Arguments:
+		timelines -- realized time lines of the entities
+		
+		Keyword arguments:
+		verbose -- activate throwing errors with descriptive messages (default False)
+		
+		Return values:
+		True -- if each entity of GMORModel has a valid (i.e. non-negative) time line
+		False -- otherwise
+		
+		Exceptions:
+		ValueError -- raised when verbose mode on and time lines are invalid
+		"""
+		if not self.model.are_ents(timelines.keys()):
+			if verbose:
+				raise ValueError('Not all entities of the model')
+			return False
+		if not is_all_non_neg(timelines.values()):
+			if verbose:
+				raise ValueError('Negative time lines invalid')
+			return False
+		for ent in self.model.entities:
+			if ent not in timelines.keys():
+				if verbose:
+					raise ValueError('Missing time line for an entity')
+				return False
+		return True
+		
+	def valid_efforts(self, efforts, verbose=False):
+		"""
+		Check efforts of entities are valid and match with dependencies.
+		
+		Arguments:
+		efforts -- efforts of the entities
+		
+		Keyword arguments:
+		verbose -- activate throwing errors with descriptive messages (default False)
+		
+		Return values:
+		True -- if efforts of each entity are valid (i.e. non-negative) and match dependencies
+				(efforts for resource entities cannot be included)
+		False -- otherwise
+		
+		Exceptions:
+		ValueError -- raised when verbose mode on and efforts are invalid
+		"""
+		#print '1',self.model.are_ents(efforts.keys())
+		if self.model.are_ents(efforts.keys()):
+			for ent in efforts.keys():
+				#print '5',is_all_non_neg(efforts[ent].values()) == False
+				if is_all_non_neg(efforts[ent].values()) == False:
+					if verbose:
+						raise ValueError('Negative efforts invalid')
+					return False
+				if self.model.ent_types[ent] == ENTTYPE.RESOURCE:  # efforts for resources not allowed
+					if verbose:
+						raise ValueError('Cannot have efforts for resource entities')
+					return False
+				for dep_ent in efforts[ent].keys():
+					eff_val = efforts[ent][dep_ent]
+					#print '2',eff_val < 0
+					#if eff_val < 0:
+						#return False
+					#print '3',self.model.is_dep(ent,dep_ent) == False
+					#print '4',self.model.ent_types[dep_ent]# != ENTTYPE.RESOURCE
+					if self.model.is_dep(ent, dep_ent) == False:
+						if verbose:
+							raise ValueError('Entity does not depend on resource')
+						return False
+					if self.model.ent_types[dep_ent] != ENTTYPE.RESOURCE:
+						if verbose:
+							raise ValueError('Dependency not a resource entity')
+						return False
+			return True
+		if verbose:
+			raise ValueError('Not all entities of the model')
+		return False
+		
+	def _valid_realized_exits(self, rlzd_exits, verbose=False):
+		"""
+		Check realized exits of entities are valid and match with dependencies.
+		
+		Arguments:
+		rlzd_exit -- realized exits of the entities
+		
+		Keyword arguments:
+		verbose -- activate throwing errors with descriptive messages (default False)
+		
+		Return values:
+		True -- if realized exits are valid (i.e. either -1 or non-negative) and match dependencies
+		False -- otherwise
+		
+		Exceptions:
+		ValueError -- raised when verbose mode on and exits are invalid
+		"""
+		if self.model.are_ents(rlzd_exits.keys()):	
+			for ent in rlzd_exits.keys():
+				if ent not in self.model.dependencies[ent]:
+					if verbose:
+						raise ValueError('Not an internally-dependent entity')
+					return False
+				if rlzd_exits[ent] < 0.0 and rlzd_exits[ent] > -1:
+					if verbose:
+						raise ValueError('Exit between -1 and 0 invalid')
+					return False
+				if rlzd_exits[ent] < -1:
+					if verbose:
+						raise ValueError('Exit less than -1 invalid')
+					return False
+			return True
+		if verbose:
+			raise ValueError('Not all entities of the model')
+		return False
+	
+	def valid_deadlines(self, deadlines, verbose=False):
+		"""
+		Check if deadlines are valid.
+		
+		Keyword arguments:
+		deadlines -- deadlines of the function entities
+		verbose -- activate throwing errors with descriptive messages (default False)
+		
+		Return values:
+		True -- if deadlines of each entity are valid (not empty, keys are ents, and no negative values)
+		False -- otherwise
+		
+		Exceptions:
+		ValueError -- raised when verbose mode on and deadlines are not valid
+		"""
+		if len(deadlines.keys()) == 0:
+			if verbose:
+				raise ValueError('No deadlines')
+			return False
+		if not self.model.are_ents(deadlines.keys()):
+			if verbose:
+				raise ValueError('Not all entities of the model')
+			return False
+		if not is_all_non_neg(deadlines.values()):
+			if verbose:
+				raise ValueError('Not all non-negative values')
+			return False
+		return True
+		
+	#FINAL CHECKS
+	def cur_int_st_ready(self, verbose=False):
+		"""
+		Check that the current internal states are ready for analysis.
+		
+		Keyword arguments:
+		verbose -- activate throwing errors with descriptive messages (default False)
+		
+		Return values:
+		True -- if the states are ready
+		False -- otherwise
+		"""
+		return self.valid_internal_states(self.current_internal_states, verbose)
+		
+	def rlzd_time_ready(self, verbose=False):
+		"""
+		Check that the realized time lines are ready for analysis.
+		
+		Keyword arguments:
+		verbose -- activate throwing errors with descriptive messages (default False)
+		
+		Return values:
+		True -- if the time lines are ready
+		False -- otherwise
+		"""
+		return self.valid_realized_timelines(self.realized_timelines, verbose)
+		
+	def rlzd_ex_ready(self, verbose=False):
+		"""
+		Check that the realized exits are ready for analysis.
+		
+		Keyword arguments:
+		verbose -- activate throwing errors with descriptive messages (default False)
+		
+		Return values:
+		True -- if the exits are ready
+		False -- otherwise
+		"""
+		return  self._valid_realized_exits(self.realized_exits, verbose)
+		
+	def eff_ready(self, verbose=False):
+		"""
+		Check that the efforts are ready for analysis.
+		
+		Keyword arguments:
+		verbose -- activate throwing errors with descriptive messages (default False)
+		
+		Return values:
+		True -- if the efforts are ready
+		False -- otherwise
+		"""
+		return self.valid_efforts(self.efforts, verbose)
+		
+	def deads_ready(self, verbose=False):
+		"""
+		Check if deadlines are ready.
+		
+		Keyword arguments:
+		verbose -- activate throwing errors with descriptive messages (default False)
+		
+		Return values:
+		True -- if deadlines are ready
+		False -- otherwise
+		"""
+		return self.valid_deadlines(self.deadlines, verbose)
+		
+	def ready(self, verbose=False):
+		"""
+		Check that the scenario model is ready for analysis.
+		
+		Keyword arguments:
+		verbose -- activate throwing errors with descriptive messages (default False)
+		
+		Return values:
+		True -- if the scenario model is ready
+		False -- otherwise
+		"""
+		if (self.cur_int_st_ready(verbose) and self.rlzd_time_ready(verbose)
+    		and self.rlzd_ex_ready(verbose) and self.eff_ready(verbose) and self.deads_ready(verbose)):
+			return True
+		return False
+		
+	#SETTINGS
+	def set_current_internal_states(self, curr_int_sts, verbose=False):
+	#must be comprised of existing entities with internal dependencies and states equal to 0 or 1
+		"""
+		Set new internal states.
+		
+		Arguments:
+		curr_int_sts -- the new states of entities with internal dependence
+		
+		Keyword arguments:
+		verbose -- activate throwing errors with descriptive messages (default False)
+		
+		Return values:
+		True -- if the new states are valid and have been copied in
+		False -- otherwise
+		"""
+		#if self.model.are_ents(curr_int_sts.keys()) and self.valid_states(curr_int_sts.values()):
+		#	for ent in curr_int_sts:
+		#		if ent not in self.model.dependencies[ent]:
+		#			return False
+		if self.valid_internal_states(curr_int_sts, verbose):
+			self.current_internal_states = copy.copy(curr_int_sts)
+			return True
+		return False
+		
+	def set_realized_timelines(self, rlzd_times, verbose=False):# must include all ents of model with non-zero time
+		"""
+		Set new realized time lines.
+		
+		Arguments:
+		rlzd_times -- the new time lines of the entities
+		
+		Keyword arguments:
+		verbose -- activate throwing errors with descriptive messages (default False)
+		
+		Return values:
+		True -- if the new time lines are valid and have been copied in
+		False -- otherwise
+		"""
+		#if self.model.are_ents(rlzd_times.keys()) and is_all_non_neg(rlzd_times.values()):
+		#	for ent in self.model.entities:
+		#		if ent not in rlzd_times.keys():
+		#			return False
+		if self.valid_realized_timelines(rlzd_times, verbose):
+			self.realized_timelines = copy.copy(rlzd_times)
+			return True
+		return False
+		
+	def set_realized_exit_by_ent(self, ent, rlzd_exit, verbose=False):
+		"""
+		Set a new realized exit for an entity.
+		
+		Arguments:
+		ent -- the entity
+		rlzd_exit -- the new exit for ent
+		
+		Keyword arguments:
+		verbose -- activate throwing errors with descriptive messages (default False)
+		
+		Return values:
+		True -- if rlzd_exit is valid (entity has an internal dependence
+		        and time is >=0.0 or ==-1) and has been copied in
+		False -- otherwise
+		
+		Exceptions:
+		ValueError -- raised when verbose mode on and new exit cannot be set
+		"""
+		if not self.model.is_ent(ent):
+			if verbose:
+				raise ValueError('Not an entity of the model')
+			return False
+		if ent not in self.model.dependencies[ent]:
+			if verbose:
+				raise ValueError('Not an internally-dependent entity')
+			return False
+		if not (rlzd_exit >= 0.0 or rlzd_exit == -1):
+			if verbose:
+				raise ValueError('Exit must be either -1 or non-negative')
+			return False
+		self.realized_exits[ent] = rlzd_exit
+		return True
+		
+		
+	def set_realized_exits(self, rlzd_exits, verbose=False):
+		"""
+		Set new realized exits.
+		
+		Arguments:
+		rlzd_exits -- the new exits of the entities
+		
+		Keyword arguments:
+		verbose -- activate throwing errors with descriptive messages (default False)
+		
+		Return values:
+		True -- if the new exits are valid and have been copied in
+		False -- otherwise
+		"""
+		if self._valid_realized_exits(rlzd_exits, verbose):
+			self.realized_exits = copy.copy(rlzd_exits)
+			return True
+		return False
+		
+	def set_effort_by_resource(self, efforts, resource, verbose=False):
+		"""
+		Set new efforts corresponding to a resource for entities dependent on the resource.
+		
+		Arguments:
+		efforts -- the new efforts corresponding to resource
+		resource -- the shared resource dependency of the affected entities
+		
+		Keyword arguments:
+		verbose -- activate throwing errors with descriptive messages (default False)
+		
+		Return values:
+		True -- if the new efforts are valid (resource is a dependency of each entity in efforts,
+		        each new effort is non-negative, and none of the entities in efforts
+				are the same entity as resource) and have been copied in
+		False -- otherwise
+		
+		Exceptions:
+		ValueError -- raised when verbose mode on and new efforts cannot be set
+		"""
+		if not self.model.are_ents(efforts.keys()):
+			if verbose:
+				raise ValueError('Not all entities of the model')
+			return False
+		if not self.model.is_ent(resource):
+			if verbose:
+				raise ValueError('Resource not an entity of the model')
+			return False
+		if not self.model.ent_types[resource] == ENTTYPE.RESOURCE:
+			if verbose:
+				raise ValueError('Efforts for a non-resource entity')
+			return False
+		for ent in efforts.keys():
+			if not self.model.is_dep(ent, resource):
+				if verbose:
+					raise ValueError('Entity does not depend on resource')
+				return False
+			if efforts[ent] < 0.0:
+				if verbose:
+					raise ValueError('Negative effort invalid')
+				return False
+			if ent == resource:
+				if verbose:
+					raise ValueError('Entity in efforts and resource cannot be the same')
+				return False
+			self.efforts[ent][resource] = efforts[ent]
+		return True
+	
+	def set_deadlines(self, deadlines, verbose=False):
+		"""
+		Set new deadlines.
+		
+		Arguments:
+		deadlines -- the new deadlines
+		
+		Keyword arguments:
+		verbose -- activate throwing errors with descriptive messages (default False)
+		
+		Return values:
+		True -- if deadlines copied in
+		False -- if deadlines are empty, keys of deadlines are not entities,
+		         or values are not all non-negative
+		
+		Exceptions:
+		ValueError -- raised when verbose mode on and new deadlines are invalid
+		"""
+			
+		if self.valid_deadlines(deadlines, verbose):
+			self.deadlines = copy.copy(deadlines)
+			return True
+		return False
+		
+	def set_new_scen_model(self, model):
+		"""
+		Set new scenario model with a different GMORModel.
+		
+		Arguments:
+		model -- new GMORModel, possibly with some same entities and dependencies
+		
+		Return values:
+		True -- if model is ready for analysis
+		False -- otherwise
+		"""
+		if model.ready():
+			#current_internal_states
+			new_curr_int_states = {}
+			for ent in model.entities:
+				if ent in model.dependencies[ent]:
+					if ent in self.current_internal_states.keys():
+						new_curr_int_states[ent] = self.current_internal_states[ent]  # save internal state for ent
+					else:
+						new_curr_int_states[ent] = 1
+				
+			#realized_timelines
+			new_realized_timelines = {}
+			for ent in model.entities:
+				if ent in self.realized_timelines.keys():
+					new_realized_timelines[ent] = self.realized_timelines[ent]  # save time line for ent
+				else:
+					new_realized_timelines[ent] = 0.0
+			
+			#realized_exits
+			new_realized_exits = {}
+			for ent in model.entities:
+				if ent in model.dependencies[ent]:
+					if ent in self.realized_exits.keys():
+						new_realized_exits[ent] = self.realized_exits[ent]  # save exit for ent
+					else:
+						new_realized_exits[ent] = -1
+			
+			#efforts
+			new_efforts = {}
+			for ent in model.entities:
+				if model.ent_types[ent] != ENTTYPE.RESOURCE:
+					for dep in model.dependencies[ent]:
+						if model.ent_types[dep] == ENTTYPE.RESOURCE:
+							if new_efforts.has_key(ent) == False:
+								new_efforts[ent] = {}
+							if self.efforts.has_key(ent) and self.efforts[ent].has_key(dep):
+								new_efforts[ent][dep] = self.efforts[ent][dep]  # save effort for ent
+							else:
+								new_efforts[ent][dep] = 0
+								
+			new_deadlines = {}
+			for ent in model.entities:
+				if model.ent_types[ent] == ENTTYPE.FUNCTION:
+					if ent in self.deadlines.keys():
+						new_deadlines[ent] = self.deadlines[ent]  # save deadline for ent
+					else:
+						new_deadlines[ent] = 0.0
+			
+			self.model = model
+			self.set_current_internal_states(new_curr_int_states)
+			self.set_realized_exits(new_realized_exits)
+			self.set_realized_timelines(new_realized_timelines)
+			self.efforts = copy.copy(new_efforts)
+			self.set_deadlines(new_deadlines)
+			#self.reset(model)
+			
+			return True
+		return False
+
+
+class ProgressionResult(object):
+	"""
+	Outcome of progressing a system through a scenario, with the first check that failed.
+	
+	Public methods:
+	ok, as_tuple, raise_on_failure
+	
+	Instance variables:
+	status, p_a, change_ids, change_times, resource_use, failed_exit, failed_deadline,
+	failed_resource, entities, initial_state
+	"""
+	__slots__ = ('status', 'p_a', 'change_ids', 'change_times', 'resource_use', 
+	             'failed_exit', 'failed_deadline', 'failed_resource', 'entities', 'initial_state')
+	
+	def __init__(self, entities, p_a, change_ids, change_times, initial_state=None):
+		"""
+		Constructs a result that has passed all checks so far.
+		
+		Arguments:
+		entities -- entity names, in the order of the ids in change_ids
+		p_a -- performance a, the system level performance
+		change_ids -- ids of the entities that change state
+		change_times -- times when the changes occur
+		
+		Keyword arguments:
+		initial_state -- state of all entities before the changes (default None; not known)
+		"""
+		self.status = PROGSTATUS.OK
+		self.p_a = p_a
+		self.change_ids = np.array(change_ids, dtype=np.int32)
+		self.change_times = np.array(change_times, dtype=np.float64)
+		self.initial_state = None
+		if initial_state is not None:
+			self.initial_state = np.array(initial_state, dtype=np.uint8)
+		self.resource_use = {}
+		self.failed_exit = None
+		self.failed_deadline = None
+		self.failed_resource = None
+		self.entities = entities
+	
+	@property
+	def dep_changes(self):
+		"""
+		Entity state changes (list of entity names).
+		"""
+		return [self.entities[ent_id] for ent_id in self.change_ids]
+	
+	@property
+	def dep_timing(self):
+		"""
+		Times when changes occur (list).
+		"""
+		return self.change_times.tolist()
+	
+	def ok(self):
+		"""
+		Check if the progression passed all checks.
+		
+		Return values:
+		True -- if no dependency exited early and all deadlines and resource limits were met
+		False -- otherwise
+		"""
+		return self.status == PROGSTATUS.OK
+	
+	def as_tuple(self):
+		"""
+		Return values:
+		p_a -- performance a, the system level performance (float)
+		dep_changes -- entity state changes (list)
+		dep_timing -- times when changes occur (list)
+		tracked_resource_use -- amounts of resource usage by changed entities (dict)
+		"""
+		return self.p_a, self.dep_changes, self.dep_timing, self.resource_use
+	
+	def raise_on_failure(self):
+		"""
+		Exceptions:
+		ValueError -- raised when a dependency exits before recovery is complete, when there
+		              isn't enough time to meet a deadline, or when there aren't enough resources
+		"""
+		if self.status == PROGSTATUS.DEPENDENCY_EXIT:
+			exit_time, exit_ent = self.failed_exit
+			raise ValueError('Recovery incomplete due to dependency exit of ' + exit_ent + 
+			                 ' at ' + str(exit_time))
+		if self.status == PROGSTATUS.NOT_ENOUGH_TIME:
+			raise ValueError('Not enough time')
+		if self.status == PROGSTATUS.NOT_ENOUGH_RESOURCES:
+			raise ValueError('not enough resources of, ' + self.failed_resource)
+
+
+class ProgressionSnapshot(object):
+	"""
+	Where a progression is at a point in time, so it can be continued (or continued in many ways)
+	later.
+	
+	Public methods:
+	copy, to_json, set_from_json
+	
+	Instance variables:
+	model_key, initial_state, system_state, current_time, underway_ids, underway_times,
+	consumed_durations, ids_to_check, change_ids, change_times, drop_indices, broken_exit
+	"""
+	__slots__ = ('model_key', 'initial_state', 'system_state', 'current_time', 'underway_ids',
+	             'underway_times', 'consumed_durations', 'ids_to_check', 'change_ids',
+	             'change_times', 'drop_indices', 'broken_exit')
+	
+	def __init__(self):
+		"""
+		Constructs a snapshot of a progression that has yet to start from an empty state.
+		"""
+		self.model_key = ''
+		self.initial_state = []  # state of each entity at the start (p_a)
+		self.system_state = []  # state of each entity at current_time
+		self.current_time = 0.0
+		self.underway_ids = []  # ids of the entities changing state
+		self.underway_times = []  # times their changes complete
+		self.consumed_durations = {}  # durations of entities that have started changing, by id
+		self.ids_to_check = None  # entities whose eligibility may have changed (None for all)
+		self.change_ids = []
+		self.change_times = []
+		self.drop_indices = []  # positions of the changes that took entities down on an observation
+		self.broken_exit = None  # time and entity of the exit that halted the progression
+		
+	def copy(self):
+		"""
+		Return values:
+		a snapshot that can be continued without changing this one (ProgressionSnapshot)
+		"""
+		snapshot = ProgressionSnapshot()
+		for name in self.__slots__:
+			setattr(snapshot, name, copy.copy(getattr(self, name)))
+		return snapshot
+		
+	def to_json(self):
+		"""
+		Return values:
+		the snapshot as JSON text (str)
+		"""
+		obj = dict((name, getattr(self, name)) for name in self.__slots__)
+		obj['consumed_durations'] = sorted(self.consumed_durations.items())
+		return json.dumps(obj)
+		
+	def set_from_json(self, json_text):
+		"""
+		Set the snapshot with given values from JSON text.
+		
+		Arguments:
+		json_text -- the JSON text containing values for the snapshot variables, from to_json
 		
 		Exceptions:
-		ValueError -- raised when new_model is not ready
+		ValueError -- raised when JSON text is not in the proper form
 		"""
-		if not new_model.ready():
-			raise ValueError('Must pass in a model ready for analysis')
-		for ent in new_model.entities:
-			if self.is_ent(ent):
-				raise ValueError('Models cannot share any entities')
-			
-		#adjust performance levels of functions in this model	
-		for ent in self.op_performance_levels.keys():
-			self.op_performance_levels[ent] = self.op_performance_levels[ent]*weight
-		for ent in new_model.entities:
-			self.entities.append(ent)
-			self.ent_types[ent] = new_model.ent_types[ent]
-			self.parents[ent] = new_model.parents[ent]
-			self.dependencies[ent] = new_model.dependencies[ent]
-			self.resultant_states[ent] = new_model.resultant_states[ent]
-			if ent in new_model.resource_limits:
-				self.resource_limits[ent] = new_model.resource_limits[ent]
-			if ent in new_model.op_performance_levels:
-				self.op_performance_levels[ent] = new_model.op_performance_levels[ent]*(1.0-weight)
+		try:
+			obj = json.loads(json_text)
+			values = dict((name, obj[name]) for name in self.__slots__)
+			values['model_key'] = str(values['model_key'])
+			values['current_time'] = float(values['current_time'])
+			consumed_durations = values['consumed_durations']
+			values['consumed_durations'] = dict((int(ent_id), float(duration))
+			                                    for ent_id, duration in consumed_durations)
+			if values['broken_exit'] is not None:
+				exit_time, exit_ent = values['broken_exit']
+				values['broken_exit'] = (float(exit_time), str(exit_ent))
+		except (ValueError, KeyError, TypeError):
+			raise ValueError('json text must be of form ' + 
+			                 ', '.join('"' + name + '": ...' for name in self.__slots__))
+		for name in self.__slots__:
+			setattr(self, name, values[name])
+
+
+class StateTrajectory(object):
+	"""
+	States of all entities over the course of a progression, stored as the initial states and the
+	changes, with the states after every checkpoint_interval changes packed as checkpoints.
 	
+	Public methods:
+	state_at, functions_up_at, to_bytes, set_from_bytes
 	
-	#SETTINGS
-	def _set_default_res_sts(self, ent):
+	Instance variables:
+	entities, function_ids, initial_bits, change_ids, change_times, checkpoint_interval,
+	checkpoints
+	"""
+	__slots__ = ('entities', 'function_ids', 'initial_bits', 'change_ids', 'change_times', 
+	             'checkpoint_interval', 'checkpoints')
+	
+	MAGIC = 'GMTR'
+	
+	def __init__(self, entities, function_ids=(), initial_state=(), change_ids=(), change_times=(),
+	             checkpoint_interval=64):
 		"""
-		Set default resultant states for an entity (states will all be zero).
+		Constructs a trajectory from the changes of a progression.
 		
 		Arguments:
-		ent -- the entity
+		entities -- entity names, in the order of the ids in change_ids
+		
+		Keyword arguments:
+		function_ids -- ids of the entities functions_up_at reports on (default ())
+		initial_state -- state of all entities before the changes (default (); all 0)
+		change_ids -- ids of the entities that change state, each change toggling the state
+		              (default ())
+		change_times -- times when the changes occur, in order (default ())
+		checkpoint_interval -- number of changes between checkpoints (default 64)
 		
 		Exceptions:
-		ValueError -- raised if ent is not in model
+		ValueError -- raised when the changes are not in time order, or there is not one time
+		              per change
 		"""
-		if self.is_ent(ent):
-			self.resultant_states[ent] = np.zeros(self.num_res_sts(ent), dtype=int)
-		else:
-			raise ValueError('resultant states default cannot be set for invalid ent')
+		n_ent = len(entities)
+		initial_state = np.array(initial_state, dtype=np.uint8)
+		if len(initial_state) == 0:
+			initial_state = np.zeros(n_ent, dtype=np.uint8)
+		self.entities = entities
+		self.function_ids = np.array(function_ids, dtype=np.int32)
+		self.initial_bits = np.packbits(initial_state)
+		self.change_ids = np.array(change_ids, dtype=np.int32)
+		self.change_times = np.array(change_times, dtype=np.float64)
+		self.checkpoint_interval = int(checkpoint_interval)
+		if len(self.change_ids) != len(self.change_times):
+			raise ValueError('need one time per change')
+		if np.any(np.diff(self.change_times) < 0):
+			raise ValueError('changes must be in time order')
+		self._build_checkpoints()
+		
+	def _build_checkpoints(self):
+		"""
+		Pack the states after every checkpoint_interval changes, starting with the initial states.
+		"""
+		n_ent = len(self.entities)
+		interval = self.checkpoint_interval
+		n_checkpoints = len(self.change_ids)//interval + 1
+		self.checkpoints = np.zeros((n_checkpoints, len(self.initial_bits)), dtype=np.uint8)
+		self.checkpoints[0] = self.initial_bits
+		state = np.unpackbits(self.initial_bits)[:n_ent]
+		for c in range(1, n_checkpoints):
+			np.bitwise_xor.at(state, self.change_ids[(c-1)*interval:c*interval], 1)
+			self.checkpoints[c] = np.packbits(state)
+		
+	def state_at(self, time):
+		"""
+		Get the states of all entities at a time, after the changes that occur by then.
+		
+		Arguments:
+		time -- time to get the states at
+		
+		Return values:
+		system_state -- state of all entities (uint8 numpy array)
+		"""
+		n_changes = np.searchsorted(self.change_times, time, 'right')
+		c = n_changes//self.checkpoint_interval
+		system_state = np.unpackbits(self.checkpoints[c])[:len(self.entities)]
+		np.bitwise_xor.at(system_state, self.change_ids[c*self.checkpoint_interval:n_changes], 1)
+		return system_state
+		
+	def functions_up_at(self, time):
+		"""
+		Get the functions that are up at a time.
+		
+		Arguments:
+		time -- time to get the functions at
+		
+		Return values:
+		functions up at the time, in the order of function_ids (list)
+		"""
+		system_state = self.state_at(time)
+		return [self.entities[ent_id] for ent_id in self.function_ids.tolist()
+		        if system_state[ent_id] == 1]
+		
+	def to_bytes(self):
+		"""
+		Return values:
+		the trajectory, without entity names or checkpoints, as bytes (str)
+		"""
+		header = np.array([len(self.entities), len(self.function_ids), len(self.change_ids), 
+		                   self.checkpoint_interval], dtype='<i8')
+		return ''.join([self.MAGIC, header.tostring(), self.function_ids.astype('<i4').tostring(), 
+		                self.initial_bits.tostring(), self.change_ids.astype('<i4').tostring(), 
+		                self.change_times.astype('<f8').tostring()])
+		
+	def set_from_bytes(self, data):
+		"""
+		Set the trajectory from bytes, for the entities it was constructed with.
+		
+		Arguments:
+		data -- the bytes, from to_bytes
+		
+		Exceptions:
+		ValueError -- raised when the bytes are not in the proper form or are for a different
+		              number of entities
+		"""
+		header_end = len(self.MAGIC) + 4*8
+		if data[:len(self.MAGIC)] != self.MAGIC or len(data) < header_end:
+			raise ValueError('data must be from StateTrajectory.to_bytes')
+		n_ent, n_funcs, n_changes, interval = np.frombuffer(data[len(self.MAGIC):header_end], 
+		                                                    dtype='<i8').tolist()
+		n_bits = -(-n_ent//8)
+		sizes = [4*n_funcs, n_bits, 4*n_changes, 8*n_changes]
+		if n_ent != len(self.entities) or len(data) != header_end + sum(sizes) or interval <= 0:
+			raise ValueError('data must be from StateTrajectory.to_bytes for the same entities')
+		starts = np.cumsum([header_end] + sizes).tolist()
+		self.function_ids = np.frombuffer(data[starts[0]:starts[1]], dtype='<i4').astype(np.int32)
+		self.initial_bits = np.frombuffer(data[starts[1]:starts[2]], dtype=np.uint8).copy()
+		self.change_ids = np.frombuffer(data[starts[2]:starts[3]], dtype='<i4').astype(np.int32)
+		self.change_times = np.frombuffer(data[starts[3]:starts[4]], dtype='<f8').astype(np.float64)
+		self.checkpoint_interval = interval
+		self._build_checkpoints()
+
+
+class _IncrementalProgression(object):
+	"""
+	State kept between the runs of an incremental session of a GMORRunner.
+	
+	Instance variables:
+	current_internal_states, realized_timelines, realized_exits, efforts, deadlines, internal,
+	zero_duration, system_state, analytic, keys, trigger_keys, key_times, key_rounds,
+	kernel_lists, component_index, perf_ids, result
+	"""
+	__slots__ = ('current_internal_states', 'realized_timelines', 'realized_exits', 'efforts', 
+	             'deadlines', 'internal', 'zero_duration', 'system_state', 'analytic', 
+	             'keys', 'trigger_keys', 'key_times', 'key_rounds', 'kernel_lists', 
+	             'component_index', 'perf_ids', 'result')
+
+
+class GMORRunner(object):#(GMORModel):
+	"""
+	Calculate and demonstrate implications of initial conditions set by scenario model.
+	
+	Public methods:
+	compile, sweep_pessimistic_states, get_latest_times, get_completion_bounds, screen_scenario,
+	run_progression, sweep_deadlines, get_peak_resource_demand, sweep_resource_limits,
+	do_progression, snapshot_progression, resume_progression, start_incremental,
+	flip_internal_state, update_realized_timeline, get_state_trajectory, plot_performance_curve,
+	get_performance_curve, check_changes_timing, deterministic_progression, next_deadline,
+	get_deps_to_do, max_timing_progression
+	
+	Instance variables:
+	entities, ent_types, dependencies, resultant_states, resource_limits, op_performance_levels,
+	entity_lookup, dependencies_lookup, dependents_ptr, dependents_ids, internal_dep, dep_ptr,
+	dep_ids, dep_weights, self_weights, res_sts_ptr, res_sts_flat, gates, gate_trees, gate_ptr,
+	gate_refs, gate_weights, gate_self, gate_thresholds, gate_levels, gate_ent_ids, gate_root_ids,
+	bdd_vars, bdd_lows, bdd_highs, bdd_roots, bdd_ent_ids, mux_nodes, mux_roots, monotone,
+	dependency_components, compiled_resul_sts, compiled_eligible
+	"""
+	def __init__(self, model):
+		"""
+		Constructs a runner for a given GMORModel.
+		
+		Arguments:
+		model -- the GMORModel the runner is based on
+		
+		Exceptions:
+		ValueError -- raised when model is not ready for analysis
+		"""
+		if model.ready() is False:
+			raise ValueError('must send in a ready model')
+
+		self.entities = model.entities
+		self.ent_types = model.ent_types
+		self.dependencies = model.dependencies
+		self.resultant_states = model.resultant_states
+		self.resource_limits = model.resource_limits
+		self.op_performance_levels = model.op_performance_levels
+		self.gates = model.gates
+
+		self.entity_lookup = {}
+		self.dependencies_lookup = {}
+		self.compiled_resul_sts = None
+		self.compiled_eligible = None
+		self._model_key = None
+		self._incremental = None
+
+		def _build_entity_lookup():
+			"""
+			Creates a dictionary with entity names as keys and entity indices from self.entities as values.
+			"""
+			self.entity_lookup = {}
+			i = 0
+			for ent in self.entities:
+				self.entity_lookup[ent] = i
+				i += 1
+
+
+		def _build_entity_dep_lookup():
+			"""
+			Creates a dictionary with entity names as keys and lists of dependency indices as values.
+			"""
+			self.dependencies_lookup = {}
+			for ent in self.entities:
+				self.dependencies_lookup[ent] = []
+				for dep in self.dependencies[ent]:
+					self.dependencies_lookup[ent].append(self.entity_lookup[dep])
+
+		def _build_entity_dependents_index():
+			"""
+			Creates a CSR-style index of the entities that depend on each entity. The ids of the
+			dependents of the entity with id i are
+			dependents_ids[dependents_ptr[i]:dependents_ptr[i+1]], in the order of self.entities.
+			"""
+			n_ent = len(self.entities)
+			counts = [0 for i in range(n_ent+1)] # pylint: disable=unused-variable
+			for ent in self.entities:
+				for dep_id in self.dependencies_lookup[ent]:
+					counts[dep_id+1] += 1
+			self.dependents_ptr = np.cumsum(counts, dtype=np.int64)
+			self.dependents_ids = np.zeros(self.dependents_ptr[-1], dtype=np.int64)
+			fill = self.dependents_ptr[:-1].tolist()
+			for ent in self.entities:
+				ent_id = self.entity_lookup[ent]
+				for dep_id in self.dependencies_lookup[ent]:
+					self.dependents_ids[fill[dep_id]] = ent_id
+					fill[dep_id] += 1
+			self.internal_dep = np.array([ent_id in self.dependencies_lookup[ent] 
+			                              for ent_id, ent in enumerate(self.entities)], dtype=bool)
+
+		def _build_resultant_state_kernel():
+			"""
+			Creates the flat arrays used to evaluate resultant states without Python-level loops.
+			The dependency ids of the entity with id i are dep_ids[dep_ptr[i]:dep_ptr[i+1]], each
+			with the weight of its bit in the resultant state id (first dependency is the most
+			significant bit). The resultant states of all entities are concatenated in res_sts_flat,
+			starting at res_sts_ptr[i]. self_weights holds the weight of each entity's own bit (0 if
+			none). An entity with a gate or a BDDTruthTable has a single resultant state of 0 and
+			weights of 0, as its resultant state is given by its gate (see _build_gate_circuits) or
+			its BDD (see _build_bdd_circuits).
+			"""
+			dep_ids = []
+			dep_weights = []
+			dep_ptr = [0]
+			res_sts_ptr = [0]
+			self.self_weights = np.zeros(len(self.entities), dtype=np.int64)
+			no_table = [ent in self.gates or isinstance(self.resultant_states[ent], BDDTruthTable) 
+			            for ent in self.entities]
+			for ent_id, ent in enumerate(self.entities):
+				n_dep = len(self.dependencies_lookup[ent])
+				for k, dep_id in enumerate(self.dependencies_lookup[ent]):
+					weight = 0 if no_table[ent_id] else 2**(n_dep-1-k)
+					dep_ids.append(dep_id)
+					dep_weights.append(weight)
+					if dep_id == ent_id:
+						self.self_weights[ent_id] = weight
+				dep_ptr.append(len(dep_ids))
+				if no_table[ent_id]:
+					res_sts_ptr.append(res_sts_ptr[-1] + 1)
+				else:
+					res_sts_ptr.append(res_sts_ptr[-1] + len(self.resultant_states[ent]))
+			self.dep_ids = np.array(dep_ids, dtype=np.int64)
+			self.dep_weights = np.array(dep_weights, dtype=np.int64)
+			self.dep_ptr = np.array(dep_ptr, dtype=np.int64)
+			self.res_sts_ptr = np.array(res_sts_ptr, dtype=np.int64)
+			self.res_sts_flat = np.zeros(res_sts_ptr[-1], dtype=np.uint8)
+			for ent_id, ent in enumerate(self.entities):
+				if not no_table[ent_id]:
+					start, end = res_sts_ptr[ent_id], res_sts_ptr[ent_id+1]
+					self.res_sts_flat[start:end] = self.resultant_states[ent]
+
+		def _build_gate_circuits():
+			"""
+			Converts the gate of each entity with one into a tree of threshold nodes, gate_trees[i]
+			for the entity with id i (None if it has no gate). A node is a (threshold, inputs) tuple
+			with (weight, entity id or node) inputs, and it is 1 when the weighted sum of its inputs
+			reaches the threshold. The nodes of all trees are also flattened, in levels that only
+			take inputs from earlier levels, to evaluate all gates at once: node j has the inputs
+			gate_refs[gate_ptr[j]:gate_ptr[j+1]] (entity ids, or n_ent plus the ids of nodes) with
+			weights gate_weights and threshold gate_thresholds[j], and gate_self flags the inputs
+			that are the entity the node belongs to. gate_levels holds the (start, end) node ids of
+			each level, and the resultant state of entity gate_ent_ids[k] is node gate_root_ids[k].
+			"""
+			def _get_tree(gate):
+				"""
+				Convert a gate into a tree of threshold nodes.
+				"""
+				weights, threshold = _get_gate_weights(gate)
+				inputs = [(weight, _get_tree(gate_input) if isinstance(gate_input, dict)
+				           else self.entity_lookup[gate_input])
+				          for weight, gate_input in zip(weights, gate['inputs'])]
+				return (threshold, tuple(inputs))
 			
-	def set_res_sts(self, ent, states, verbose=False):
+			nodes = []  # (level, entity id, threshold, inputs), with nodes as inputs by -1-index
+			def _add_nodes(tree, ent_id):
+				"""
+				Add the nodes of a tree, inputs first, and return the index of its root.
+				"""
+				threshold, inputs = tree
+				node_inputs = []
+				level = 0
+				for weight, ref in inputs:
+					if isinstance(ref, tuple):
+						node = _add_nodes(ref, ent_id)
+						level = max(level, nodes[node][0]+1)
+						ref = -1-node
+					node_inputs.append((weight, ref))
+				nodes.append((level, ent_id, threshold, node_inputs))
+				return len(nodes)-1
+			
+			n_ent = len(self.entities)
+			self.gate_trees = [None for ent in self.entities]
+			roots = []
+			for ent_id, ent in enumerate(self.entities):
+				if ent in self.gates:
+					self.gate_trees[ent_id] = _get_tree(self.gates[ent])
+					roots.append(_add_nodes(self.gate_trees[ent_id], ent_id))
+			order = sorted(range(len(nodes)), key=lambda node: (nodes[node][0], node))
+			node_ids = dict((node, node_id) for node_id, node in enumerate(order))
+			gate_ptr = [0]
+			gate_refs = []
+			gate_weights = []
+			gate_self = []
+			self.gate_levels = []
+			for node_id, node in enumerate(order):
+				level, ent_id, threshold, node_inputs = nodes[node]
+				for weight, ref in node_inputs:
+					gate_refs.append(ref if ref >= 0 else n_ent + node_ids[-1-ref])
+					gate_weights.append(weight)
+					gate_self.append(ref == ent_id)
+				gate_ptr.append(len(gate_refs))
+				if node_id == 0 or level != nodes[order[node_id-1]][0]:
+					self.gate_levels.append([node_id, node_id+1])
+				else:
+					self.gate_levels[-1][1] = node_id+1
+			self.gate_ptr = np.array(gate_ptr, dtype=np.int64)
+			self.gate_refs = np.array(gate_refs, dtype=np.int64)
+			self.gate_weights = np.array(gate_weights, dtype=np.float64)
+			self.gate_self = np.array(gate_self, dtype=bool)
+			self.gate_thresholds = np.array([nodes[node][2] for node in order], dtype=np.float64)
+			self.gate_ent_ids = np.array([nodes[root][1] for root in roots], dtype=np.int64)
+			self.gate_root_ids = np.array([node_ids[root] for root in roots], dtype=np.int64)
+
+		def _build_bdd_circuits():
+			"""
+			Copies the nodes of the BDDTruthTables of the entities without gates, testing entity
+			ids. Nodes 0 and 1 are the constants 0 and 1 (going to themselves), and node j tests the
+			entity bdd_vars[j], going to node bdd_lows[j] when it is 0 and bdd_highs[j] when it is
+			1. The resultant state of the entity with id i is node bdd_roots[i] (-1 if it has no
+			BDDTruthTable), and bdd_ent_ids holds the ids of the entities with one. Entities whose
+			BDDs test their dependencies by name share nodes.
+			"""
+			bdd_vars = [0, 0]
+			bdd_lows = [0, 1]
+			bdd_highs = [0, 1]
+			node_ids = {}
+			self.bdd_roots = np.full(len(self.entities), -1, dtype=np.int64)
+			for ent_id, ent in enumerate(self.entities):
+				if ent in self.gates or not isinstance(self.resultant_states[ent], BDDTruthTable):
+					continue
+				table = self.resultant_states[ent]
+				manager = table.manager
+				var_ids = dict(zip(table.variables, self.dependencies_lookup[ent]))
+				if table.variables == list(self.dependencies[ent]):
+					owner = id(manager)
+				else:
+					owner = (id(manager), ent_id)  # variables stand for other entities here
+				for node in manager._get_reachable(table.root):
+					if (owner, node) not in node_ids:
+						node_ids[(owner, node)] = len(bdd_vars)
+						bdd_vars.append(var_ids[manager.order[manager.levels[node]]])
+						low, high = manager.lows[node], manager.highs[node]
+						bdd_lows.append(node_ids.get((owner, low), low))
+						bdd_highs.append(node_ids.get((owner, high), high))
+				self.bdd_roots[ent_id] = node_ids.get((owner, table.root), table.root)
+			self.bdd_vars = np.array(bdd_vars, dtype=np.int64)
+			self.bdd_lows = np.array(bdd_lows, dtype=np.int64)
+			self.bdd_highs = np.array(bdd_highs, dtype=np.int64)
+			self.bdd_ent_ids = np.flatnonzero(self.bdd_roots >= 0)
+
+		def _build_mux_tables():
+			"""
+			Converts the resultant states of each entity into a reduced tree of multiplexers on its
+			dependencies, so that they can be evaluated with bitwise logic on bit-sliced states.
+			Node ids 0 and 1 are the constants 0 and 1, and node id j > 1 of the entity with id i is
+			mux_nodes[i][j-2], a (dependency id, node id if dependency is 1, node id if dependency
+			is 0) tuple listed after the nodes it refers to. Its resultant state is node
+			mux_roots[i]. The nodes of an entity with a BDDTruthTable are those of its BDD.
+			"""
+			self.mux_nodes = []
+			self.mux_roots = np.zeros(len(self.entities), dtype=np.int64)
+			for ent_id, ent in enumerate(self.entities):
+				if self.gate_trees[ent_id] is not None:
+					self.mux_nodes.append([])  # evaluated from its gate instead
+					continue
+				if self.bdd_roots[ent_id] >= 0:
+					node_ids = {0: 0, 1: 1}
+					nodes = []
+					stack = [self.bdd_roots[ent_id]]
+					while len(stack) > 0:
+						node = stack[-1]
+						if node in node_ids:
+							stack.pop()
+							continue
+						lo, hi = self.bdd_lows[node], self.bdd_highs[node]
+						if lo in node_ids and hi in node_ids:
+							stack.pop()
+							node_ids[node] = len(nodes) + 2
+							nodes.append((int(self.bdd_vars[node]), node_ids[hi], node_ids[lo]))
+						else:
+							stack.extend([lo, hi])
+					self.mux_nodes.append(nodes)
+					self.mux_roots[ent_id] = node_ids[self.bdd_roots[ent_id]]
+					continue
+				deps = self.dependencies_lookup[ent]
+				res_sts = self.res_sts_flat[self.res_sts_ptr[ent_id]:self.res_sts_ptr[ent_id+1]]
+				nodes = [None, None]
+				unique = {}
+				level = [int(val) for val in res_sts]
+				for k in range(len(deps)-1, -1, -1):
+					# merge on the least significant remaining dependency
+					merged = []
+					for j in range(0, len(level), 2):
+						lo, hi = level[j], level[j+1]
+						if lo == hi:
+							merged.append(lo)
+							continue
+						key = (deps[k], hi, lo)
+						if key not in unique:
+							unique[key] = len(nodes)
+							nodes.append(key)
+						merged.append(unique[key])
+					level = merged
+				self.mux_nodes.append(nodes[2:])
+				self.mux_roots[ent_id] = level[0]
+
+		def _build_monotone_flags():
+			"""
+			Flags the entities whose resultant states never go from 1 to 0 when a dependency comes
+			up, which all gates do as their weights are not negative.
+			"""
+			self.monotone = np.ones(len(self.entities), dtype=bool)
+			for ent_id, ent in enumerate(self.entities):
+				if self.gate_trees[ent_id] is not None:
+					continue
+				if self.bdd_roots[ent_id] >= 0:
+					table = self.resultant_states[ent]
+					self.monotone[ent_id] = table.manager.is_monotone(table.root)
+					continue
+				res_sts = self.res_sts_flat[self.res_sts_ptr[ent_id]:self.res_sts_ptr[ent_id+1]]
+				state_ids = np.arange(len(res_sts))
+				for k in range(len(self.dependencies_lookup[ent])):
+					lower = state_ids[(state_ids & 2**k) == 0]
+					if (res_sts[lower] > res_sts[lower + 2**k]).any():
+						self.monotone[ent_id] = False
+						break
+
+		def _build_dependency_components():
+			"""
+			Creates the list of strongly connected components of the dependency graph, each a list
+			of entity ids, with the components an entity depends on listed before its own.
+			"""
+			self.dependency_components = []
+			n_ent = len(self.entities)
+			index = [-1 for i in range(n_ent)] # pylint: disable=unused-variable
+			low_link = [0 for i in range(n_ent)] # pylint: disable=unused-variable
+			on_stack = [False for i in range(n_ent)] # pylint: disable=unused-variable
+			stack = []
+			count = 0
+			for root_id in range(n_ent):
+				if index[root_id] >= 0:
+					continue
+				work = [(root_id, 0)]
+				while len(work) > 0:
+					ent_id, k = work.pop()
+					deps = self.dependencies_lookup[self.entities[ent_id]]
+					if k == 0:
+						index[ent_id] = low_link[ent_id] = count
+						count += 1
+						stack.append(ent_id)
+						on_stack[ent_id] = True
+					else:
+						low_link[ent_id] = min(low_link[ent_id], low_link[deps[k-1]])
+					while k < len(deps) and index[deps[k]] >= 0:
+						if on_stack[deps[k]]:
+							low_link[ent_id] = min(low_link[ent_id], index[deps[k]])
+						k += 1
+					if k < len(deps):
+						work.append((ent_id, k+1))
+						work.append((deps[k], 0))
+					elif low_link[ent_id] == index[ent_id]:
+						component = []
+						while True:
+							comp_id = stack.pop()
+							on_stack[comp_id] = False
+							component.append(comp_id)
+							if comp_id == ent_id:
+								break
+						self.dependency_components.append(sorted(component))
+
+		_build_entity_lookup()
+		_build_entity_dep_lookup()
+		_build_entity_dependents_index()
+		_build_resultant_state_kernel()
+		_build_gate_circuits()
+		_build_bdd_circuits()
+		_build_mux_tables()
+		_build_monotone_flags()
+		_build_dependency_components()
+		#self._buildSystemResultantStates()
+		
+	def _get_model_key(self):
+		"""
+		Hash the dependencies and resultant states of the model along with the Python version,
+		to identify compiled code that can be reused.
+		
+		Return values:
+		the hex digest of the hash (str)
+		"""
+		if self._model_key is None:
+			model_hash = hashlib.sha1(imp.get_magic())
+			for ent_id, ent in enumerate(self.entities):
+				if self.gate_trees[ent_id] is not None:
+					res_sts = self.gate_trees[ent_id]
+				elif self.bdd_roots[ent_id] >= 0:
+					res_sts = (self.mux_nodes[ent_id], int(self.mux_roots[ent_id]))
+				else:
+					start, end = self.res_sts_ptr[ent_id], self.res_sts_ptr[ent_id+1]
+					res_sts = self.res_sts_flat[start:end].tolist()
+				model_hash.update(repr((ent_id, self.dependencies_lookup[ent], 
+				                        bool(self.internal_dep[ent_id]), res_sts)))
+			self._model_key = model_hash.hexdigest()
+		return self._model_key
+		
+	def _get_compiled_source(self):
+		"""
+		Generate Python source with a resultant state function and an eligibility function for
+		each entity, with its dependency positions and resultant states inlined.
+		
+		Return values:
+		the source, defining tuples RESUL_STS and ELIGIBLE of functions in entity order (str)
+		"""
+		lines = []
+		if len(self.bdd_ent_ids) > 0:
+			lines.append('BDD_VARS = %r' % (tuple(self.bdd_vars.tolist()),))
+			lines.append('BDD_LOWS = %r' % (tuple(self.bdd_lows.tolist()),))
+			lines.append('BDD_HIGHS = %r' % (tuple(self.bdd_highs.tolist()),))
+			lines.append('def bdd_st(node, s, toggle_id=-1):')
+			lines.append('\twhile node > 1:')
+			lines.append('\t\tdep_id = BDD_VARS[node]')
+			lines.append('\t\tnode = BDD_HIGHS[node] if s[dep_id] != (dep_id == toggle_id) '
+			             'else BDD_LOWS[node]')
+			lines.append('\treturn node')
+		for ent_id, ent in enumerate(self.entities):
+			if self.bdd_roots[ent_id] >= 0:
+				root = self.bdd_roots[ent_id]
+				lines.append('def resul_st_%d(s):' % ent_id)
+				lines.append('\treturn bdd_st(%d, s)' % root)
+				lines.append('def eligible_%d(s):' % ent_id)
+				lines.append('\tif bdd_st(%d, s) == 1:' % root)
+				lines.append('\t\treturn s[%d] == 0' % ent_id)
+				if self.internal_dep[ent_id]:
+					lines.append('\treturn bdd_st(%d, s, %d) == 1' % (root, ent_id))
+				else:
+					lines.append('\treturn False')
+				continue
+			if self.gate_trees[ent_id] is not None:
+				resul_st = self._get_gate_source(self.gate_trees[ent_id])
+				lines.append('def resul_st_%d(s):' % ent_id)
+				lines.append('\treturn int(%s)' % resul_st)
+				lines.append('def eligible_%d(s):' % ent_id)
+				lines.append('\tif %s:' % resul_st)
+				lines.append('\t\treturn s[%d] == 0' % ent_id)
+				if self.internal_dep[ent_id]:
+					gate_source = self._get_gate_source(self.gate_trees[ent_id], ent_id)
+					lines.append('\treturn %s' % gate_source)
+				else:
+					lines.append('\treturn False')
+				continue
+			deps = self.dependencies_lookup[ent]
+			n_dep = len(deps)
+			state_id = ' + '.join('s[%d]*%d' % (dep_id, 2**(n_dep-1-k))
+			                      for k, dep_id in enumerate(deps))
+			start, end = self.res_sts_ptr[ent_id], self.res_sts_ptr[ent_id+1]
+			res_sts = repr(tuple(self.res_sts_flat[start:end].tolist()))
+			lines.append('def resul_st_%d(s):' % ent_id)
+			lines.append('\treturn %s[%s]' % (res_sts, state_id))
+			lines.append('def eligible_%d(s):' % ent_id)
+			lines.append('\tstate_id = %s' % state_id)
+			lines.append('\tif %s[state_id] == 1:' % res_sts)
+			lines.append('\t\treturn s[%d] == 0' % ent_id)
+			if self.internal_dep[ent_id]:
+				lines.append('\treturn %s[state_id ^ %d] == 1'
+				             % (res_sts, self.self_weights[ent_id]))
+			else:
+				lines.append('\treturn False')
+		n_ent = len(self.entities)
+		lines.append('RESUL_STS = (%s,)' % ', '.join('resul_st_%d' % i for i in range(n_ent)))
+		lines.append('ELIGIBLE = (%s,)' % ', '.join('eligible_%d' % i for i in range(n_ent)))
+		return '\n'.join(lines) + '\n'
+		
+	def _get_gate_source(self, tree, toggle_id=-1):
+		"""
+		Generate a Python expression for a gate tree (see _build_gate_circuits), on states s.
+		
+		Arguments:
+		tree -- the gate tree
+		
+		Keyword arguments:
+		toggle_id -- id of an entity whose state is taken as toggled (default -1; none)
+		
+		Return values:
+		the expression, True when the gate is 1 (str)
+		"""
+		threshold, inputs = tree
+		terms = []
+		for weight, ref in inputs:
+			if isinstance(ref, tuple):
+				term = self._get_gate_source(ref, toggle_id)
+			elif ref == toggle_id:
+				term = '(1-s[%d])' % ref
+			else:
+				term = 's[%d]' % ref
+			terms.append('%r*%s' % (weight, term))
+		return '(%s >= %r)' % (' + '.join(terms), threshold - GATE_TOLERANCE)
+		
+	def compile(self, cache_dir=''):
+		"""
+		Compile Python code specialised to the model to evaluate the resultant state and the
+		eligibility of each entity, and use it in place of the generic lookups. The compiled code
+		can be cached on disk, keyed by a hash of the model.
+		
+		Keyword arguments:
+		cache_dir -- absolute path to directory where compiled code is cached (default '';
+		             no caching)
+		"""
+		model_key = self._get_model_key()
+		file_name = os.path.join(cache_dir, 'gmor-' + model_key + '.code')
+		code = None
+		if cache_dir != '' and os.path.isfile(file_name):
+			try:
+				with open(file_name, 'rb') as code_file:
+					code = marshal.load(code_file)
+			except (EOFError, ValueError, TypeError):
+				code = None  # unreadable, so compile again
+		if code is None:
+			code = compile(self._get_compiled_source(), '<gmor-' + model_key + '>', 'exec')
+			if cache_dir != '':
+				# write to a temporary file first so that a partial file is never read
+				temp_file_name = file_name + '.' + str(os.getpid())
+				with open(temp_file_name, 'wb') as code_file:
+					marshal.dump(code, code_file)
+				os.rename(temp_file_name, file_name)
+		
+		namespace = {}
+		exec code in namespace
+		self.compiled_resul_sts = namespace['RESUL_STS']
+		self.compiled_eligible = namespace['ELIGIBLE']
+		
+	##
+	## LOGIC
+	##
+	def _get_dependent_ids(self, ent_id):
+		"""
+		Look up the entities that depend on an entity.
+		
+		Arguments:
+		ent_id -- index of the entity in self.entities
+		
+		Return values:
+		ids of the entities depending on the entity (list)
+		"""
+		start, end = self.dependents_ptr[ent_id], self.dependents_ptr[ent_id+1]
+		return self.dependents_ids[start:end].tolist()
+		
+	def _get_sys_resul_st_ids(self, system_state):
+		"""
+		Evaluate the resultant state ids of all entities in one pass.
+		
+		Arguments:
+		system_state -- states of all entities (uint8 numpy array)
+		
+		Exceptions:
+		ValueError -- raised when system_state is wrong size
+		
+		Return values:
+		position of each entity's dependency states within its resultant states (numpy array)
+		"""
+		if len(system_state) != len(self.entities):
+			raise ValueError('system_state incorrect size')
+		return np.add.reduceat(system_state[self.dep_ids]*self.dep_weights, self.dep_ptr[:-1])
+		
+	def _get_sys_resul_sts(self, system_state):
+		"""
+		Evaluate the resultant states of all entities in one gather, weighted sum and lookup.
+		
+		Arguments:
+		system_state -- states of all entities (uint8 numpy array)
+		
+		Return values:
+		resultant state of each entity, in the order of self.entities (uint8 numpy array)
+		"""
+		res_st_ids = self.res_sts_ptr[:-1] + self._get_sys_resul_st_ids(system_state)
+		resul_sts = self.res_sts_flat[res_st_ids]
+		if len(self.gate_ent_ids) > 0:
+			resul_sts[self.gate_ent_ids] = self._get_gate_resul_sts(system_state)
+		if len(self.bdd_ent_ids) > 0:
+			resul_sts[self.bdd_ent_ids] = self._get_bdd_resul_sts(system_state)
+		return resul_sts
+		
+	def _get_bdd_resul_sts(self, states, toggle_self=False):
+		"""
+		Evaluate the BDDs of all entities with one at once, stepping down all of them together.
+		
+		Arguments:
+		states -- states of all entities, for a single scenario or one row per scenario (uint8 numpy
+		          array)
+		
+		Keyword arguments:
+		toggle_self -- evaluate each BDD with the state of its own entity toggled (default False)
+		
+		Return values:
+		resultant states of the entities in self.bdd_ent_ids, for each scenario (uint8 numpy array)
+		"""
+		rows_states = states.reshape(-1, len(self.entities))
+		rows = np.arange(len(rows_states))[:, np.newaxis]
+		nodes = np.tile(self.bdd_roots[self.bdd_ent_ids], (len(rows_states), 1))
+		while (nodes > 1).any():
+			dep_ids = self.bdd_vars[nodes]
+			dep_sts = rows_states[rows, dep_ids] != 0
+			if toggle_self:
+				dep_sts ^= dep_ids == self.bdd_ent_ids
+			nodes = np.where(dep_sts, self.bdd_highs[nodes], self.bdd_lows[nodes])
+		return nodes.reshape(states.shape[:-1] + (len(self.bdd_ent_ids),)).astype(np.uint8)
+		
+	def _get_bdd_resul_st(self, node, system_state, toggle_id=-1):
 		"""
-		Set new resultant states for an entity.
+		Evaluate a BDD (see _build_bdd_circuits).
 		
 		Arguments:
-		ent -- the entity
-		states -- the new resultant states for ent
+		node -- the node of the BDD
+		system_state -- states of all entities
 		
 		Keyword arguments:
-		verbose -- activate throwing errors with descriptive messages (default False)
+		toggle_id -- id of an entity whose state is taken as toggled (default -1; none)
 		
 		Return values:
-		True -- if states copied in
-		False -- if ent does not exist, states length is not 2**len(dep of ent)
-			     or values of states are not all 0 or 1
+		the state of the node (either 0 or 1)
 		"""
-		if self.valid_res_sts(ent, states, verbose):
-			self.resultant_states[ent] = copy.copy(states)
-			return True
-		return False
+		while node > 1:
+			dep_id = self.bdd_vars[node]
+			if bool(system_state[dep_id]) != (dep_id == toggle_id):
+				node = self.bdd_highs[node]
+			else:
+				node = self.bdd_lows[node]
+		return int(node)
 		
-	def set_op_perf_levs(self, op_perf_levs, verbose=False):
+	def _get_gate_resul_sts(self, states, toggle_self=False):
 		"""
-		Set new performance levels.
+		Evaluate the gates of all entities with one at once, level by level.
 		
 		Arguments:
-		op_perf_levs -- the new levels
+		states -- states of all entities, for a single scenario or one row per scenario (uint8 numpy
+		          array)
 		
 		Keyword arguments:
-		verbose -- activate throwing errors with descriptive messages (default False)
+		toggle_self -- evaluate each gate with the state of its own entity toggled (default False)
 		
 		Return values:
-		True -- if op_perf_levs copied in
-		False -- if some keys of op_perf_levs are not functions,
-		         or the sum of values is not between 0.9999999999 and 0.0000000001
-		"""
-		if self._op_p_ready(op_perf_levs, verbose):
-			self.op_performance_levels = copy.copy(op_perf_levs)
-			return True
-		return False
-		
-	def set_res_lim(self, res_lim, verbose=False):
+		resultant states of the entities in self.gate_ent_ids, for each scenario (uint8 numpy array)
 		"""
-		Set new resource limits.
+		n_ent = len(self.entities)
+		values = np.zeros(states.shape[:-1] + (n_ent + len(self.gate_thresholds),))
+		values[..., :n_ent] = states
+		for start, end in self.gate_levels:
+			lo, hi = self.gate_ptr[start], self.gate_ptr[end]
+			inputs = values[..., self.gate_refs[lo:hi]]
+			if toggle_self:
+				inputs = np.where(self.gate_self[lo:hi], 1.0 - inputs, inputs)
+			sums = np.add.reduceat(inputs*self.gate_weights[lo:hi], self.gate_ptr[start:end] - lo,
+			                       axis=-1)
+			thresholds = self.gate_thresholds[start:end] - GATE_TOLERANCE
+			values[..., n_ent+start:n_ent+end] = sums >= thresholds
+		return values[..., n_ent + self.gate_root_ids].astype(np.uint8)
+		
+	def _get_gate_resul_st(self, tree, system_state, toggle_id=-1):
+		"""
+		Evaluate a gate tree (see _build_gate_circuits).
 		
 		Arguments:
-		res_lim -- the new resource limits
+		tree -- the gate tree
+		system_state -- states of all entities
 		
 		Keyword arguments:
-		verbose -- activate throwing errors with descriptive messages (default False)
+		toggle_id -- id of an entity whose state is taken as toggled (default -1; none)
 		
 		Return values:
-		True -- if res_lim copied in
-		False -- if some keys of res_lim are not resources,
-		         or values are not all non-negative
-		"""
-		if self._res_lm_ready(res_lim, verbose):
-			self.resource_limits = copy.copy(res_lim)
-			return True
-		return False
-	
-	
-	
-	
-	#DELETIONS
-	def del_entity(self, name):
+		the state of the gate (either 0 or 1)
+		"""
+		threshold, inputs = tree
+		total = 0.0
+		for weight, ref in inputs:
+			if isinstance(ref, tuple):
+				state = self._get_gate_resul_st(ref, system_state, toggle_id)
+			elif ref == toggle_id:
+				state = 1 - system_state[ref]
+			else:
+				state = system_state[ref]
+			if state:
+				total += weight
+		return int(total >= threshold - GATE_TOLERANCE)
+		
+	def _get_eligible_ids(self, system_state):
 		"""
-		Delete entity and track affected entities.
+		Find all entities whose dependencies are such that their state can change.
 		
 		Arguments:
-		name -- the name of the entity
+		system_state -- states of all entities (uint8 numpy array)
 		
 		Return values:
-		all the entities that used to depend on the deleted entity (list)
+		ids of entities that can change state, in the order of self.entities (list)
+		"""
+		resul_st_ids = self._get_sys_resul_st_ids(system_state)
+		resul_sts = self.res_sts_flat[self.res_sts_ptr[:-1] + resul_st_ids]
+		# internal dependence that would have to change for the resultant state to be 1
+		toggled_sts = self.res_sts_flat[self.res_sts_ptr[:-1] + (resul_st_ids ^ self.self_weights)]
+		if len(self.gate_ent_ids) > 0:
+			resul_sts[self.gate_ent_ids] = self._get_gate_resul_sts(system_state)
+			toggled_sts[self.gate_ent_ids] = self._get_gate_resul_sts(system_state,
+			                                                     toggle_self=True)
+		if len(self.bdd_ent_ids) > 0:
+			resul_sts[self.bdd_ent_ids] = self._get_bdd_resul_sts(system_state)
+			toggled_sts[self.bdd_ent_ids] = self._get_bdd_resul_sts(system_state, toggle_self=True)
+		eligible = (self.internal_dep & (resul_sts == 0) & (toggled_sts == 1)) | \
+		           ((resul_sts == 1) & (system_state == 0))
+		return np.flatnonzero(eligible).tolist()
+		
+	def _is_ent_eligible(self, ent_id, system_state):
+		"""
+		Check if an entity's dependencies are such that its state can change.
 		
-		Exceptions:
-		ValueError -- raised if ent does not exist in model
-		"""
-		if self.is_ent(name):
-			affected_ents = []
-			self.entities.remove(name)
-			self.dependencies.pop(name)
-			self.parents.pop(name)
-			self.resultant_states.pop(name)
-			if self.ent_types[name] == ENTTYPE.FUNCTION:
-				self.op_performance_levels.pop(name)
-			elif self.ent_types[name] == ENTTYPE.RESOURCE:
-				self.resource_limits.pop(name)
-			self.ent_types.pop(name)
-			for ent in self.entities:
-				if name in self.dependencies[ent]:
-					n_dep = len(self.dependencies[ent])-1
-					affected_ents.append(ent)
-					self.dependencies[ent].remove(name)
-					self.resultant_states[ent] = np.array([0 for i in range(2**n_dep)]) # pylint: disable=unused-variable
-			return affected_ents
-		raise ValueError('not an entity')
-	
-	def del_dep(self, ent, dep):
+		Arguments:
+		ent_id -- index of the entity in self.entities
+		system_state -- states of all entities
+		
+		Return values:
+		True -- if the entity's internal dependence or state can change to make it available
+		False -- otherwise
 		"""
-		Delete dependency relationship between two entities.
+		if self.compiled_eligible is not None:
+			return self.compiled_eligible[ent_id](system_state)
+		root = self.bdd_roots[ent_id]
+		if root >= 0:
+			if self._get_bdd_resul_st(root, system_state) == 1:
+				return system_state[ent_id] == 0
+			return bool(self.internal_dep[ent_id] and 
+			            self._get_bdd_resul_st(root, system_state, ent_id) == 1)
+		tree = self.gate_trees[ent_id]
+		if tree is not None:
+			if self._get_gate_resul_st(tree, system_state) == 1:
+				return system_state[ent_id] == 0
+			return bool(self.internal_dep[ent_id] and 
+			            self._get_gate_resul_st(tree, system_state, ent_id) == 1)
+		state_id = 0
+		for dep_id in self.dep_ids[self.dep_ptr[ent_id]:self.dep_ptr[ent_id+1]].tolist():
+			state_id = 2*state_id + system_state[dep_id]
+		table_start = self.res_sts_ptr[ent_id]
+		if self.res_sts_flat[table_start + state_id] == 1:
+			return system_state[ent_id] == 0
+		return bool(self.internal_dep[ent_id] and 
+		            self.res_sts_flat[table_start + (state_id ^ self.self_weights[ent_id])] == 1)
+		
+	def _get_ent_resul_st_by_id(self, ent_id, system_state):
+		"""
+		Evaluate entity resultant state from system state using the precomputed kernel arrays.
 		
 		Arguments:
-		ent -- the entity that used to depend on dep
-		dep_name -- the entity that will be removed from ent's list of dependencies
+		ent_id -- index of the entity in self.entities
+		system_state -- states of all entities
 		
 		Return values:
-		True -- if dependency removed
-		False -- if ent or dep is not an entity, or the dependency relationship doesn't exist
-		"""
-		if self.is_ent(ent) and self.is_ent(dep) and self.is_dep(ent, dep):
-			self.dependencies[ent].remove(dep)
-			#self.resultantStates[ent] = []
-			self._set_default_res_sts(ent)
-			return True
-		return False
-	
-
-
-	
-	#EDITS
-	def _edit_ent_type(self, ent, new_ent_type):
+		resultant state of the entity (either 0 or 1)
+		"""
+		if self.compiled_resul_sts is not None:
+			return self.compiled_resul_sts[ent_id](system_state)
+		if self.gate_trees[ent_id] is not None:
+			return self._get_gate_resul_st(self.gate_trees[ent_id], system_state)
+		if self.bdd_roots[ent_id] >= 0:
+			return self._get_bdd_resul_st(self.bdd_roots[ent_id], system_state)
+		state_id = 0
+		for dep_id in self.dep_ids[self.dep_ptr[ent_id]:self.dep_ptr[ent_id+1]].tolist():
+			state_id = 2*state_id + system_state[dep_id]
+		return self.res_sts_flat[self.res_sts_ptr[ent_id] + state_id]
+		
+	def _get_ent_resul_st_from_sys_st(self, ent, system_state):
 		"""
-		Change the type of an entity.
+		Evaluate entity resultant state from system state.
 		
 		Arguments:
-		ent -- the entity
-		new_ent_type -- the new type of ent
+		ent -- entity to be evaluated
+		system_state -- states of all entities
 		
 		Return values:
-		True -- if ent's type has been changed to new_ent_type
-		False -- if ent is not an entity, new_ent_type is not a valid type,
-		         new_ent_type is the same as ent's current type, or the new type
-				 is resource and ent depends on another resource
+		resultant state of ent (either 0 or 1)
 		"""
-		if self.is_ent(ent) and new_ent_type in ENTTYPE.TYPES and new_ent_type != self.ent_types[ent]:
-			if new_ent_type == ENTTYPE.FUNCTION:
-				self.op_performance_levels[ent] = 0.0
-			elif new_ent_type == ENTTYPE.RESOURCE:
-				for dep in self.dependencies[ent]:
-					if dep != ent and self.ent_types[dep] == ENTTYPE.RESOURCE:
-						return False
-				self.resource_limits[ent] = 0
-				
-			if self.ent_types[ent] == ENTTYPE.FUNCTION:
-				del self.op_performance_levels[ent]
-			elif self.ent_types[ent] == ENTTYPE.RESOURCE:
-				del self.resource_limits[ent]			
-
-			self.ent_types[ent] = new_ent_type
-				
-			return True
-		return False
+		if self.compiled_resul_sts is not None:
+			return self.compiled_resul_sts[self.entity_lookup[ent]](system_state)
+		if ent in self.gates:
+			return self._get_gate_resul_st(self.gate_trees[self.entity_lookup[ent]], system_state)
+		if self.bdd_roots[self.entity_lookup[ent]] >= 0:
+			return self._get_bdd_resul_st(self.bdd_roots[self.entity_lookup[ent]], system_state)
+		entity_state = self._get_ent_dep_sts_from_sys_st(ent, system_state)
+		entity_state_id = get_dec_from_bin_arr(entity_state)  # ID of entity resultant state
+		return self.resultant_states[ent][entity_state_id]
 		
-	def _edit_parent(self, ent, new_parent):
+	def _get_ent_dep_sts_from_sys_st(self, ent, system_state):
 		"""
-		Change the parent of an entity.
+		Evaluate entity state from system state.
 		
 		Arguments:
-		ent -- the entity
-		new_parent -- the new parent of ent
+		ent -- entity to be evaluated
+		system_state -- states of all entities
+		
+		Exceptions:
+		ValueError -- raised when system_state is wrong size
 		
 		Return values:
-		True -- if ent's parent has been changed to new_parent
-		False -- if new_parent is not a valid parent name or is the same
-		         as ent's current parent
+		ent_state -- states of ent's dependencies (list)
 		"""
-		if self.valid_parent(ent, new_parent) and new_parent != self.parents[ent]:
-			self.parents[ent] = new_parent
-			return True
-		return False
+		if len(system_state) != len(self.entities):
+			raise ValueError('system_state incorrect size')
+		ent_state = []
+		for dep in self.dependencies[ent]:
+			dep_id = self.entity_lookup[dep]
+			ent_state.append(system_state[dep_id])  # entity state determined by state of dependencies
+		return ent_state
 		
-	def edit_entity(self, ent, new_ent_type, new_ent_parent):
+	def _det_sys_wide_state_pessimistic(self, current_internal_states, realized_timelines):
 		"""
-		Change the parent or the type (or both) of an entity.
+		Constructs worst possible system state given the current internal states.
 		
 		Arguments:
-		ent -- the entity
-		new_ent_type -- the new type of ent
-		new_ent_parent -- the new parent of ent
+		current_internal_states -- states of internally-dependent entities
+		realized_timelines -- time it takes for an entity's state to change once it's dependencies are met
 		
 		Return values:
-		True -- if the parent or the type of ent changed
-		False -- otherwise
-		"""		
-		edited = False
+		system_state -- worst possible system state (list)
+		"""
+		#put all timelines in one place
+		durations = copy.copy(realized_timelines)
 		
-		if self._edit_parent(ent, new_ent_parent):
-			edited = True
-		if self._edit_ent_type(ent, new_ent_type):
-			edited = True			
-		return edited
+		states = bytearray(len(self.entities)) # will include internal states
+		system_state = bytearray(len(self.entities)) # will not initially include internal states
 		
-class GMORScenarioModel(object):
-	"""
-	Builds and modifies a scenario model based on the properties of a GMORModel.
-	
-	Public methods:
-	reset, set_and_check, set, valid_states, valid_internal_states,
-	valid_realized_timelines, valid_efforts, valid_deadlines, cur_int_st_ready, rlzd_time_ready,
-	rlzd_ex_ready, eff_ready, deads_ready, ready, set_current_internal_states, set_realized_timelines,
-	set_realized_exit_by_ent, set_realized_exits, set_effort_by_resource, set_deadlines, set_new_scen_model
-						
-	Instance variables:
-	model, name, current_internal_states, realized_timelines, realized_exits, efforts, deadlines
-	"""
-	
-	def __init__(self, model, name):
+		changed_ents = []
+		for ent in current_internal_states:
+			if current_internal_states[ent] == 1 and durations[ent] == 0:
+				ent_id = self.entity_lookup[ent]
+				changed_ents.append(ent)
+				states[ent_id] = 1
+		old_states = copy.copy(states)
+		while len(changed_ents) > 0:
+			for dep_ent in changed_ents:
+				for ent_id in self._get_dependent_ids(self.entity_lookup[dep_ent]):
+					ent = self.entities[ent_id]
+					if dep_ent != ent and durations[ent] == 0.0:
+						new_resultant = self._get_ent_resul_st_by_id(ent_id, states)
+						old_resultant = self._get_ent_resul_st_by_id(ent_id, old_states)
+						temp_resultant = self._get_ent_resul_st_by_id(ent_id, system_state)
+						#print ':::::',states,system_state,ent,new_resultant,old_resultant
+						if new_resultant == 1 and (old_resultant == 0 or temp_resultant == 0):
+							old_states = copy.copy(states)
+							changed_ents.append(ent)
+							ent_id = self.entity_lookup[ent]
+							#print '....',dep_ent,ent
+							states[ent_id] = 1
+							system_state[ent_id] = 1
+				changed_ents.remove(dep_ent)
+		for ent in current_internal_states: # add internal states of entities that only depend on themselves
+			if len(self.dependencies[ent]) == 1 and durations[ent] == 0:
+				ent_id = self.entity_lookup[ent]
+				system_state[ent_id] = current_internal_states[ent]
+		return list(system_state)
+		
+	def _get_ent_resul_sts_packed(self, ent_id, words):
 		"""
-		Constructs a scenario model.
+		Get the resultant states of an entity across bit-sliced scenarios.
 		
 		Arguments:
-		model -- GMORModel the scenario will be based on
-		name -- identifier of scenario model
+		ent_id -- entity id
+		words -- states of all entities across scenarios (uint64 numpy array, one row per entity)
 		
-		Exceptions:
-		ValueError -- raised when GMORModel is not ready for analysis
+		Return values:
+		the resultant states of the entity across scenarios (uint64 numpy array)
 		"""
-		if model.ready():
-			self.model = model
-		else:
-			raise ValueError('must send in a model ready for analysis')
-		self.reset(model)
-		self.name = name
+		if self.gate_trees[ent_id] is not None:
+			return self._get_gate_resul_sts_packed(self.gate_trees[ent_id], words)
+		zeros = np.zeros(words.shape[1], dtype=np.uint64)
+		node_vals = [zeros, ~zeros]
+		for dep_id, hi, lo in self.mux_nodes[ent_id]:
+			dep_words = words[dep_id]
+			node_vals.append((dep_words & node_vals[hi]) | (~dep_words & node_vals[lo]))
+		return node_vals[self.mux_roots[ent_id]]
 		
-	def reset(self, model):
+	def _get_gate_resul_sts_packed(self, tree, words):
 		"""
-		Reset scenario conditions.
+		Evaluate a gate tree (see _build_gate_circuits) across bit-sliced scenarios.
+		
+		Nodes whose inputs all have the same weight, as for and, or and k_of_n gates, come to 1
+		once enough of their inputs are 1: all of them (bitwise and), any of them (bitwise or), or
+		else a count of them made with a bit-sliced adder. Nodes with whole-number weights add up
+		their weights with the adder. Either way they match _get_gate_resul_st exactly. Only nodes
+		with other weights are evaluated scenario by scenario, by unpacking their inputs.
 		
 		Arguments:
-		model -- GMORModel the scenario is based on		
-		"""
-		self.current_internal_states = {}
-		self.realized_timelines = {}
-		self.realized_exits = {}
-		self.efforts = {}
-		self.deadlines = {}
-		for ent in model.entities:
-			if ent in model.dependencies[ent]:  # if entity is dependent of itself
-				self.current_internal_states[ent] = 1
-				self.realized_exits[ent] = -1
-			self.realized_timelines[ent] = 0.0
-			if model.ent_types[ent] != ENTTYPE.RESOURCE:  # if entity is not a resource
-				for dep in model.dependencies[ent]:
-					if model.ent_types[dep] == ENTTYPE.RESOURCE:  # if dependency of entity is a resource
-						if self.efforts.has_key(ent) == False:  # if first found resource dependency of ent
-							self.efforts[ent] = {}
-						self.efforts[ent][dep] = 0  #{ent:{dep:0},...}
-			if model.ent_types[ent] == ENTTYPE.FUNCTION:
-				self.deadlines[ent] = 0.0
-				
-	def set_and_check(self, model, current_internal_states,
-					              realized_timelines, realized_exits, efforts, deadlines):
-		"""
-		Set up scenario model and check if it's ready for analysis.
+		tree -- the gate tree
+		words -- states of all entities across scenarios (uint64 numpy array, one row per entity)
+		
+		Return values:
+		the states of the gate across scenarios (uint64 numpy array)
+		"""
+		threshold, inputs = tree
+		input_words = np.array([self._get_gate_resul_sts_packed(ref, words)
+		                        if isinstance(ref, tuple) else words[ref]
+		                        for weight, ref in inputs])
+		weights = [weight for weight, ref in inputs]
+		n_words = words.shape[1]
+		bound = threshold - GATE_TOLERANCE
+		if all(weight == weights[0] for weight in weights) and weights[0] > 0:
+			# the number of inputs that must be 1, adding up their weights as
+			# _get_gate_resul_st does
+			total = 0.0
+			k = 0
+			while k < len(weights) and total < bound:
+				total += weights[0]
+				k += 1
+			if total < bound:
+				return np.zeros(n_words, dtype=np.uint64)
+			if k == 0:
+				return ~np.zeros(n_words, dtype=np.uint64)
+			if k == 1:
+				return np.bitwise_or.reduce(input_words, axis=0)
+			if k == len(weights):
+				return np.bitwise_and.reduce(input_words, axis=0)
+			return lanes_at_least(add_lanes(input_words, [1]*len(weights)), k, n_words)
+		if all(weight == int(weight) for weight in weights) and sum(weights) < 2**53:
+			return lanes_at_least(add_lanes(input_words, [int(weight) for weight in weights]), 
+			                      int(np.ceil(bound)), n_words)
+		states = unpack_lanes(input_words, n_words*LANE_BITS)
+		return pack_lanes((states.dot(np.array(weights)) >= bound)[:, np.newaxis])[0]
+		
+	def _get_sys_resul_sts_packed(self, words):
+		"""
+		Get the resultant states of all entities across bit-sliced scenarios.
 		
 		Arguments:
-		model -- GMORModel the scenario is based on
-		current_internal_states -- state of internally dependent entities
-								   (0 for unavailable, 1 for available)
-		realized_timelines -- time it takes for an entity's state to change once it's dependencies are met
-		realized_exits -- amount of time an internal dependency of an entity is available
-		efforts -- number of units of a resource dependency an entity requires
-		deadlines -- for function entities, the time that the entity must be active by
+		words -- states of all entities across scenarios (uint64 numpy array, one row per entity)
 		
 		Return values:
-		True -- if scenario model is ready for analysis
-		False -- otherwise
+		resultant states across scenarios (uint64 numpy array, one row per entity)
 		"""
-		self.set(model, current_internal_states, realized_timelines, realized_exits, efforts, deadlines)
-		if self.ready():
-			return True
-		return False
+		resul_words = np.zeros_like(words)
+		for ent_id in range(len(self.entities)):
+			resul_words[ent_id] = self._get_ent_resul_sts_packed(ent_id, words)
+		return resul_words
 		
-	def set(self, model, current_internal_states, realized_timelines, realized_exits, efforts, deadlines):
+	def _det_sys_wide_state_pessimistic_packed(self, internal_words, realized_timelines,
+	                                          seed_order=None):
 		"""
-		Set up scenario model with given conditions.
+		Constructs the worst possible system states given the current internal states of many
+		scenarios at once, with the state of each entity across 64 scenarios packed in a word.
+		
+		Follows the same steps as _det_sys_wide_state_pessimistic in every scenario, so the entities
+		that come up can depend on the order the internal states are listed in. Each scenario keeps
+		its own list of the entities still to go through, while their resultant states are evaluated
+		for all scenarios at once with bitwise logic.
 		
 		Arguments:
-		model -- GMORModel the scenario is based on
-		current_internal_states -- state of internally dependent entities
-								   (0 for unavailable, 1 for available)
-		realized_timelines -- time it takes for an entity's state to change once it's dependencies are met
-		realized_exits -- amount of time an internal dependency of an entity is available
-		efforts -- number of units of a resource dependency an entity requires
-		deadlines -- for function entities, the time that the entity must be active by
+		internal_words -- current internal states across scenarios (uint64 numpy array, one row per
+		                  entity; rows of entities not in seed_order are ignored)
+		realized_timelines -- time it takes for an entity's state to change once it's dependencies
+		                      are met
+		
+		Keyword arguments:
+		seed_order -- ids of the entities whose internal states are listed, in the order of the keys
+		              of current_internal_states (default None; the internally-dependent entities in
+		              the order of self.entities)
 		
 		Exceptions:
-		ValueError -- raised when GMORModel is not ready for analysis
+		ValueError -- raised when entities keep coming up again without end
+		
+		Return values:
+		system_words -- worst possible system states (uint64 numpy array, one row per entity)
 		"""
-		if model.ready():
-			self.model = model
-		else:
-			raise ValueError('must send in a model ready for analysis')
-		self.current_internal_states = current_internal_states
-		self.realized_timelines = realized_timelines
-		self.realized_exits = realized_exits
-		self.efforts = efforts
-		self.deadlines = deadlines
+		n_ent = len(self.entities)
+		n_lanes = internal_words.shape[1]*LANE_BITS
+		if seed_order is None:
+			seed_order = np.flatnonzero(self.internal_dep)
+		seed_order = np.asarray(seed_order, dtype=np.int64)
+		zero_duration = np.array([realized_timelines[ent] == 0 for ent in self.entities],
+		                         dtype=bool)
+		states = np.zeros_like(internal_words)
+		states[seed_order] = np.where(zero_duration[seed_order, np.newaxis],
+		                              internal_words[seed_order], np.uint64(0))
+		old_states = states.copy()
+		system_words = np.zeros_like(states)
+		seeded = unpack_lanes(states[seed_order], n_lanes)
+		queues = self._start_pessimistic_queues(seeded, np.tile(seed_order, (n_lanes, 1)))
+		
+		# only entities with dependencies other than themselves can be brought up by them
+		other_deps = [[dep_id for dep_id in self.dependencies_lookup[ent] if dep_id != ent_id]
+		              for ent_id, ent in enumerate(self.entities)]
+		while True:
+			lanes, dep_ids = self._get_pessimistic_queue_heads(queues)
+			if len(lanes) == 0:
+				break
+			heads = np.zeros((n_lanes, n_ent), dtype=np.uint8)
+			heads[lanes, dep_ids] = 1
+			head_words = pack_lanes(heads)
+			for ent_id in range(n_ent):
+				if not zero_duration[ent_id] or len(other_deps[ent_id]) == 0:
+					continue
+				checked = np.bitwise_or.reduce(head_words[other_deps[ent_id]], axis=0)
+				if not checked.any():
+					continue
+				new_words = checked & self._get_ent_resul_sts_packed(ent_id, states) & \
+				            (~self._get_ent_resul_sts_packed(ent_id, old_states) | 
+				             ~self._get_ent_resul_sts_packed(ent_id, system_words))
+				if not new_words.any():
+					continue
+				old_states = (old_states & ~new_words) | (states & new_words)
+				states[ent_id] |= new_words
+				system_words[ent_id] |= new_words
+				new_states = unpack_lanes(new_words[np.newaxis, :], n_lanes)[:, 0]
+				changed_lanes = np.flatnonzero(new_states)
+				self._add_to_pessimistic_queues(queues, changed_lanes, ent_id)
+			self._pop_pessimistic_queues(queues, lanes, dep_ids)
+		
+		# add internal states of entities that only depend on themselves
+		for ent_id in seed_order.tolist():
+			if len(other_deps[ent_id]) == 0 and zero_duration[ent_id]:
+				system_words[ent_id] = internal_words[ent_id]
+		return system_words
+		
+	def _det_sys_wide_state_pessimistic_batch(self, internal_states, zero_durations,
+	                                          seed_order=None):
+		"""
+		Constructs the worst possible system states of a batch of scenarios, following the same
+		steps as _det_sys_wide_state_pessimistic in every scenario with whole-array operations on
+		one row per scenario.
 		
-	#CHECKS
-	def valid_states(self, arr):
+		Arguments:
+		internal_states -- current internal states, one row per scenario and one column per entity
+		                   (columns of entities not in seed_order are ignored)
+		zero_durations -- 1 where an entity takes no time to change state, one row per scenario
+		                  and one column per entity
+		
+		Keyword arguments:
+		seed_order -- ids of the entities whose internal states are listed, in the order of the keys
+		              of current_internal_states, either for all scenarios or one row per scenario
+		              (default None; the internally-dependent entities in the order of
+		              self.entities)
+		
+		Exceptions:
+		ValueError -- raised when the arrays are not one column per entity or differ in shape, when
+		              seed_order is not one row per scenario, or when entities keep coming up again
+		              without end
+		
+		Return values:
+		system_states -- worst possible system states, one row per scenario (uint8 numpy array)
+		p_a -- performance a, the system level performance of each scenario (numpy array)
+		"""
+		internal_states = np.atleast_2d(np.asarray(internal_states, dtype=np.uint8))
+		zero_durations = np.atleast_2d(np.asarray(zero_durations, dtype=bool))
+		n_rows, n_ent = internal_states.shape
+		if n_ent != len(self.entities) or internal_states.shape != zero_durations.shape:
+			raise ValueError('need one column per entity for each scenario')
+		if seed_order is None:
+			seed_order = np.flatnonzero(self.internal_dep)
+		seed_order = np.asarray(seed_order, dtype=np.int64)
+		if seed_order.ndim == 1:
+			seed_order = np.tile(seed_order, (n_rows, 1))
+		if seed_order.shape[0] != n_rows:
+			raise ValueError('need a seed order for each scenario')
+		
+		rows = np.arange(n_rows)[:, np.newaxis]
+		listed = np.zeros((n_rows, n_ent), dtype=bool)
+		listed[rows, seed_order] = True
+		states = internal_states & zero_durations & listed
+		old_states = states.copy()
+		system_states = np.zeros_like(states)
+		queues = self._start_pessimistic_queues(states[rows, seed_order], seed_order)
+		
+		# dependents[dep_id, ent_id] when ent_id can be brought up by dep_id
+		dependents = np.zeros((n_ent, n_ent), dtype=bool)
+		dependents[self.dep_ids, np.repeat(np.arange(n_ent), np.diff(self.dep_ptr))] = True
+		dependents[np.arange(n_ent), np.arange(n_ent)] = False
+		while True:
+			active, dep_ids = self._get_pessimistic_queue_heads(queues)
+			if len(active) == 0:
+				break
+			for ent_id in range(n_ent):
+				checked = active[dependents[dep_ids, ent_id] & zero_durations[active, ent_id]]
+				if len(checked) == 0:
+					continue
+				new_resul_sts = self._get_ent_resul_sts(ent_id, states[checked])
+				old_resul_sts = self._get_ent_resul_sts(ent_id, old_states[checked])
+				temp_resul_sts = self._get_ent_resul_sts(ent_id, system_states[checked])
+				changed = checked[(new_resul_sts == 1) &
+				                  ((old_resul_sts == 0) | (temp_resul_sts == 0))]
+				if len(changed) == 0:
+					continue
+				old_states[changed] = states[changed]
+				states[changed, ent_id] = 1
+				system_states[changed, ent_id] = 1
+				self._add_to_pessimistic_queues(queues, changed, ent_id)
+			self._pop_pessimistic_queues(queues, active, dep_ids)
+		
+		# add internal states of entities that only depend on themselves
+		self_only = zero_durations & listed & self.internal_dep & (np.diff(self.dep_ptr) == 1)
+		system_states[self_only] = internal_states[self_only]
+		
+		perf_levels = np.zeros(n_ent)
+		for ent in self.op_performance_levels.keys():
+			perf_levels[self.entity_lookup[ent]] = self.op_performance_levels[ent]
+		return system_states, system_states.dot(perf_levels)
+		
+	def _get_ent_resul_sts(self, ent_id, states):
 		"""
-		Check states of entities are valid.
+		Get the resultant states of an entity across scenarios.
 		
 		Arguments:
-		arr -- the states
+		ent_id -- index of the entity in self.entities
+		states -- states of all entities, one row per scenario (uint8 numpy array)
 		
 		Return values:
-		True -- if states are valid (i.e. either 0 or 1 and not empty)
-		False -- otherwise
+		the resultant states of the entity across scenarios (uint8 numpy array)
 		"""
-		if set(arr) == set([0, 1]) or set(arr) == set([0]) or set(arr) == set([1]): 
-			return True
-		return False
+		if self.gate_trees[ent_id] is not None:
+			gate_index = np.flatnonzero(self.gate_ent_ids == ent_id)[0]
+			return self._get_gate_resul_sts(states)[:, gate_index]
+		if self.bdd_roots[ent_id] >= 0:
+			return self._get_bdd_resul_sts(states)[:, np.flatnonzero(self.bdd_ent_ids == ent_id)[0]]
+		start, end = self.dep_ptr[ent_id], self.dep_ptr[ent_id+1]
+		resul_st_ids = states[:, self.dep_ids[start:end]].dot(self.dep_weights[start:end])
+		return self.res_sts_flat[self.res_sts_ptr[ent_id] + resul_st_ids]
 		
-	def _valid_internal_states(self, int_states, model, verbose=False):
+	def _start_pessimistic_queues(self, seeded, seed_order):
 		"""
-		Check internal states of entities are valid and match with dependencies.
+		Start the lists of entities that have come up in each scenario (the changed_ents of
+		_det_sys_wide_state_pessimistic) from their seeds.
 		
 		Arguments:
-		int_states -- current internal states of the entities
-		model -- GMORModel scenario is based on
-		
-		Keyword arguments:
-		verbose -- activate throwing errors with descriptive messages (default False)
+		seeded -- whether each listed entity seeds the propagation, one row per scenario
+		seed_order -- ids of the listed entities, one row per scenario
 		
 		Return values:
-		True -- if states are valid (i.e. either 0 or 1) and match dependencies
-		False -- otherwise
-		
-		Exceptions:
-		ValueError -- raised when verbose mode on and internal states are invalid
+		queues -- the entity ids of each list from position 0, its length, the position it has been
+		          gone through to and the number of entities gone through so far (list)
 		"""
-		if not model.are_ents(int_states.keys()):
-			if verbose:
-				raise ValueError('Not all entities of the model')
-			return False
-		if not self.valid_states(int_states.values()):
-			if verbose:
-				raise ValueError('Invalid states (must be 0 or 1)')
-			return False
-		for ent in int_states.keys():
-			if ent not in model.dependencies[ent]:
-				if verbose:
-					raise ValueError('Not an internally-dependent entity')
-				return False
-		return True
+		seeded = np.asarray(seeded, dtype=bool)
+		n_rows, n_seeds = seeded.shape
+		ids = np.full((n_rows, max(2*n_seeds, len(self.entities), 1)), -1, dtype=np.int64)
+		order = np.argsort(~seeded, axis=1, kind='mergesort')  # seeds first, in their order
+		ids[:, :n_seeds] = np.where(seeded[np.arange(n_rows)[:, np.newaxis], order], 
+		                            seed_order[np.arange(n_rows)[:, np.newaxis], order], -1)
+		return [ids, seeded.sum(axis=1), np.zeros(n_rows, dtype=np.int64), 0]
 		
-	def valid_internal_states(self, int_states, verbose=False):
+	def _get_pessimistic_queue_heads(self, queues):
 		"""
-		Check internal states of entities are valid and match with dependencies.
+		Find the entity each scenario goes through next.
 		
 		Arguments:
-		int_states -- current internal states of the entities
+		queues -- the lists of entities of each scenario (see _start_pessimistic_queues)
 		
-		Keyword arguments:
-		verbose -- activate throwing errors with descriptive messages (default False)
+		Exceptions:
+		ValueError -- raised when entities keep coming up again without end
 		
 		Return values:
-		True -- if states are valid (i.e. either 0 or 1) and match dependencies
-		False -- otherwise
+		rows -- the scenarios whose lists are not empty (numpy array)
+		dep_ids -- the ids of the entities they go through next (numpy array)
 		"""
-		return self._valid_internal_states(int_states, self.model, verbose)
+		ids, lengths, positions, n_steps = queues
+		# far more steps than it takes unless it goes round forever
+		if n_steps > 4*len(self.entities)**2 + 64:
+			raise ValueError('worst possible system state does not settle')
+		queues[3] += 1
+		rows = np.flatnonzero(lengths > 0)
+		return rows, ids[rows, positions[rows]]
 		
-	def valid_realized_timelines(self, timelines, verbose=False):
+	def _add_to_pessimistic_queues(self, queues, rows, ent_id):
 		"""
-		Check time lines of entities are valid.
+		Add an entity that has come up to the end of the lists of some scenarios.
 		
 		Arguments:
-		timelines -- realized time lines of the entities
+		queues -- the lists of entities of each scenario (see _start_pessimistic_queues)
+		rows -- the scenarios it has come up in
+		ent_id -- the id of the entity
+		"""
+		ids, lengths = queues[:2]
+		if lengths[rows].max() >= ids.shape[1]:
+			ids = np.hstack((ids, np.full(ids.shape, -1, dtype=np.int64)))
+			queues[0] = ids
+		ids[rows, lengths[rows]] = ent_id
+		lengths[rows] += 1
 		
-		Keyword arguments:
-		verbose -- activate throwing errors with descriptive messages (default False)
+	def _pop_pessimistic_queues(self, queues, rows, dep_ids):
+		"""
+		Take the entities just gone through off the lists of some scenarios, dropping the first
+		entry of each and moving on to the next position, back to the start of the list at its end.
+		
+		Arguments:
+		queues -- the lists of entities of each scenario (see _start_pessimistic_queues)
+		rows -- the scenarios that have gone through an entity
+		dep_ids -- the ids of the entities they have gone through
+		"""
+		ids, lengths, positions = queues[:3]
+		row_ids = ids[rows]
+		cols = np.arange(ids.shape[1])
+		first = np.argmax(row_ids == dep_ids[:, np.newaxis], axis=1)
+		shifted = np.minimum(cols + (cols >= first[:, np.newaxis]), ids.shape[1] - 1)
+		row_ids = row_ids[np.arange(len(rows))[:, np.newaxis], shifted]
+		lengths[rows] -= 1
+		row_ids[np.arange(len(rows)), lengths[rows]] = -1
+		ids[rows] = row_ids
+		positions[rows] += 1
+		positions[positions >= lengths] = 0
+		
+	def _find_pa_packed(self, words, n_lanes):
+		"""
+		Calculate system level performance across bit-sliced scenarios.
+		
+		Arguments:
+		words -- states of all entities across scenarios (uint64 numpy array, one row per entity)
+		n_lanes -- the number of scenarios packed in the words
 		
 		Return values:
-		True -- if each entity of GMORModel has a valid (i.e. non-negative) time line
-		False -- otherwise
+		p_a -- performance a, the system level performance of each scenario (numpy array)
+		"""
+		p_a = np.zeros(n_lanes)
+		for ent in self.op_performance_levels.keys():
+			ent_id = self.entity_lookup[ent]
+			ent_states = unpack_lanes(words[ent_id:ent_id+1], n_lanes)[:, 0]
+			p_a += self.op_performance_levels[ent]*ent_states
+		return p_a
 		
-		Exceptions:
-		ValueError -- raised when verbose mode on and time lines are invalid
+	def sweep_pessimistic_states(self, current_internal_states_list, realized_timelines):
 		"""
-		if not self.model.are_ents(timelines.keys()):
-			if verbose:
-				raise ValueError('Not all entities of the model')
-			return False
-		if not is_all_non_neg(timelines.values()):
-			if verbose:
-				raise ValueError('Negative time lines invalid')
-			return False
-		for ent in self.model.entities:
-			if ent not in timelines.keys():
-				if verbose:
-					raise ValueError('Missing time line for an entity')
-				return False
-		return True
+		Constructs the worst possible system state and its performance for many sets of current
+		internal states (such as those from util.get_curr_int_states), 64 at a time.
 		
-	def valid_efforts(self, efforts, verbose=False):
+		Arguments:
+		current_internal_states_list -- list of current_internal_states dictionaries
+		realized_timelines -- time it takes for an entity's state to change once it's dependencies
+		                      are met
+		
+		Exceptions:
+		ValueError -- raised when entities keep coming up again without end
+		
+		Return values:
+		p_a -- performance a, the system level performance of each scenario (numpy array)
+		system_states -- worst possible system state of each scenario, one row per scenario
+		                 (uint8 numpy array; entities in state 0 make up its fail set)
+		"""
+		n_lanes = len(current_internal_states_list)
+		internal_states = np.zeros((n_lanes, len(self.entities)), dtype=np.uint8)
+		groups = {}  # scenarios listing their internal states in the same order go together
+		for s, current_internal_states in enumerate(current_internal_states_list):
+			for ent in current_internal_states:
+				internal_states[s, self.entity_lookup[ent]] = current_internal_states[ent]
+			seed_order = tuple(self.entity_lookup[ent] for ent in current_internal_states)
+			groups.setdefault(seed_order, []).append(s)
+		p_a = np.zeros(n_lanes)
+		system_states = np.zeros_like(internal_states)
+		for seed_order, lanes in groups.items():
+			internal_words = pack_lanes(internal_states[lanes])
+			system_words = self._det_sys_wide_state_pessimistic_packed(internal_words,
+			                                                           realized_timelines,
+			                                                           seed_order)
+			p_a[lanes] = self._find_pa_packed(system_words, len(lanes))
+			system_states[lanes] = unpack_lanes(system_words, len(lanes))
+		return p_a, system_states
+		
+	def _build_progression(self, _system_state, realized_timelines, stop_at=-1):
 		"""
-		Check efforts of entities are valid and match with dependencies.
+		Builds lists of entity changes, times the changes occur, and the system state after the changes.
 		
 		Arguments:
-		efforts -- efforts of the entities
+		_system_state -- state of all entities
+		realized_timelines -- time it takes for an entity's state to change once it's dependencies are met
 		
 		Keyword arguments:
-		verbose -- activate throwing errors with descriptive messages (default False)
+		stop_at -- Halt and return the progression at this time (default -1)
 		
 		Return values:
-		True -- if efforts of each entity are valid (i.e. non-negative) and match dependencies
-				(efforts for resource entities cannot be included)
-		False -- otherwise
-		
-		Exceptions:
-		ValueError -- raised when verbose mode on and efforts are invalid
+		dep_changes -- entity state changes (list)
+		dep_change_timing -- times when changes occur (list)
+		system_state -- system state after changes (list)
 		"""
-		#print '1',self.model.are_ents(efforts.keys())
-		if self.model.are_ents(efforts.keys()):
-			for ent in efforts.keys():
-				#print '5',is_all_non_neg(efforts[ent].values()) == False
-				if is_all_non_neg(efforts[ent].values()) == False:
-					if verbose:
-						raise ValueError('Negative efforts invalid')
-					return False
-				if self.model.ent_types[ent] == ENTTYPE.RESOURCE:  # efforts for resources not allowed
-					if verbose:
-						raise ValueError('Cannot have efforts for resource entities')
-					return False
-				for dep_ent in efforts[ent].keys():
-					eff_val = efforts[ent][dep_ent]
-					#print '2',eff_val < 0
-					#if eff_val < 0:
-						#return False
-					#print '3',self.model.is_dep(ent,dep_ent) == False
-					#print '4',self.model.ent_types[dep_ent]# != ENTTYPE.RESOURCE
-					if self.model.is_dep(ent, dep_ent) == False:
-						if verbose:
-							raise ValueError('Entity does not depend on resource')
-						return False
-					if self.model.ent_types[dep_ent] != ENTTYPE.RESOURCE:
-						if verbose:
-							raise ValueError('Dependency not a resource entity')
-						return False
-			return True
-		if verbose:
-			raise ValueError('Not all entities of the model')
-		return False
+		dep_changes, dep_change_timing, system_state, unused_exit, unused_abort = \
+			self._run_progression(_system_state, realized_timelines, stop_at)
+		return dep_changes, dep_change_timing, system_state
 		
-	def _valid_realized_exits(self, rlzd_exits, verbose=False):
+	def _run_progression(self, _system_state, realized_timelines, stop_at=-1, realized_exits=None,
+	                     deadlines=None, effort_outputs=None):
 		"""
-		Check realized exits of entities are valid and match with dependencies.
+		Progress the system state as a sequence of timed events: the completion of entity state
+		changes and the exit of internal dependencies. A realized exit that happens before the
+		recovery is complete, while its entity is up or changing, takes the entity down, along with
+		the dependents that relied on it, and halts the progression.
+		
+		When deadlines are given, the progression is aborted as soon as time passes a deadline
+		whose entity is still down. When efforts are given, it is aborted as soon as the changes
+		underway (with non-zero durations) use more of a resource than its limit; such an overlap
+		always shows up as a shortfall in _get_resource_allotment too.
 		
 		Arguments:
-		rlzd_exit -- realized exits of the entities
+		_system_state -- state of all entities
+		realized_timelines -- time it takes for an entity's state to change once it's dependencies
+		                      are met
 		
 		Keyword arguments:
-		verbose -- activate throwing errors with descriptive messages (default False)
+		stop_at -- Halt and return the progression at this time (default -1)
+		realized_exits -- amount of time an internal dependency of an entity is available
+		                  (default None; negative values never exit)
+		deadlines -- the time that entities must be active by, to abort on (default None)
+		effort_outputs -- number of units of a resource dependency an entity requires, to abort
+		                  on when a resource limit is exceeded (default None)
 		
 		Return values:
-		True -- if realized exits are valid (i.e. either -1 or non-negative) and match dependencies
-		False -- otherwise
-		
-		Exceptions:
-		ValueError -- raised when verbose mode on and exits are invalid
+		dep_changes -- entity state changes (list)
+		dep_change_timing -- times when changes occur (list)
+		system_state -- system state after changes (list)
+		broken_exit -- time and entity of the exit that left recovery incomplete (tuple; None if
+		               none)
+		aborted -- PROGSTATUS code, time and entity of the deadline or resource that aborted the
+		           progression (tuple; None if not aborted)
 		"""
-		if self.model.are_ents(rlzd_exits.keys()):	
-			for ent in rlzd_exits.keys():
-				if ent not in self.model.dependencies[ent]:
-					if verbose:
-						raise ValueError('Not an internally-dependent entity')
-					return False
-				if rlzd_exits[ent] < 0.0 and rlzd_exits[ent] > -1:
-					if verbose:
-						raise ValueError('Exit between -1 and 0 invalid')
-					return False
-				if rlzd_exits[ent] < -1:
-					if verbose:
-						raise ValueError('Exit less than -1 invalid')
-					return False
-			return True
-		if verbose:
-			raise ValueError('Not all entities of the model')
-		return False
-	
-	def valid_deadlines(self, deadlines, verbose=False):
+		snapshot = self._new_snapshot(_system_state)
+		broken_exit, aborted = self._run_events(snapshot, realized_timelines, stop_at,
+		                                        realized_exits, deadlines, effort_outputs)
+		return ([self.entities[ent_id] for ent_id in snapshot.change_ids], snapshot.change_times, 
+		        snapshot.system_state, broken_exit, aborted)
+		
+	def _new_snapshot(self, system_state):
 		"""
-		Check if deadlines are valid.
+		Constructs a snapshot of a progression that has yet to start.
 		
-		Keyword arguments:
-		deadlines -- deadlines of the function entities
-		verbose -- activate throwing errors with descriptive messages (default False)
+		Arguments:
+		system_state -- state of all entities
 		
 		Return values:
-		True -- if deadlines of each entity are valid (not empty, keys are ents, and no negative values)
-		False -- otherwise
-		
-		Exceptions:
-		ValueError -- raised when verbose mode on and deadlines are not valid
+		snapshot -- the snapshot (ProgressionSnapshot)
 		"""
-		if len(deadlines.keys()) == 0:
-			if verbose:
-				raise ValueError('No deadlines')
-			return False
-		if not self.model.are_ents(deadlines.keys()):
-			if verbose:
-				raise ValueError('Not all entities of the model')
-			return False
-		if not is_all_non_neg(deadlines.values()):
-			if verbose:
-				raise ValueError('Not all non-negative values')
-			return False
-		return True
+		snapshot = ProgressionSnapshot()
+		snapshot.initial_state = [int(state) for state in system_state]
+		snapshot.system_state = list(snapshot.initial_state)
+		return snapshot
 		
-	#FINAL CHECKS
-	def cur_int_st_ready(self, verbose=False):
+	def _run_events(self, snapshot, realized_timelines, stop_at=-1, realized_exits=None,
+	                deadlines=None, effort_outputs=None):
 		"""
-		Check that the current internal states are ready for analysis.
+		Continue a progression from a snapshot, as a sequence of timed events: the completion of
+		entity state changes and the exit of internal dependencies. A realized exit that happens
+		before the recovery is complete, while its entity is up or changing, takes the entity down,
+		along with the dependents that relied on it, and halts the progression. Exits of entities
+		that are down and not changing are checked again at each change.
+		
+		When deadlines are given, the progression is aborted as soon as time passes a deadline
+		whose entity is still down. When efforts are given, it is aborted as soon as the changes
+		underway (with non-zero durations) use more of a resource than its limit; such an overlap
+		always shows up as a shortfall in _get_resource_allotment too.
+		
+		Arguments:
+		snapshot -- where the progression is, updated in place to where it halts
+		            (ProgressionSnapshot)
+		realized_timelines -- time it takes for an entity's state to change once it's dependencies
+		                      are met (only used for entities that have yet to start changing)
+		
+		Keyword arguments:
+		stop_at -- Halt and return the progression at this time (default -1)
+		realized_exits -- amount of time an internal dependency of an entity is available
+		                  (default None; negative values never exit)
+		deadlines -- the time that entities must be active by, to abort on (default None)
+		effort_outputs -- number of units of a resource dependency an entity requires, to abort
+		                  on when a resource limit is exceeded (default None)
+		
+		Return values:
+		broken_exit -- time and entity of the exit that left recovery incomplete (tuple; None if
+		               none)
+		aborted -- PROGSTATUS code, time and entity of the deadline or resource that aborted the
+		           progression (tuple; None if not aborted)
+		"""
+		if snapshot.broken_exit is not None:
+			return snapshot.broken_exit, None
+		
+		# scalar checks index the bytearray, whole-array checks its numpy view
+		state_bytes = bytearray(np.array(snapshot.system_state, dtype=np.uint8).tostring())
+		system_state = np.frombuffer(state_bytes, dtype=np.uint8)
+		consumed_durations = dict((self.entities[ent_id], duration) 
+		                          for ent_id, duration in snapshot.consumed_durations.items())
+		durations = dict((ent, realized_timelines[ent]) for ent in realized_timelines.keys()
+		                 if ent not in consumed_durations)
+		current_time = snapshot.current_time
+		
+		pending_exits = []
+		if realized_exits is not None:
+			pending_exits = sorted((realized_exits[ent], self.entity_lookup[ent]) 
+			                       for ent in realized_exits.keys() if realized_exits[ent] >= 0)
+		broken_exit = None
+		aborted = None
+		
+		# deadlines are met by entities up at p_a or changed by the time of the deadline
+		pending_deadlines = []
+		has_changed = np.zeros(len(self.entities), dtype=bool)
+		has_changed[snapshot.change_ids] = True
+		if deadlines is not None:
+			pending_deadlines = sorted((deadlines[ent], self.entity_lookup[ent])
+			                           for ent in deadlines.keys()
+			                           if not (ent in self.op_performance_levels and
+			                                   snapshot.initial_state[self.entity_lookup[ent]] == 1)
+			                           and deadlines[ent] >= current_time)
+		
+		# heap of (completion time, entity id)
+		ents_underway = [(completion_time, ent_id) for completion_time, ent_id
+		                 in zip(snapshot.underway_times, snapshot.underway_ids)]
+		heapq.heapify(ents_underway)
+		is_underway = np.zeros(len(self.entities), dtype=bool)
+		is_underway[snapshot.underway_ids] = True
+		# entities whose eligibility may have changed (None for all)
+		ids_to_check = snapshot.ids_to_check
+		if ids_to_check is not None:
+			ids_to_check = set(ids_to_check)
+		
+		# resources used by the changes underway
+		if effort_outputs is not None:
+			resource_ents = list(self.resource_limits.keys())
+			resource_limits = np.array([self.resource_limits[ent] for ent in resource_ents],
+			                           dtype=float)
+			resource_load = np.zeros(len(resource_ents))
+			ent_efforts = {}
+			for unused_time, ent_id in ents_underway:
+				if consumed_durations[self.entities[ent_id]] > 0:
+					ent_efforts[ent_id] = self._get_ent_efforts(self.entities[ent_id],
+					                                            resource_ents, effort_outputs)
+					resource_load += ent_efforts[ent_id]
+		
+		change_ids = list(snapshot.change_ids)
+		change_times = list(snapshot.change_times)
+		while True:
+			# find entities that can start changing state (once the appropriate time passes),
+			# only re-evaluating the dependents of entities that have just changed
+			if ids_to_check is None:
+				eligible_ids = self._get_eligible_ids(system_state)
+			else:
+				eligible_ids = [ent_id for ent_id in sorted(ids_to_check)
+				                if self._is_ent_eligible(ent_id, state_bytes)]
+			for ent_id in eligible_ids:
+				ent = self.entities[ent_id]
+				if ent in durations and not is_underway[ent_id]:
+					heapq.heappush(ents_underway, (current_time+durations[ent], ent_id))
+					is_underway[ent_id] = True
+					if effort_outputs is not None and durations[ent] > 0:
+						ent_efforts[ent_id] = self._get_ent_efforts(ent, resource_ents,
+						                                            effort_outputs)
+						resource_load += ent_efforts[ent_id]
+					consumed_durations[ent] = durations.pop(ent)
+			ids_to_check = set()
+			if effort_outputs is not None and (resource_load > resource_limits).any():
+				# resum to rule out rounding left over from changes that have completed
+				resource_load = np.sum(ent_efforts.values(), axis=0)
+			if effort_outputs is not None and (resource_load > resource_limits).any():
+				aborted = (PROGSTATUS.NOT_ENOUGH_RESOURCES, current_time,
+				           resource_ents[np.argmax(resource_load > resource_limits)])
+				break
+			
+			# find entities whose time is up
+			while len(ents_underway) > 0 and ents_underway[0][0] <= current_time:
+				if len(pending_exits) > 0 and pending_exits[0][0] <= current_time:
+					# dependencies expire while the recovery is still underway, which only breaks it
+					# if an entity that has exited is up or has a change underway
+					due_exits = [(exit_time, ent_id) for exit_time, ent_id in pending_exits
+					             if exit_time <= current_time]
+					breaking_exits = [(exit_time, ent_id) for exit_time, ent_id in due_exits
+					                  if state_bytes[ent_id] == 1 or is_underway[ent_id]]
+					if len(breaking_exits) > 0:
+						broken_exit = (breaking_exits[0][0], self.entities[breaking_exits[0][1]])
+						self._expire_ents([ent_id for exit_time, ent_id in due_exits], state_bytes)
+						break
+				unused_time, ent_id = heapq.heappop(ents_underway)
+				is_underway[ent_id] = False
+				if effort_outputs is not None and ent_id in ent_efforts:
+					resource_load -= ent_efforts.pop(ent_id)
+				state_bytes[ent_id] = 1-state_bytes[ent_id] #toggle state element
+				has_changed[ent_id] = True
+				change_ids.append(ent_id)
+				change_times.append(current_time)
+				ids_to_check.add(ent_id)
+				ids_to_check.update(self._get_dependent_ids(ent_id))
+			if broken_exit is not None:
+				break
+			
+			if len(ids_to_check) > 0:
+				# don't update time until no more changes happen at the current time
+				if stop_at >= 0 and current_time >= stop_at:
+					break
+			elif len(ents_underway) == 0:
+				break
+			else:
+				current_time = ents_underway[0][0]
+				# all changes so far happened by the deadlines that time is passing
+				while len(pending_deadlines) > 0 and pending_deadlines[0][0] < current_time:
+					deadline, ent_id = pending_deadlines.pop(0)
+					if not has_changed[ent_id]:
+						aborted = (PROGSTATUS.NOT_ENOUGH_TIME, deadline, self.entities[ent_id])
+						break
+				if aborted is not None:
+					break
+				if stop_at >= 0 and current_time > stop_at:
+					break
+		
+		snapshot.system_state = system_state.tolist()
+		snapshot.current_time = current_time
+		snapshot.underway_times = [completion_time for completion_time, ent_id in ents_underway]
+		snapshot.underway_ids = [ent_id for completion_time, ent_id in ents_underway]
+		snapshot.consumed_durations = dict((self.entity_lookup[ent], duration) 
+		                                   for ent, duration in consumed_durations.items())
+		snapshot.ids_to_check = sorted(ids_to_check)
+		snapshot.change_ids = change_ids
+		snapshot.change_times = change_times
+		snapshot.broken_exit = broken_exit
+		return broken_exit, aborted
+		
+	def _get_ent_efforts(self, ent, resource_ents, effort_outputs):
+		"""
+		Get the units of each resource an entity requires to change state.
 		
-		Keyword arguments:
-		verbose -- activate throwing errors with descriptive messages (default False)
+		Arguments:
+		ent -- entity name
+		resource_ents -- the resource entities
+		effort_outputs -- number of units of a resource dependency an entity requires
 		
 		Return values:
-		True -- if the states are ready
-		False -- otherwise
+		units of each resource in resource_ents (numpy array)
 		"""
-		return self.valid_internal_states(self.current_internal_states, verbose)
+		ent_efforts = np.zeros(len(resource_ents))
+		for k, resource_ent in enumerate(resource_ents):
+			if resource_ent != ent and resource_ent in self.dependencies[ent]:
+				ent_efforts[k] = effort_outputs[ent][resource_ent]
+		return ent_efforts
 		
-	def rlzd_time_ready(self, verbose=False):
+	def _can_solve_analytically(self, realized_exits):
 		"""
-		Check that the realized time lines are ready for analysis.
+		Check if a progression can be solved without simulating it, which needs every resultant
+		state to only go from 0 to 1 as dependencies come up, and no dependency to exit.
 		
-		Keyword arguments:
-		verbose -- activate throwing errors with descriptive messages (default False)
+		Arguments:
+		realized_exits -- amount of time an internal dependency of an entity is available
 		
 		Return values:
-		True -- if the time lines are ready
+		True -- if _build_progression_analytic gives the progression
 		False -- otherwise
 		"""
-		return self.valid_realized_timelines(self.realized_timelines, verbose)
+		if not self.monotone.all():
+			return False
+		for ent in realized_exits.keys():
+			if realized_exits[ent] >= 0:
+				return False
+		return True
 		
-	def rlzd_ex_ready(self, verbose=False):
+	def _build_progression_analytic(self, _system_state, realized_timelines):
 		"""
-		Check that the realized exits are ready for analysis.
+		Builds the same lists of entity changes, times the changes occur, and the system state after
+		the changes as _build_progression, by solving for the earliest time each entity can change
+		rather than simulating the progression. Only applies when every resultant state only goes
+		from 0 to 1 as dependencies come up.
 		
-		Keyword arguments:
-		verbose -- activate throwing errors with descriptive messages (default False)
+		Arguments:
+		_system_state -- state of all entities
+		realized_timelines -- time it takes for an entity's state to change once it's dependencies
+		                      are met
 		
 		Return values:
-		True -- if the exits are ready
-		False -- otherwise
+		dep_changes -- entity state changes (list)
+		dep_change_timing -- times when changes occur (list)
+		system_state -- system state after changes (list)
 		"""
-		return  self._valid_realized_exits(self.realized_exits, verbose)
+		system_state = [int(state) for state in _system_state]
+		keys, unused_trigger_keys = self._get_earliest_keys(system_state, realized_timelines)
+		changes = sorted((keys[ent_id], ent_id) for ent_id in range(len(self.entities))
+		                 if system_state[ent_id] == 0 and keys[ent_id][0] < float('inf'))
+		dep_changes = []
+		dep_change_timing = []
+		for key, ent_id in changes:
+			system_state[ent_id] = 1
+			dep_changes.append(self.entities[ent_id])
+			dep_change_timing.append(key[0])
+		return dep_changes, dep_change_timing, system_state
 		
-	def eff_ready(self, verbose=False):
+	def _get_earliest_keys(self, system_state, realized_timelines):
 		"""
-		Check that the efforts are ready for analysis.
+		Solve for the earliest time each entity is up, when every resultant state only goes from 0
+		to 1 as dependencies come up.
 		
-		Keyword arguments:
-		verbose -- activate throwing errors with descriptive messages (default False)
+		Each change is keyed by its time and by the round of changes at that time it falls in, as in
+		_run_progression: changes that were set off at an earlier time come in the first round, and
+		changes that take no time come in the round after the one that set them off. An entity is
+		set off by the earliest key at which enough of its dependencies are up, so the keys are
+		solved component by component of the dependency graph, iterating to a fixed point within
+		cycles.
+		
+		Arguments:
+		system_state -- state of all entities
+		realized_timelines -- time it takes for an entity's state to change once it's dependencies
+		                      are met
 		
 		Return values:
-		True -- if the efforts are ready
-		False -- otherwise
+		keys -- time and round each entity is up by (list of tuples; (0.0, 0) if already up, 
+		        infinite time if never)
+		trigger_keys -- time and round each entity's change is set off by (list of tuples; 
+		                infinite time if it does not change)
 		"""
-		return self.valid_efforts(self.efforts, verbose)
+		never = (float('inf'), 0)
+		keys = [(0.0, 0) if state == 1 else never for state in system_state]
+		trigger_keys = [never for state in system_state]
+		self._solve_earliest_keys(keys, trigger_keys, system_state, realized_timelines, 
+		                          self.dependency_components, self._get_kernel_lists())
+		return keys, trigger_keys
 		
-	def deads_ready(self, verbose=False):
+	def _get_kernel_lists(self):
 		"""
-		Check if deadlines are ready.
-		
-		Keyword arguments:
-		verbose -- activate throwing errors with descriptive messages (default False)
-		
 		Return values:
-		True -- if deadlines are ready
-		False -- otherwise
+		the dependency, resultant state and BDD kernel as lists, which are faster to index one
+		element at a time than the arrays (dep_ids, dep_weights, dep_ptr, res_sts_flat, res_sts_ptr,
+		bdd_vars, bdd_lows, bdd_highs, bdd_roots)
 		"""
-		return self.valid_deadlines(self.deadlines, verbose)
+		return (self.dep_ids.tolist(), self.dep_weights.tolist(), self.dep_ptr.tolist(), 
+		        self.res_sts_flat.tolist(), self.res_sts_ptr.tolist(), self.bdd_vars.tolist(),
+		        self.bdd_lows.tolist(), self.bdd_highs.tolist(), self.bdd_roots.tolist())
 		
-	def ready(self, verbose=False):
+	def _solve_earliest_keys(self, keys, trigger_keys, system_state, realized_timelines, components,
+	                         kernel_lists):
 		"""
-		Check that the scenario model is ready for analysis.
+		Solve for the keys of the entities in the given components, in place, with the keys of all
+		other entities already solved.
 		
-		Keyword arguments:
-		verbose -- activate throwing errors with descriptive messages (default False)
+		Arguments:
+		keys -- time and round each entity is up by; (0.0, 0) if already up, and infinite time for
+		        the entities to solve otherwise
+		trigger_keys -- time and round each entity's change is set off by
+		system_state -- state of all entities
+		realized_timelines -- time it takes for an entity's state to change once it's dependencies
+		                      are met
+		components -- components of the dependency graph to solve, dependencies first
+		kernel_lists -- the kernel from _get_kernel_lists
+		"""
+		never = (float('inf'), 0)
+		(dep_ids, dep_weights, dep_ptr, res_sts_flat, res_sts_ptr, bdd_vars, bdd_lows, bdd_highs,
+		 bdd_roots) = kernel_lists
+		
+		def _get_trigger_key(ent_id):
+			"""
+			Find the time and round in which an entity's change is set off, given the keys of its
+			dependencies, by bringing them up in the order of their keys (infinite time if never).
+			"""
+			if self.gate_trees[ent_id] is not None:
+				return _get_gate_trigger_key(self.gate_trees[ent_id], ent_id)
+			if bdd_roots[ent_id] >= 0:
+				return _get_bdd_trigger_key(ent_id)
+			state_id = 0
+			dep_keys = []
+			for k in range(dep_ptr[ent_id], dep_ptr[ent_id+1]):
+				dep_key = keys[dep_ids[k]]
+				if dep_ids[k] == ent_id or dep_key == (0.0, 0):
+					# an internal dependency can change along with the entity
+					state_id += dep_weights[k]
+				elif dep_key != never:
+					dep_keys.append((dep_key, dep_weights[k]))
+			dep_keys.sort()
+			table_start = res_sts_ptr[ent_id]
+			key = (0.0, 0)
+			for k in range(len(dep_keys)+1):
+				if k > 0:
+					key = dep_keys[k-1][0]
+					state_id += dep_keys[k-1][1]
+					if k < len(dep_keys) and dep_keys[k][0] == key:
+						continue  # bring up all dependencies with the same key together
+				if res_sts_flat[table_start + state_id] == 1:
+					return key
+			return never
+		
+		def _get_bdd_trigger_key(ent_id):
+			"""
+			Find the time and round in which an entity's change is set off, given the keys of its
+			dependencies, by bringing them up in the order of their keys and stepping down its BDD
+			(infinite time if never).
+			"""
+			up_ids = set()
+			dep_keys = []
+			for dep_id in dep_ids[dep_ptr[ent_id]:dep_ptr[ent_id+1]]:
+				dep_key = keys[dep_id]
+				if dep_id == ent_id or dep_key == (0.0, 0):
+					up_ids.add(dep_id)  # an internal dependency can change along with the entity
+				elif dep_key != never:
+					dep_keys.append((dep_key, dep_id))
+			dep_keys.sort()
+			key = (0.0, 0)
+			for k in range(len(dep_keys)+1):
+				if k > 0:
+					key = dep_keys[k-1][0]
+					up_ids.add(dep_keys[k-1][1])
+					if k < len(dep_keys) and dep_keys[k][0] == key:
+						continue  # bring up all dependencies with the same key together
+				node = bdd_roots[ent_id]
+				while node > 1:
+					node = bdd_highs[node] if bdd_vars[node] in up_ids else bdd_lows[node]
+				if node == 1:
+					return key
+			return never
+		
+		def _get_gate_trigger_key(tree, ent_id):
+			"""
+			Find the time and round in which a gate tree of an entity comes up, given the keys of
+			its inputs, by bringing them up in the order of their keys (infinite time if never).
+			"""
+			threshold, inputs = tree
+			total = 0.0
+			input_keys = []
+			for weight, ref in inputs:
+				if isinstance(ref, tuple):
+					input_key = _get_gate_trigger_key(ref, ent_id)
+				elif ref == ent_id:
+					input_key = (0.0, 0)  # an internal dependency can change along with the entity
+				else:
+					input_key = keys[ref]
+				if input_key == (0.0, 0):
+					total += weight
+				elif input_key != never:
+					input_keys.append((input_key, weight))
+			if total >= threshold - GATE_TOLERANCE:
+				return (0.0, 0)
+			input_keys.sort()
+			for input_key, weight in input_keys:
+				total += weight
+				if total >= threshold - GATE_TOLERANCE:
+					return input_key
+			return never
+		
+		for component in components:
+			ids_to_solve = [ent_id for ent_id in component
+			                if system_state[ent_id] == 0 and
+			                self.entities[ent_id] in realized_timelines]
+			# keys only come down as the keys they depend on come down, so iterate within cycles
+			# until no more come down, checking only the entities whose dependencies came down
+			in_component = set(component)
+			while len(ids_to_solve) > 0:
+				changed_ids = []
+				for ent_id in ids_to_solve:
+					trigger_key = _get_trigger_key(ent_id)
+					duration = realized_timelines[self.entities[ent_id]]
+					if trigger_key == never:
+						key = never
+					elif duration == 0:
+						key = (trigger_key[0], trigger_key[1]+1)
+					else:
+						key = (trigger_key[0]+duration, 1)
+					if key < keys[ent_id]:
+						keys[ent_id] = key
+						trigger_keys[ent_id] = trigger_key
+						changed_ids.append(ent_id)
+				if len(component) == 1:
+					break
+				ids_to_solve = sorted(set(dependent_id for changed_id in changed_ids
+				                          for dependent_id in self._get_dependent_ids(changed_id)
+				                          if dependent_id in in_component and
+				                          system_state[dependent_id] == 0 and
+				                          self.entities[dependent_id] in realized_timelines))
+		
+	def get_latest_times(self, system_state, realized_timelines, deadlines):
+		"""
+		Computes the earliest and the latest time each entity can be up without any entity missing
+		its deadline, and the slack between them, with one backward pass over the earliest times.
+		Only applies when every resultant state only goes from 0 to 1 as dependencies come up.
+		
+		An entity must be up by the deadline it has, and by the latest time each dependent it was up
+		for when the dependent was set off has to be set off by. So any one entity can come up as
+		late as its latest time without a deadline being missed, as long as all deadlines are met at
+		the earliest times. Entities holding no dependent up have no latest time (infinite).
+		
+		Arguments:
+		system_state -- state of all entities
+		realized_timelines -- time it takes for an entity's state to change once it's dependencies
+		                      are met
+		deadlines -- the time that entities must be active by
+		
+		Exceptions:
+		ValueError -- raised when a resultant state can go from 1 to 0 as a dependency comes up
 		
 		Return values:
-		True -- if the scenario model is ready
-		False -- otherwise
-		"""
-		if (self.cur_int_st_ready(verbose) and self.rlzd_time_ready(verbose)
-    		and self.rlzd_ex_ready(verbose) and self.eff_ready(verbose) and self.deads_ready(verbose)):
-			return True
-		return False
+		earliest_times -- earliest time each entity is up, in the order of self.entities (numpy
+		                  array; infinite if never)
+		latest_times -- latest time each entity can be up (numpy array; infinite if any time will
+		                do)
+		slack -- latest_times less earliest_times (numpy array; infinite for entities with no
+		         latest time)
+		"""
+		if not self.monotone.all():
+			raise ValueError('resultant states must not go from 1 to 0 as dependencies come up')
+		system_state = [int(state) for state in system_state]
+		keys, trigger_keys = self._get_earliest_keys(system_state, realized_timelines)
+		n_ent = len(self.entities)
+		earliest_times = np.array([key[0] for key in keys])
+		latest_times = np.full(n_ent, np.inf)
+		for ent in deadlines.keys():
+			latest_times[self.entity_lookup[ent]] = deadlines[ent]
 		
-	#SETTINGS
-	def set_current_internal_states(self, curr_int_sts, verbose=False):
-	#must be comprised of existing entities with internal dependencies and states equal to 0 or 1
+		# dependents are set off strictly after the dependencies that are up for them, so going back
+		# through the keys finds each dependent's latest time before its dependencies'
+		for unused_key, ent_id in sorted(((keys[ent_id], ent_id) for ent_id in range(n_ent)
+		                                  if trigger_keys[ent_id][0] < np.inf), reverse=True):
+			latest_trigger_time = latest_times[ent_id] - realized_timelines[self.entities[ent_id]]
+			for dep_id in self.dep_ids[self.dep_ptr[ent_id]:self.dep_ptr[ent_id+1]].tolist():
+				if dep_id != ent_id and keys[dep_id] <= trigger_keys[ent_id]:
+					latest_times[dep_id] = min(latest_times[dep_id], latest_trigger_time)
+		
+		slack = np.full(n_ent, np.inf)
+		constrained = latest_times < np.inf
+		slack[constrained] = latest_times[constrained] - earliest_times[constrained]
+		return earliest_times, latest_times, slack
+		
+	def get_completion_bounds(self, system_state, realized_timelines, ents=None):
 		"""
-		Set new internal states.
+		Bound the time entities are up by, ignoring resources and exits. The lower bound is the
+		earliest time the entity can be up, along its critical path. The upper bound has all the
+		changes it can rely on (the changes of the entities it depends on, directly or not) happen
+		one after another.
+		
+		When a resultant state can go from 1 to 0 as a dependency comes up, the bounds are 0 and
+		infinite.
 		
 		Arguments:
-		curr_int_sts -- the new states of entities with internal dependence
+		system_state -- state of all entities
+		realized_timelines -- time it takes for an entity's state to change once it's dependencies
+		                      are met
 		
 		Keyword arguments:
-		verbose -- activate throwing errors with descriptive messages (default False)
+		ents -- entities to bound (default None; all functions)
 		
 		Return values:
-		True -- if the new states are valid and have been copied in
-		False -- otherwise
-		"""
-		#if self.model.are_ents(curr_int_sts.keys()) and self.valid_states(curr_int_sts.values()):
-		#	for ent in curr_int_sts:
-		#		if ent not in self.model.dependencies[ent]:
-		#			return False
-		if self.valid_internal_states(curr_int_sts, verbose):
-			self.current_internal_states = copy.copy(curr_int_sts)
-			return True
-		return False
+		lower_bounds -- lower bound on the time each entity is up by (dict; infinite if never)
+		upper_bounds -- upper bound on the time each entity is up by (dict; infinite if it may never
+		                be)
+		"""
+		system_state = [int(state) for state in system_state]
+		if ents is None:
+			ents = [ent for ent in self.entities if self.ent_types[ent] == ENTTYPE.FUNCTION]
+		lower_bounds = {}
+		upper_bounds = {}
+		if not self.monotone.all():
+			for ent in ents:
+				lower_bounds[ent] = 0.0
+				upper_bounds[ent] = float('inf')
+			return lower_bounds, upper_bounds
+		
+		keys, unused_trigger_keys = self._get_earliest_keys(system_state, realized_timelines)
+		for ent in ents:
+			ent_id = self.entity_lookup[ent]
+			lower_bounds[ent] = keys[ent_id][0]
+			upper_bounds[ent] = self._get_serialized_time(ent_id, system_state, realized_timelines,
+			                                              keys)
+		return lower_bounds, upper_bounds
 		
-	def set_realized_timelines(self, rlzd_times, verbose=False):# must include all ents of model with non-zero time
+	def _get_serialized_time(self, ent_id, system_state, realized_timelines, keys):
 		"""
-		Set new realized time lines.
+		Add up the times of the changes an entity can rely on: its own and those of the entities it
+		depends on, directly or not.
 		
 		Arguments:
-		rlzd_times -- the new time lines of the entities
+		ent_id -- index of the entity in self.entities
+		system_state -- state of all entities
+		realized_timelines -- time it takes for an entity's state to change once it's dependencies
+		                      are met
+		keys -- time and round each entity is up by, from _get_earliest_keys
 		
-		Keyword arguments:
-		verbose -- activate throwing errors with descriptive messages (default False)
+		Return values:
+		the time the entity is up by with the changes one after another (float; 0 if already up,
+		infinite if never)
+		"""
+		if keys[ent_id][0] == 0.0 or keys[ent_id][0] == float('inf'):
+			return keys[ent_id][0]
+		serialized_time = 0.0
+		have_checked = set([ent_id])
+		ids_to_check = [ent_id]
+		while len(ids_to_check) > 0:
+			check_id = ids_to_check.pop()
+			if system_state[check_id] == 0 and keys[check_id][0] < float('inf'):
+				serialized_time += realized_timelines[self.entities[check_id]]
+			for dep_id in self.dependencies_lookup[self.entities[check_id]]:
+				if dep_id not in have_checked:
+					have_checked.add(dep_id)
+					ids_to_check.append(dep_id)
+		return serialized_time
+		
+	def screen_scenario(self, scenario):
+		"""
+		Classify a scenario as feasible or infeasible from bounds on when its deadlines are met,
+		leaving the scenarios the bounds cannot settle to be progressed.
+		
+		A scenario is infeasible if an entity cannot be up by its deadline even along its critical
+		path. It is feasible if every entity is up by its deadline even with its changes one after
+		another, no dependency exits before then, and there are enough of each resource for all the
+		changes at once.
+		
+		Arguments:
+		scenario -- GMORScenarioModel to screen
+		
+		Exceptions:
+		ValueError -- raised when GMORScenarioModel is not ready for analysis
 		
 		Return values:
-		True -- if the new time lines are valid and have been copied in
-		False -- otherwise
+		the SCREENSTATUS of the scenario
 		"""
-		#if self.model.are_ents(rlzd_times.keys()) and is_all_non_neg(rlzd_times.values()):
-		#	for ent in self.model.entities:
-		#		if ent not in rlzd_times.keys():
-		#			return False
-		if self.valid_realized_timelines(rlzd_times, verbose):
-			self.realized_timelines = copy.copy(rlzd_times)
-			return True
-		return False
+		if scenario.ready() == False:
+			raise ValueError('must send in a ready scenario')
+		if not self.monotone.all():
+			return SCREENSTATUS.AMBIGUOUS
+		realized_timelines = scenario.realized_timelines
+		deadlines = scenario.deadlines
+		system_state = self._det_sys_wide_state_pessimistic(scenario.current_internal_states, 
+		                                                     realized_timelines)
+		unused_p_a, ents_for_pa = self._find_pa(system_state)
+		keys, unused_trigger_keys = self._get_earliest_keys(system_state, realized_timelines)
+		
+		# deadlines are met by changing by them, unless already up at p_a
+		ent_ids = [self.entity_lookup[ent] for ent in deadlines.keys() if ent not in ents_for_pa]
+		for ent_id in ent_ids:
+			if keys[ent_id][0] > deadlines[self.entities[ent_id]] or system_state[ent_id] == 1:
+				return SCREENSTATUS.INFEASIBLE
+		for ent_id in ent_ids:
+			if (self._get_serialized_time(ent_id, system_state, realized_timelines, keys) > 
+			    deadlines[self.entities[ent_id]]):
+				return SCREENSTATUS.AMBIGUOUS
+		
+		# changes are over by the time all changes are done one after another
+		change_ids = [ent_id for ent_id in range(len(self.entities))
+		              if system_state[ent_id] == 0 and keys[ent_id][0] < float('inf')]
+		last_change_time = sum(realized_timelines[self.entities[ent_id]] for ent_id in change_ids)
+		for ent in scenario.realized_exits.keys():
+			if 0 <= scenario.realized_exits[ent] <= last_change_time:
+				return SCREENSTATUS.AMBIGUOUS
+		
+		resource_ents = list(self.resource_limits.keys())
+		total_efforts = np.zeros(len(resource_ents))
+		for ent_id in change_ids:
+			total_efforts += self._get_ent_efforts(self.entities[ent_id], resource_ents,
+			                                       scenario.efforts)
+		if (total_efforts > np.array([self.resource_limits[ent] for ent in resource_ents])).any():
+			return SCREENSTATUS.AMBIGUOUS
+		return SCREENSTATUS.FEASIBLE
+		
+	def _expire_ents(self, exit_ids, system_state):
+		"""
+		Take down entities whose internal dependency has exited, and the dependents that can no
+		longer stay up without them.
 		
-	def set_realized_exit_by_ent(self, ent, rlzd_exit, verbose=False):
-		"""
-		Set a new realized exit for an entity.
+		Arguments:
+		exit_ids -- ids of the entities whose internal dependency exits
+		system_state -- states of all entities (bytearray or uint8 numpy array, updated in place)
+		
+		Return values:
+		ids of the dependents taken down (list)
+		"""
+		changed_ids = []
+		for ent_id in exit_ids:
+			if system_state[ent_id] == 1:
+				system_state[ent_id] = 0
+				changed_ids.append(ent_id)
+		dropped_ids = []
+		while len(changed_ids) > 0:
+			changed_id = changed_ids.pop()
+			for ent_id in self._get_dependent_ids(changed_id):
+				if (system_state[ent_id] == 1 and
+				        self._get_ent_resul_st_by_id(ent_id, system_state) == 0):
+					system_state[ent_id] = 0
+					changed_ids.append(ent_id)
+					dropped_ids.append(ent_id)
+		return dropped_ids
+		
+	def _get_resource_allotment(self, dep_changes, dep_timing, realized_timelines, effort_outputs,
+	                            drop_indices=None):
+		"""
+		Calculate the usage of each resource entity by entities with changing states, and find the
+		first resource entity to go over its limit.
 		
 		Arguments:
-		ent -- the entity
-		rlzd_exit -- the new exit for ent
+		dep_changes -- entity state changes
+		dep_timing -- times when changes occur
+		realized_timelines -- time it takes for an entity's state to change once it's dependencies are met
+		effort_outputs -- number of units of a resource dependency an entity requires
 		
 		Keyword arguments:
-		verbose -- activate throwing errors with descriptive messages (default False)
+		drop_indices -- positions in dep_changes of the changes that took entities down on an
+		                observation, which take no time or resources (default None)
 		
 		Return values:
-		True -- if rlzd_exit is valid (entity has an internal dependence
-		        and time is >=0.0 or ==-1) and has been copied in
-		False -- otherwise
+		tracked_resource_use -- a dictionary with resources as keys, each with a list of the
+								amount of the resource in use at the time of each change
+		resource_ent -- the resource that first goes over its limit (None if all are within their
+		                limits)
+		"""
+		if len(dep_changes) == 0 or len(self.resource_limits) == 0:
+			return {}, None
+		resource_ents, resource_use = self._get_resource_use(dep_changes, dep_timing, 
+		                                                     realized_timelines, effort_outputs,
+		                                                     drop_indices)
+		if len(resource_ents) == 0:
+			return {}, None
+		
+		resource_ent = self._find_resource_shortfall(dep_changes, dep_timing, realized_timelines, 
+		                                             effort_outputs, resource_ents, resource_use,
+		                                             drop_indices)
+		tracked_resource_use = {}
+		for k, res_ent in enumerate(resource_ents):
+			tracked_resource_use[res_ent] = resource_use[:, k].tolist()
+		return tracked_resource_use, resource_ent
 		
-		Exceptions:
-		ValueError -- raised when verbose mode on and new exit cannot be set
+	def _find_resource_shortfall(self, dep_changes, dep_timing, realized_timelines, effort_outputs,
+	                             resource_ents, resource_use, drop_indices=None):
 		"""
-		if not self.model.is_ent(ent):
-			if verbose:
-				raise ValueError('Not an entity of the model')
-			return False
-		if ent not in self.model.dependencies[ent]:
-			if verbose:
-				raise ValueError('Not an internally-dependent entity')
-			return False
-		if not (rlzd_exit >= 0.0 or rlzd_exit == -1):
-			if verbose:
-				raise ValueError('Exit must be either -1 or non-negative')
-			return False
-		self.realized_exits[ent] = rlzd_exit
-		return True
+		Find the first resource entity to go over its limit.
+		
+		Arguments:
+		dep_changes -- entity state changes
+		dep_timing -- times when changes occur
+		realized_timelines -- time it takes for an entity's state to change once it's dependencies
+		                      are met
+		effort_outputs -- number of units of a resource dependency an entity requires
+		resource_ents -- the resource entities, in the order of the columns of resource_use
+		resource_use -- the use of each resource at the time of each change
 		
+		Keyword arguments:
+		drop_indices -- positions in dep_changes of the changes that took entities down on an
+		                observation, which take no time or resources (default None)
 		
-	def set_realized_exits(self, rlzd_exits, verbose=False):
-		"""
-		Set new realized exits.
+		Return values:
+		the resource that first goes over its limit (None if all are within their limits)
+		"""
+		limits = np.array([self.resource_limits[ent] for ent in resource_ents])
+		is_over_limit = (resource_use > limits).any(axis=1)
+		drops = set(drop_indices) if drop_indices is not None else set()
+		is_over_limit[list(drops)] = False  # only changes that do work are checked
+		over_limit_changes = np.flatnonzero(is_over_limit)
+		if len(over_limit_changes) == 0:
+			return None
+		
+		# stop at the first change that goes over, and find which resource goes over first
+		j = over_limit_changes[0]
+		current_resource_use = np.zeros(len(resource_ents))
+		change_init_time = dep_timing[j] - realized_timelines[dep_changes[j]]
+		for i, ent_active in enumerate(dep_changes):
+			if i in drops:
+				continue
+			init_time = dep_timing[i] - realized_timelines[ent_active]
+			if (dep_timing[i] == dep_timing[j] or init_time == change_init_time
+			    or (dep_timing[j] < dep_timing[i] and dep_timing[j] > init_time)):
+				for k, resource_ent in enumerate(resource_ents):
+					if resource_ent != ent_active and resource_ent in self.dependencies[ent_active]:
+						current_resource_use[k] += effort_outputs[ent_active][resource_ent]
+						if current_resource_use[k] > limits[k]:
+							return resource_ent
+		
+	def _get_resource_use(self, dep_changes, dep_timing, realized_timelines, effort_outputs,
+	                      drop_indices=None):
+		"""
+		Find how much of each resource entity is in use at the time of each change, from the
+		intervals between when each change was initialized and when it occurred.
+		
+		A change i counts towards the use at change j if both occur at the same time, both were
+		initialized at the same time, or change j occurs strictly within the interval of change i.
+		The efforts are added up in the order of the changes, as adding them up in another order
+		can round them differently and so change which changes go over a limit. Efforts in whole
+		units add up the same in any order, so then the intervals are swept over instead (see
+		_sweep_resource_use).
 		
 		Arguments:
-		rlzd_exits -- the new exits of the entities
+		dep_changes -- entity state changes
+		dep_timing -- times when changes occur
+		realized_timelines -- time it takes for an entity's state to change once it's dependencies
+		                      are met
+		effort_outputs -- number of units of a resource dependency an entity requires
 		
 		Keyword arguments:
-		verbose -- activate throwing errors with descriptive messages (default False)
+		drop_indices -- positions in dep_changes of the changes that took entities down on an
+		                observation, which take no time or resources (default None)
 		
 		Return values:
-		True -- if the new exits are valid and have been copied in
-		False -- otherwise
+		resource_ents -- the resource entities, in the order of the columns of resource_use (list)
+		resource_use -- the use of each resource at the time of each change (numpy array)
+		"""
+		resource_ents = list(self.resource_limits.keys())
+		n_changes = len(dep_changes)
+		
+		# per-resource usage of each change
+		efforts = np.zeros((n_changes, len(resource_ents)))
+		for i, ent in enumerate(dep_changes):
+			ent_deps = set(self.dependencies[ent])
+			for k, resource_ent in enumerate(resource_ents):
+				if resource_ent != ent and resource_ent in ent_deps:
+					efforts[i, k] = effort_outputs[ent][resource_ent]
+		
+		# find out when the changes were initialized
+		ends = np.array(dep_timing, dtype=float)
+		starts = ends - np.array([realized_timelines[ent] for ent in dep_changes], dtype=float)
+		if drop_indices is not None and len(drop_indices) > 0:
+			efforts[drop_indices] = 0.0
+			starts[drop_indices] = ends[drop_indices]
+		
+		if (efforts == np.floor(efforts)).all() and efforts.sum() < 2**53:
+			return resource_ents, self._sweep_resource_use(starts, ends, efforts)
+		resource_use = np.zeros((n_changes, len(resource_ents)))
+		for i in np.flatnonzero(efforts.any(axis=1)):
+			in_use = ((ends == ends[i]) | (starts == starts[i]) |
+			          ((ends < ends[i]) & (ends > starts[i])))
+			resource_use[in_use] += efforts[i]
+		return resource_ents, resource_use
+		
+	def _sweep_resource_use(self, starts, ends, efforts):
+		"""
+		Sweep over the intervals between when each change was initialized and when it occurred to
+		find how much of each resource entity is in use at the time of each change (see
+		_get_resource_use), with cumulative sums of the efforts.
+		
+		Arguments:
+		starts -- times when the changes were initialized (numpy array)
+		ends -- times when the changes occur (numpy array)
+		efforts -- the use of each resource by each change, one row per change (numpy array)
+		
+		Return values:
+		resource_use -- the use of each resource at the time of each change (numpy array)
 		"""
-		if self._valid_realized_exits(rlzd_exits, verbose):
-			self.realized_exits = copy.copy(rlzd_exits)
-			return True
-		return False
+		n_changes, n_resources = efforts.shape
 		
-	def set_effort_by_resource(self, efforts, resource, verbose=False):
+		def _cumulative(order):
+			"""
+			Cumulative efforts of the changes in the given order, starting with a row of zeros.
+			"""
+			cum_efforts = np.zeros((n_changes+1, n_resources))
+			np.cumsum(efforts[order], axis=0, out=cum_efforts[1:])
+			return cum_efforts
+		
+		def _group_sums(group_ids):
+			"""
+			Total efforts of the changes sharing each change's group.
+			"""
+			sums = np.zeros((group_ids.max()+1, n_resources))
+			np.add.at(sums, group_ids, efforts)
+			return sums[group_ids]
+		
+		start_vals, start_ids = np.unique(starts, return_inverse=True)
+		end_vals, end_ids = np.unique(ends, return_inverse=True)
+		pair_ids = np.unique(start_ids*len(end_vals) + end_ids, return_inverse=True)[1]
+		
+		# changes at the same time, initialized at the same time, or both
+		resource_use = _group_sums(end_ids) + _group_sums(start_ids) - _group_sums(pair_ids)
+		
+		# changes i with starts[i] < ends[j] < ends[i], from the efforts started before ends[j]
+		# less the efforts of those that ended by ends[j] (only zero duration changes at ends[j]
+		# end by ends[j] without starting before it)
+		start_order = np.argsort(starts, kind='mergesort')
+		end_order = np.argsort(ends, kind='mergesort')
+		started = _cumulative(start_order)[np.searchsorted(starts[start_order], ends, 'left')]
+		ended = _cumulative(end_order)[np.searchsorted(ends[end_order], ends, 'right')]
+		zero_duration = np.zeros((len(end_vals), n_resources))
+		np.add.at(zero_duration, end_ids[starts == ends], efforts[starts == ends])
+		resource_use += started - ended + zero_duration[end_ids]
+		
+		# do not count twice those initialized at the same time that occur strictly later
+		pair_keys = start_ids*(len(end_vals)+1) + end_ids
+		pair_order = np.argsort(pair_keys, kind='mergesort')
+		sorted_keys = pair_keys[pair_order]
+		cum_pairs = _cumulative(pair_order)
+		later_keys = start_ids*(len(end_vals)+1) + len(end_vals)
+		same_start_later = cum_pairs[np.searchsorted(sorted_keys, later_keys, 'right')] - \
+		                   cum_pairs[np.searchsorted(sorted_keys, pair_keys, 'right')]
+		resource_use -= same_start_later*(starts < ends)[:, np.newaxis]
+		return resource_use
+		
+	def _find_pa(self, system_state):
 		"""
-		Set new efforts corresponding to a resource for entities dependent on the resource.
+		Calculate system level performance with current system state.
 		
 		Arguments:
-		efforts -- the new efforts corresponding to resource
-		resource -- the shared resource dependency of the affected entities
-		
-		Keyword arguments:
-		verbose -- activate throwing errors with descriptive messages (default False)
+		system_state -- state of all entities
 		
 		Return values:
-		True -- if the new efforts are valid (resource is a dependency of each entity in efforts,
-		        each new effort is non-negative, and none of the entities in efforts
-				are the same entity as resource) and have been copied in
-		False -- otherwise
-		
-		Exceptions:
-		ValueError -- raised when verbose mode on and new efforts cannot be set
+		p_a -- performance a, the system level performance (float)
+		ents_for_pa -- entities contributing to p_a (list)
 		"""
-		if not self.model.are_ents(efforts.keys()):
-			if verbose:
-				raise ValueError('Not all entities of the model')
-			return False
-		if not self.model.is_ent(resource):
-			if verbose:
-				raise ValueError('Resource not an entity of the model')
-			return False
-		if not self.model.ent_types[resource] == ENTTYPE.RESOURCE:
-			if verbose:
-				raise ValueError('Efforts for a non-resource entity')
-			return False
-		for ent in efforts.keys():
-			if not self.model.is_dep(ent, resource):
-				if verbose:
-					raise ValueError('Entity does not depend on resource')
-				return False
-			if efforts[ent] < 0.0:
-				if verbose:
-					raise ValueError('Negative effort invalid')
-				return False
-			if ent == resource:
-				if verbose:
-					raise ValueError('Entity in efforts and resource cannot be the same')
-				return False
-			self.efforts[ent][resource] = efforts[ent]
-		return True
-	
-	def set_deadlines(self, deadlines, verbose=False):
+		n_ent = len(self.entities)
+		ents_for_pa = []
+		p_a = 0.0
+		for i in range(n_ent):
+			ent = self.entities[i]
+			if ent in self.op_performance_levels.keys():
+				if system_state[i] == 1:
+					p_a += self.op_performance_levels[ent]
+					ents_for_pa.append(ent)
+		return p_a, ents_for_pa
+		
+	##
+	## ASSESS
+	##
+	def run_progression(self, scenario, early_abort=False):
 		"""
-		Set new deadlines.
+		Progress the system based on scenario conditions, reporting infeasible outcomes in the
+		result rather than raising.
 		
 		Arguments:
-		deadlines -- the new deadlines
+		scenario -- GMORScenarioModel progression will be based on
 		
 		Keyword arguments:
-		verbose -- activate throwing errors with descriptive messages (default False)
-		
-		Return values:
-		True -- if deadlines copied in
-		False -- if deadlines are empty, keys of deadlines are not entities,
-		         or values are not all non-negative
+		early_abort -- stop progressing as soon as a deadline is missed or a resource limit is
+		               exceeded, leaving a partial progression in the result (default False)
 		
 		Exceptions:
-		ValueError -- raised when verbose mode on and new deadlines are invalid
+		ValueError -- raised when GMORScenarioModel is not ready for analysis
+		
+		Return values:
+		result -- the progression and the first check it failed, if any (ProgressionResult)
 		"""
-			
-		if self.valid_deadlines(deadlines, verbose):
-			self.deadlines = copy.copy(deadlines)
-			return True
-		return False
+		if scenario.ready() == False:
+			raise ValueError('must send in a ready scenario')
+		return self._run_scenario(scenario, scenario.deadlines, early_abort)[0]
 		
-	def set_new_scen_model(self, model):
+	def _run_scenario(self, scenario, deadlines, early_abort=False):
 		"""
-		Set new scenario model with a different GMORModel.
+		Progress the system based on scenario conditions, checking the given deadlines in place of
+		those of the scenario.
 		
 		Arguments:
-		model -- new GMORModel, possibly with some same entities and dependencies
+		scenario -- GMORScenarioModel progression will be based on
+		deadlines -- for functions in the scenario, the time that the entity must be active by
+		
+		Keyword arguments:
+		early_abort -- stop progressing as soon as a deadline is missed or a resource limit is
+		               exceeded (default False)
 		
 		Return values:
-		True -- if model is ready for analysis
-		False -- otherwise
+		result -- the progression and the first check it failed, if any (ProgressionResult)
+		ents_for_pa -- entities contributing to p_a (list)
 		"""
-		if model.ready():
-			#current_internal_states
-			new_curr_int_states = {}
-			for ent in model.entities:
-				if ent in model.dependencies[ent]:
-					if ent in self.current_internal_states.keys():
-						new_curr_int_states[ent] = self.current_internal_states[ent]  # save internal state for ent
-					else:
-						new_curr_int_states[ent] = 1
-				
-			#realized_timelines
-			new_realized_timelines = {}
-			for ent in model.entities:
-				if ent in self.realized_timelines.keys():
-					new_realized_timelines[ent] = self.realized_timelines[ent]  # save time line for ent
-				else:
-					new_realized_timelines[ent] = 0.0
-			
-			#realized_exits
-			new_realized_exits = {}
-			for ent in model.entities:
-				if ent in model.dependencies[ent]:
-					if ent in self.realized_exits.keys():
-						new_realized_exits[ent] = self.realized_exits[ent]  # save exit for ent
-					else:
-						new_realized_exits[ent] = -1
-			
-			#efforts
-			new_efforts = {}
-			for ent in model.entities:
-				if model.ent_types[ent] != ENTTYPE.RESOURCE:
-					for dep in model.dependencies[ent]:
-						if model.ent_types[dep] == ENTTYPE.RESOURCE:
-							if new_efforts.has_key(ent) == False:
-								new_efforts[ent] = {}
-							if self.efforts.has_key(ent) and self.efforts[ent].has_key(dep):
-								new_efforts[ent][dep] = self.efforts[ent][dep]  # save effort for ent
-							else:
-								new_efforts[ent][dep] = 0
-								
-			new_deadlines = {}
-			for ent in model.entities:
-				if model.ent_types[ent] == ENTTYPE.FUNCTION:
-					if ent in self.deadlines.keys():
-						new_deadlines[ent] = self.deadlines[ent]  # save deadline for ent
-					else:
-						new_deadlines[ent] = 0.0
-			
-			self.model = model
-			self.set_current_internal_states(new_curr_int_states)
-			self.set_realized_exits(new_realized_exits)
-			self.set_realized_timelines(new_realized_timelines)
-			self.efforts = copy.copy(new_efforts)
-			self.set_deadlines(new_deadlines)
-			#self.reset(model)
-			
-			return True
-		return False
-
-
-class GMORRunner(object):#(GMORModel):
-	"""
-	Calculate and demonstrate implications of initial conditions set by scenario model.
-
-    Public methods:
-    do_progression, plot_performance_curve, check_changes_timing, deterministic_progression,
-    next_deadline, get_deps_to_do, max_timing_progression, 
-
-    Instance variables:
-    entities, ent_types, dependencies, resultant_states, resource_limits,
-    op_performance_levels, entity_lookup, dependencies_lookup
-	"""
-	def __init__(self, model):
+		current_internal_states = scenario.current_internal_states
+		realized_timelines = scenario.realized_timelines
+		realized_exits = scenario.realized_exits
+		effort_outputs = scenario.efforts
+		
+		##
+		## Establish p_a
+		##
+		# ASSUMPTION: Start in the worst possible state given the internal state infor provided
+		#(cannnot assume enough time has passed for any benefits of these states to have propagated)
+		system_state = self._det_sys_wide_state_pessimistic(current_internal_states, 
+                                                      realized_timelines)
+		return self._progress_from_state(system_state, realized_timelines, realized_exits, 
+		                                 effort_outputs, deadlines, early_abort)
+		
+	def _progress_from_state(self, system_state, realized_timelines, realized_exits, effort_outputs,
+	                         deadlines, early_abort=False):
 		"""
-		Constructs a runner for a given GMORModel.
+		Progress the system from a worst possible system state and check the progression.
 		
 		Arguments:
-		model -- the GMORModel the runner is based on
+		system_state -- worst possible system state
+		realized_timelines -- time it takes for an entity's state to change once it's dependencies
+		                      are met
+		realized_exits -- amount of time an internal dependency of an entity is available
+		effort_outputs -- number of units of a resource dependency an entity requires
+		deadlines -- for functions in the scenario, the time that the entity must be active by
 		
-		Exceptions:
-		ValueError -- raised when model is not ready for analysis
+		Keyword arguments:
+		early_abort -- stop progressing as soon as a deadline is missed or a resource limit is
+		               exceeded (default False)
+		
+		Return values:
+		result -- the progression and the first check it failed, if any (ProgressionResult)
+		ents_for_pa -- entities contributing to p_a (list)
 		"""
-		if model.ready() is False:
-			raise ValueError('must send in a ready model')
-
-		self.entities = model.entities
-		self.ent_types = model.ent_types
-		self.dependencies = model.dependencies
-		self.resultant_states = model.resultant_states
-		self.resource_limits = model.resource_limits
-		self.op_performance_levels = model.op_performance_levels
-
-		self.entity_lookup = {}
-		self.dependencies_lookup = {}
-
-		def _build_entity_lookup():
-			"""
-			Creates a dictionary with entity names as keys and entity indices from self.entities as values.
-			"""
-			self.entity_lookup = {}
-			i = 0
-			for ent in self.entities:
-				self.entity_lookup[ent] = i
-				i += 1
-
-
-		def _build_entity_dep_lookup():
-			"""
-			Creates a dictionary with entity names as keys and lists of dependency indices as values.
-			"""
-			self.dependencies_lookup = {}
-			for ent in self.entities:
-				self.dependencies_lookup[ent] = []
-				for dep in self.dependencies[ent]:
-					self.dependencies_lookup[ent].append(self.entity_lookup[dep])
+		p_a, ents_for_pa = self._find_pa(system_state)
 
-		_build_entity_lookup()
-		_build_entity_dep_lookup()
-		#self._buildSystemResultantStates()
+		# check that all completed before a dependency expired - like fuel refills.
+		# (negative exits never happen)
+		if not early_abort and self._can_solve_analytically(realized_exits):
+			dep_changes, dep_timing, unused_state = \
+				self._build_progression_analytic(system_state, realized_timelines)
+			change_ids = [self.entity_lookup[ent] for ent in dep_changes]
+			broken_exit = aborted = None
+		else:
+			snapshot = self._new_snapshot(system_state)
+			if early_abort:
+				broken_exit, aborted = self._run_events(snapshot, realized_timelines,
+				                                        realized_exits=realized_exits,
+				                                        deadlines=deadlines,
+				                                        effort_outputs=effort_outputs)
+			else:
+				broken_exit, aborted = self._run_events(snapshot, realized_timelines, 
+				                                        realized_exits=realized_exits)
+			change_ids, dep_timing = snapshot.change_ids, snapshot.change_times
+		result = ProgressionResult(self.entities, p_a, change_ids, dep_timing, system_state)
+		if broken_exit is not None:
+			return self._check_broken_progression(result, ents_for_pa, deadlines, broken_exit,
+			                                      snapshot.current_time), ents_for_pa
+		if aborted is not None:
+			result.status, unused_time, failed_ent = aborted
+			if result.status == PROGSTATUS.NOT_ENOUGH_TIME:
+				result.failed_deadline = failed_ent
+			else:
+				result.failed_resource = failed_ent
+			return result, ents_for_pa
+		return self._check_progression(result, ents_for_pa, realized_timelines, effort_outputs,
+		                               deadlines), ents_for_pa
 		
-	##
-	## LOGIC
-	##
-	def _get_ent_resul_st_from_sys_st(self, ent, system_state):
+	def _check_broken_progression(self, result, ents_for_pa, deadlines, broken_exit, break_time,
+	                              drop_indices=None):
 		"""
-		Evaluate entity resultant state from system state.
+		Record the first check failed by a progression that a dependency exit has halted: a deadline
+		that passed before the progression halted, or else the exit.
 		
 		Arguments:
-		ent -- entity to be evaluated
-		system_state -- states of all entities
+		result -- the progression up to where it halted (ProgressionResult)
+		ents_for_pa -- entities contributing to p_a
+		deadlines -- for functions in the scenario, the time that the entity must be active by
+		broken_exit -- time and entity of the exit that left recovery incomplete (tuple)
+		break_time -- the time the progression halted at; all the changes before then are in result
+		
+		Keyword arguments:
+		drop_indices -- positions in the changes of those that took entities down on an observation
+		                (default None)
 		
 		Return values:
-		resultant state of ent (either 0 or 1)
+		result -- the same result (ProgressionResult)
+		"""
+		passed_deadlines = dict((ent, deadline) for ent, deadline in deadlines.items() 
+		                        if deadline < break_time)
+		missed_deadline = self._find_missed_deadline(ents_for_pa, result.dep_changes,
+		                                             result.dep_timing, passed_deadlines,
+		                                             drop_indices)
+		if missed_deadline is not None:
+			result.status = PROGSTATUS.NOT_ENOUGH_TIME
+			result.failed_deadline = missed_deadline
+		else:
+			result.status = PROGSTATUS.DEPENDENCY_EXIT
+			result.failed_exit = broken_exit
+		return result
+		
+	def _check_progression(self, result, ents_for_pa, realized_timelines, effort_outputs, deadlines,
+	                       drop_indices=None):
 		"""
-		entity_state = self._get_ent_dep_sts_from_sys_st(ent, system_state)
-		entity_state_id = get_dec_from_bin_arr(entity_state)  # ID of entity resultant state
-		return self.resultant_states[ent][entity_state_id]
+		Check that a progression meets deadlines and resource limits, recording the first check it
+		fails in the result.
 		
-	def _get_ent_dep_sts_from_sys_st(self, ent, system_state):
+		Arguments:
+		result -- the progression (ProgressionResult)
+		ents_for_pa -- entities contributing to p_a
+		realized_timelines -- time it takes for an entity's state to change once it's dependencies
+		                      are met
+		effort_outputs -- number of units of a resource dependency an entity requires
+		deadlines -- for functions in the scenario, the time that the entity must be active by
+		
+		Keyword arguments:
+		drop_indices -- positions in the changes of those that took entities down on an observation,
+		                which take no time or resources (default None)
+		
+		Return values:
+		result -- the same result (ProgressionResult)
 		"""
-		Evaluate entity state from system state.
+		dep_changes = result.dep_changes
+		dep_timing = result.dep_timing
+		missed_deadline = self._find_missed_deadline(ents_for_pa, dep_changes, dep_timing,
+		                                             deadlines, drop_indices)
+		if missed_deadline is not None:
+			result.status = PROGSTATUS.NOT_ENOUGH_TIME
+			result.failed_deadline = missed_deadline
+			return result
+		
+		#see if there are enough resources
+		result.resource_use, resource_ent = self._get_resource_allotment(dep_changes,
+		                                                                 dep_timing,
+		                                                                 realized_timelines,
+		                                                                 effort_outputs,
+		                                                                 drop_indices)
+		if resource_ent is not None:
+			result.status = PROGSTATUS.NOT_ENOUGH_RESOURCES
+			result.failed_resource = resource_ent
+		return result
+		
+	def sweep_deadlines(self, scenario, deadline_sets, ents=None):
+		"""
+		Progress the system once based on scenario conditions and check many sets of deadlines
+		against it. The deadlines of the scenario itself are not used.
 		
 		Arguments:
-		ent -- entity to be evaluated
-		system_state -- states of all entities
+		scenario -- GMORScenarioModel progression will be based on
+		deadline_sets -- one row per set of deadlines, one column per entity of ents
+		                 (M x F array-like; nan for no deadline)
+		
+		Keyword arguments:
+		ents -- entities the columns of deadline_sets are for (default None; all functions,
+		        in model order)
 		
 		Exceptions:
-		ValueError -- raised when system_state is wrong size
+		ValueError -- raised when GMORScenarioModel is not ready for analysis, or when deadline_sets
+		              is not M x F or has negative deadlines
 		
 		Return values:
-		ent_state -- states of ent's dependencies (list)
+		feasible -- for each set, True if the progression passes all checks with those deadlines
+		            (bool numpy array)
+		lateness -- time each entity is active after its deadline, 0 if on time and inf if never
+		            (M x F numpy array)
+		result -- the progression and the first check other than deadlines it failed, if any
+		          (ProgressionResult)
 		"""
-		if len(system_state) != len(self.entities):
-			raise ValueError('system_state incorrect size')
-		ent_state = []
-		for dep in self.dependencies[ent]:
-			dep_id = self.entity_lookup[dep]
-			ent_state.append(system_state[dep_id])  # entity state determined by state of dependencies
-		return ent_state
+		if scenario.ready() == False:
+			raise ValueError('must send in a ready scenario')
+		if ents is None:
+			ents = [ent for ent in self.entities if self.ent_types[ent] == ENTTYPE.FUNCTION]
+		deadline_sets = np.array(deadline_sets, dtype=np.float64)
+		if deadline_sets.ndim != 2 or deadline_sets.shape[1] != len(ents):
+			raise ValueError('deadline_sets must have one column per entity')
+		if np.any(deadline_sets[~np.isnan(deadline_sets)] < 0):
+			raise ValueError('Not all non-negative values')
+		
+		result, ents_for_pa = self._run_scenario(scenario, {})
+		completion_times = self._get_completion_times(ents, ents_for_pa, result)
+		
+		with np.errstate(invalid='ignore'):
+			lateness = np.where(completion_times <= deadline_sets, 0.0,
+			                    completion_times - deadline_sets)
+		# nan deadlines compare as missed, so clear them after
+		lateness[np.isnan(deadline_sets)] = 0.0
+		feasible = np.all(lateness == 0.0, axis=1) & result.ok()
+		return feasible, lateness, result
+		
+	def get_peak_resource_demand(self, scenarios, ents=None):
+		"""
+		Progress the system once for each scenario and find the most of each resource entity in use
+		at any time.
 		
-	def _det_sys_wide_state_pessimistic(self, current_internal_states, realized_timelines):
-		"""
-		Constructs worst possible system state given the current internal states.
+		Arguments:
+		scenarios -- GMORScenarioModels progressions will be based on
+		
+		Keyword arguments:
+		ents -- resource entities to find the demand of (default None; all resources, in model
+		        order)
+		
+		Exceptions:
+		ValueError -- raised when a GMORScenarioModel is not ready for analysis
+		
+		Return values:
+		peak_demand -- one row per scenario, one column per entity of ents (numpy array)
+		results -- the progression of each scenario and the first check it failed, if any
+		           (list of ProgressionResult)
+		"""
+		if ents is None:
+			ents = [ent for ent in self.entities if self.ent_types[ent] == ENTTYPE.RESOURCE]
+		peak_demand = np.zeros((len(scenarios), len(ents)))
+		results = []
+		for s, scenario in enumerate(scenarios):
+			result = self.run_progression(scenario)
+			results.append(result)
+			if len(result.change_ids) == 0:
+				continue
+			resource_ents, resource_use = self._get_resource_use(result.dep_changes,
+			                                                     result.dep_timing,
+			                                                     scenario.realized_timelines,
+			                                                     scenario.efforts)
+			if len(resource_ents) == 0:
+				continue
+			peak_use = dict(zip(resource_ents, resource_use.max(axis=0)))
+			peak_demand[s] = [peak_use[ent] for ent in ents]
+		return peak_demand, results
+		
+	def sweep_resource_limits(self, scenarios, limit_sets, ents=None):
+		"""
+		Check many sets of resource limits against the peak resource demand of each scenario,
+		progressing each scenario only once. The resource limits of the model are not used.
 		
 		Arguments:
-		current_internal_states -- states of internally-dependent entities
-		realized_timelines -- time it takes for an entity's state to change once it's dependencies are met
+		scenarios -- GMORScenarioModels progressions will be based on
+		limit_sets -- one row per set of resource limits, one column per entity of ents
+		              (K x R array-like)
+		
+		Keyword arguments:
+		ents -- resource entities the columns of limit_sets are for (default None; all resources,
+		        in model order)
+		
+		Exceptions:
+		ValueError -- raised when a GMORScenarioModel is not ready for analysis, or when limit_sets
+		              is not K x R
 		
 		Return values:
-		system_state -- worst possible system state (list)
+		feasible -- for each scenario and set of limits, True if the progression passes all checks
+		            with those limits (S x K bool numpy array)
+		min_limits -- smallest limits of each entity of ents that keep every scenario feasible
+		              that passes its checks other than resource limits (numpy array)
+		peak_demand -- one row per scenario, one column per entity of ents (numpy array)
+		"""
+		if ents is None:
+			ents = [ent for ent in self.entities if self.ent_types[ent] == ENTTYPE.RESOURCE]
+		limit_sets = np.array(limit_sets, dtype=np.float64)
+		if limit_sets.ndim != 2 or limit_sets.shape[1] != len(ents):
+			raise ValueError('limit_sets must have one column per entity')
+		
+		peak_demand, results = self.get_peak_resource_demand(scenarios, ents)
+		# failing any other check cannot be fixed by resource limits
+		resource_ok = np.array([result.status in (PROGSTATUS.OK, PROGSTATUS.NOT_ENOUGH_RESOURCES)
+		                        for result in results], dtype=bool)
+		feasible = np.all(peak_demand[:, np.newaxis, :] <= limit_sets[np.newaxis, :, :], axis=2)
+		feasible &= resource_ok[:, np.newaxis]
+		if resource_ok.any():
+			min_limits = peak_demand[resource_ok].max(axis=0)
+		else:
+			min_limits = np.zeros(len(ents))
+		return feasible, min_limits, peak_demand
+		
+	def _get_completion_times(self, ents, ents_for_pa, result):
 		"""
-		#put all timelines in one place
-		durations = copy.copy(realized_timelines)
+		Find the time each entity first becomes active in a progression.
 		
-		states = get_bin_list(0, len(self.entities)) # will include internal states
-		system_state = get_bin_list(0, len(self.entities)) # will not initially include internal states
+		Arguments:
+		ents -- entities to find the times of
+		ents_for_pa -- entities contributing to p_a
+		result -- the progression (ProgressionResult)
 		
-		changed_ents = []
-		for ent in current_internal_states:
-			if current_internal_states[ent] == 1 and durations[ent] == 0:
-				ent_id = self.entity_lookup[ent]
-				changed_ents.append(ent)
-				states[ent_id] = 1
-		old_states = copy.copy(states)
-		while len(changed_ents) > 0:
-			for dep_ent in changed_ents:
-				for ent in self.entities:
-					if dep_ent in self.dependencies[ent] and dep_ent != ent and durations[ent] == 0.0:
-						new_resultant = self._get_ent_resul_st_from_sys_st(ent, states)
-						old_resultant = self._get_ent_resul_st_from_sys_st(ent, old_states)
-						temp_resultant = self._get_ent_resul_st_from_sys_st(ent, system_state)
-						#print ':::::',states,system_state,ent,new_resultant,old_resultant
-						if new_resultant == 1 and (old_resultant == 0 or temp_resultant == 0):
-							old_states = copy.copy(states)
-							changed_ents.append(ent)
-							ent_id = self.entity_lookup[ent]
-							#print '....',dep_ent,ent
-							states[ent_id] = 1
-							system_state[ent_id] = 1
-				changed_ents.remove(dep_ent)
-		for ent in current_internal_states: # add internal states of entities that only depend on themselves
-			if len(self.dependencies[ent]) == 1 and durations[ent] == 0:
-				ent_id = self.entity_lookup[ent]
-				system_state[ent_id] = current_internal_states[ent]
-		return system_state
+		Return values:
+		completion_times -- for each entity, the time of its first change (0 if contributing to p_a,
+		                    inf if it never changes) (numpy array)
+		"""
+		ent_ids = np.array([self.entity_lookup[ent] for ent in ents], dtype=np.int32)
+		first_times = np.full(len(self.entities), np.inf)
+		# changes are in time order, so the first change of an entity is its minimum
+		np.minimum.at(first_times, result.change_ids, result.change_times)
+		for ent in ents_for_pa:
+			first_times[self.entity_lookup[ent]] = 0.0
+		return first_times[ent_ids]
 		
-	def _build_progression(self, _system_state, realized_timelines, stop_at=-1):
+	def do_progression(self, scenario, early_abort=False):
 		"""
-		Builds lists of entity changes, times the changes occur, and the system state after the changes.
+		Progress the system based on scenario conditions.
 		
 		Arguments:
-		_system_state -- state of all entities
-		realized_timelines -- time it takes for an entity's state to change once it's dependencies are met
+		scenario -- GMORScenarioModel progression will be based on
 		
 		Keyword arguments:
-		stop_at -- Halt and return the progression at this time (default -1)
+		early_abort -- stop progressing as soon as a deadline is missed or a resource limit is
+		               exceeded (default False)
+		
+		Exceptions:
+		ValueError -- raised when GMORScenarioModel is not ready for analysis, when a dependency
+		              exits before recovery is complete, when there isn't enough time to meet a
+		              deadline, or when there aren't enough resources (checked in the order of
+		              PROGSTATUS)
 		
 		Return values:
+		p_a -- performance a, the system level performance (float)
 		dep_changes -- entity state changes (list)
-		dep_change_timing -- times when changes occur (list)
-		system_state -- system state after changes (list)
+		dep_timing -- times when changes occur (list)
+		tracked_resource_use -- amounts of resource usage by changed entities (dict)
 		"""
-		system_state = copy.copy(_system_state)
-		#system_state_old = copy.copy(system_state)
-		durations = copy.copy(realized_timelines)
-		#for key in self.timeEfforts.keys(): durations[key] = self.timeEfforts[key]
-		#max_time_step = max(durations.values())
-		
-		current_time = 0.0
-		ents_underway = {}
-		
-		dep_changes = []
-		dep_change_timing = []
-		times_with_no_underway = 0
-		min_time_step = min(realized_timelines.values())
-		while times_with_no_underway <= 1:
-			#print '>>', system_state, current_time, ents_underway
-			
-			# find entities that will change after internal dependence changes
-			# (after the duration has passed).
-			for ent in self.entities:
-				if self._get_ent_resul_st_from_sys_st(ent, system_state) == 0 and ent in self.dependencies[ent]:
-					entity_state = self._get_ent_dep_sts_from_sys_st(ent, system_state)
-					entity_state_id = get_dec_from_bin_arr(entity_state)
-					dep_id = self.dependencies[ent].index(ent)
-					entity_state[dep_id] = 1-entity_state[dep_id]  # change ent's state
-					entity_state_id = get_dec_from_bin_arr(entity_state)
-					if self.resultant_states[ent][entity_state_id] == 1 and ents_underway.has_key(ent) == False:
-						ents_underway[ent] = current_time+durations[ent]
-						times_with_no_underway = 0
-						del durations[ent]
-			
-			#print 1, times_with_no_underway, ents_underway
-			
-			# find entities whose dependencies have updated such that the state can change
-			# (once the appropriate time passes)
-			for ent in self.entities:
-				ent_id = self.entity_lookup[ent]
-				if self._get_ent_resul_st_from_sys_st(ent, system_state) == 1 and system_state[ent_id] == 0:
-					if ent in durations.keys() and ents_underway.has_key(ent) == False:
-						ents_underway[ent] = current_time+durations[ent]
-						times_with_no_underway = 0
-						del durations[ent]
-			
-			
-			#get smallest increment >0 and increment time (some durations can be zero
-			#and still not have flipped because of needed dependency changes)
-			time_step = min_time_step
-			if len(ents_underway.keys()) > 0:
-				time_step = min(ents_underway.values())-current_time
-			
-			# find entities whose time is up
-			#system_state_old = copy.copy(system_state)
-			for ent in ents_underway.keys():
-				#if ents_underway[ent] < current_time:
-				#	raise ValueError('entity underway should have already changed state, '+ent)
-				#elif ents_underway[ent] == current_time:
-				if ents_underway[ent] <= current_time:
-					ent_id = self.entity_lookup[ent]
-					system_state[ent_id] = 1-system_state[ent_id] #toggle state element
-					del ents_underway[ent]
-					dep_changes.append(ent)
-					dep_change_timing.append(current_time)
-					time_step = 0.0
-					# don't update time if all that is done is an expiry of an entity's state
-			
-			#print 3, times_with_no_underway, ents_underway		
-			current_time += time_step
-			
-			if len(ents_underway) == 0: times_with_no_underway += 1
-			else: times_with_no_underway = 0
-			
-			if stop_at >= 0 and current_time >= stop_at:
-				underway_vals = [val for val in ents_underway.values() if val <= stop_at]
-				#if current_time >= stop_at and n_underway_vals == 0:
-				#print '%%%',ents_underway
-				if len(underway_vals) == 0:
-					return dep_changes, dep_change_timing, system_state
-		
-		return dep_changes, dep_change_timing, system_state
+		result = self.run_progression(scenario, early_abort)
+		result.raise_on_failure()
+		return result.as_tuple()
 		
-	def _disimprove_from_exits(self, dep_changes, dep_timing, realized_exits, _system_state_at_pa,
-			                         _system_state_goal):
+	def snapshot_progression(self, scenario, stop_at, snapshot=None):
 		"""
-		Recover system after a possible entity state change.
+		Progress the system based on scenario conditions up to a time, and take a snapshot that
+		resume_progression can continue from.
 		
 		Arguments:
-		dep_changes -- entity state changes
-		dep_timing -- times when changes occur
-		realized_exits -- amount of time an internal dependency of an entity is available
-		_system_state_at_pa -- system state before any changes occur
-		_system_state_goal -- expected system state after recovery from changes
+		scenario -- GMORScenarioModel progression will be based on
+		stop_at -- Halt the progression at this time (-1 to progress until no more changes happen)
+		
+		Keyword arguments:
+		snapshot -- snapshot to continue from rather than the start of the scenario, which is left
+		            as it is (default None)
 		
 		Exceptions:
-		ValueError -- raised when system state not recovered from state changes.
+		ValueError -- raised when GMORScenarioModel is not ready for analysis, or when the snapshot
+		              is of a different model
+		
+		Return values:
+		snapshot -- where the progression is at the first changes at or after stop_at, or when time
+		            first passes it (ProgressionSnapshot)
 		"""
-		system_state = copy.copy(_system_state_at_pa)
-		system_state_old = copy.copy(system_state)
-		change_occured = False
-		for i in range(len(dep_changes)):
-			current_time = dep_timing[i]
-			#ent_change_id = self.entity_lookup[dep_changes[i]]
-			#system_state[ent_change_id] = 1 - system_state[ent_change_id]
-			for exit_time_ent in realized_exits.keys():
-				if current_time >= realized_exits[exit_time_ent]:  # if exit time reached
-					exit_time_ent_id = self.entity_lookup[exit_time_ent]
-					system_state[exit_time_ent_id] = 0
-					change_occured = True
-		if change_occured:
-			while change_occured:
-				new_change = False
-				for ent in self.entities:
-					ent_id = self.entity_lookup[ent]
-					if (self._get_ent_resul_st_from_sys_st(ent, system_state) == 0 and
-					    self._get_ent_resul_st_from_sys_st(ent, system_state_old) == 1):  # if dependency expired
-						
-						system_state_old = copy.copy(system_state)
-						system_state[ent_id] = 0
-						new_change = True
-				if new_change == False:
-					change_occured = False
-		else:
-			system_state = copy.copy(_system_state_goal)
-		#print system_state, _system_state_goal
-		if set(system_state) == set(_system_state_goal):
-			pass#print 'Expirations okay'
+		if scenario.ready() == False:
+			raise ValueError('must send in a ready scenario')
+		if snapshot is None:
+			system_state = self._det_sys_wide_state_pessimistic(scenario.current_internal_states, 
+			                                                     scenario.realized_timelines)
+			snapshot = self._new_snapshot(system_state)
 		else:
-			raise ValueError('Recovery incomplete due to dependency exit: '+str(system_state))
-			
-	def _assess_resource_allotment(self, dep_changes, dep_timing, realized_timelines, effort_outputs):
+			self._check_snapshot(snapshot)
+			snapshot = snapshot.copy()
+		self._run_events(snapshot, scenario.realized_timelines, stop_at, scenario.realized_exits)
+		snapshot.model_key = self._get_model_key()
+		return snapshot
+		
+	def resume_progression(self, snapshot, scenario):
 		"""
-		Calculate the maximum amount of usage of each resource entity in a timeslice
-		by entities with changing states.
+		Continue a progression from a snapshot until no more changes happen, and check the whole
+		progression. Timelines, exits, efforts and deadlines come from the scenario; the timelines
+		of the entities that started changing before the snapshot are those they started with.
 		
 		Arguments:
-		dep_changes -- entity state changes
-		dep_timing -- times when changes occur
-		realized_timelines -- time it takes for an entity's state to change once it's dependencies are met
-		effort_outputs -- number of units of a resource dependency an entity requires
+		snapshot -- where the progression is, which is left as it is (ProgressionSnapshot)
+		scenario -- GMORScenarioModel the rest of the progression will be based on
 		
 		Exceptions:
-		ValueError -- raised when there is not enough of a resource
+		ValueError -- raised when GMORScenarioModel is not ready for analysis, or when the snapshot
+		              is of a different model
 		
 		Return values:
-		tracked_resource_use -- a dictionary with resources as keys, each with a list of the
-								max amount of the resource that was used in each time slice
-								between when an entity's deps were met and when its state changed
+		result -- the progression and the first check it failed, if any (ProgressionResult)
 		"""
-		if len(dep_changes) == 0:
-			return {}
-		durations = copy.copy(realized_timelines)
-		#for key in self.timeEfforts.keys(): durations[key] = self.timeEfforts[key]
+		if scenario.ready() == False:
+			raise ValueError('must send in a ready scenario')
+		self._check_snapshot(snapshot)
+		snapshot = snapshot.copy()
+		broken_exit, unused_aborted = self._run_events(snapshot, scenario.realized_timelines, 
+		                                               realized_exits=scenario.realized_exits)
+		p_a, ents_for_pa = self._find_pa(snapshot.initial_state)
+		result = ProgressionResult(self.entities, p_a, snapshot.change_ids, snapshot.change_times,
+		                           snapshot.initial_state)
+		if broken_exit is not None:
+			return self._check_broken_progression(result, ents_for_pa, scenario.deadlines,
+			                                      broken_exit, snapshot.current_time,
+			                                      snapshot.drop_indices)
+		
+		realized_timelines = dict(scenario.realized_timelines)
+		for ent_id, duration in snapshot.consumed_durations.items():
+			realized_timelines[self.entities[ent_id]] = duration
+		return self._check_progression(result, ents_for_pa, realized_timelines, scenario.efforts,
+		                               scenario.deadlines, snapshot.drop_indices)
+		
+	def _advance_snapshot(self, snapshot, realized_timelines, time, realized_exits=None):
+		"""
+		Continue a progression in place up to a time, applying all changes that occur by then.
 		
-		#find out when entityChanges were initialized
-		change_init_times = []
-		for i in range(len(dep_changes)):
-			ent = dep_changes[i]
-			change_init_times.append(dep_timing[i] - durations[ent])
-		#instantiate blank list of resource use
-		current_resource_use = {}
-		tracked_resource_use = {}
-		for ent in self.resource_limits.keys():
-			current_resource_use[ent] = 0
-			tracked_resource_use[ent] = []
-			for temp in dep_timing: #temp unused in loop
-				tracked_resource_use[ent].append(0.0)
-		
-		for j in range(len(dep_timing)):
-			for ent in self.resource_limits.keys():
-				current_resource_use[ent] = 0
-			for i in range(len(dep_changes)):
-				if (dep_timing[i] == dep_timing[j] or change_init_times[i] == change_init_times[j] 
-				    or (dep_timing[j] < dep_timing[i] and dep_timing[j] > change_init_times[i])):
-					ent_active = dep_changes[i]
-					for resource_ent in current_resource_use.keys():
-						if resource_ent != ent_active and resource_ent in self.dependencies[ent_active]:
-							current_resource_use[resource_ent] += \
-								effort_outputs[ent_active][resource_ent]
-							if current_resource_use[resource_ent] > self.resource_limits[resource_ent]:
-								raise ValueError('not enough resources of, ' + resource_ent)
-			for resource_ent in current_resource_use.keys():
-				tracked_resource_use[resource_ent][j] += current_resource_use[resource_ent]
-		#print 'Resource Usage Okay', tracked_resource_use
-		return tracked_resource_use
+		Arguments:
+		snapshot -- where the progression is (ProgressionSnapshot)
+		realized_timelines -- time it takes for an entity's state to change once it's dependencies
+		                      are met
+		time -- time to advance to, not before the current time of the snapshot
 		
-	def _find_pa(self, system_state):
-		"""
-		Calculate system level performance with current system state.
+		Keyword arguments:
+		realized_exits -- amount of time an internal dependency of an entity is available
+		                  (default None; negative values never exit)
+		"""
+		while True:
+			# each run halts after the first round of changes at the time, so run until time passes
+			# it or no more changes are set off
+			self._run_events(snapshot, realized_timelines, time, realized_exits)
+			if snapshot.broken_exit is not None:
+				return
+			if snapshot.current_time > time or (len(snapshot.ids_to_check) == 0 and 
+			                                    len(snapshot.underway_ids) == 0):
+				break
+		# halted as time passed the stop, before any changes at the new time, or with no more
+		# changes underway
+		snapshot.current_time = time
+		
+	def _pin_snapshot_state(self, snapshot, ent_id, state, realized_exits=None):
+		"""
+		Set the state of an entity in a progression at its current time, and keep the entity from
+		changing state after that. A change of state counts as a change completing: if a dependency
+		that has exited by then is up or changing, the progression halts on the exit instead, as in
+		_run_events. Taking an
+		entity down also takes down the dependents that can no longer stay up without it, as an exit
+		does in _expire_ents, cutting short any changes they have underway; they can change again
+		once their dependencies come back up.
 		
 		Arguments:
-		system_state -- state of all entities
+		snapshot -- where the progression is (ProgressionSnapshot)
+		ent_id -- index of the entity in self.entities
+		state -- state of the entity (0 for unavailable, 1 for available)
 		
-		Return values:
-		p_a -- performance a, the system level performance (float)
-		ents_for_pa -- entities contributing to p_a (list)
+		Keyword arguments:
+		realized_exits -- amount of time an internal dependency of an entity is available
+		                  (default None; negative values never exit)
+		"""
+		if snapshot.broken_exit is not None:
+			return
+		if snapshot.system_state[ent_id] != state and realized_exits is not None:
+			exits = sorted((realized_exits[ent], self.entity_lookup[ent])
+			               for ent in realized_exits.keys()
+			               if 0 <= realized_exits[ent] <= snapshot.current_time)
+			breaking_exits = [(exit_time, exit_id) for exit_time, exit_id in exits
+			                  if (snapshot.system_state[exit_id] == 1 or
+			                      exit_id in snapshot.underway_ids or exit_id == ent_id)]
+			if len(breaking_exits) > 0:
+				state_bytes = bytearray(snapshot.system_state)
+				self._expire_ents([exit_id for unused_time, exit_id in exits], state_bytes)
+				snapshot.system_state = list(state_bytes)
+				snapshot.broken_exit = (breaking_exits[0][0], self.entities[breaking_exits[0][1]])
+				return
+		self._cut_short_change(snapshot, ent_id)
+		if ent_id not in snapshot.consumed_durations:
+			snapshot.consumed_durations[ent_id] = 0.0
+		if snapshot.system_state[ent_id] == state:
+			return
+		changed_ids = [ent_id]
+		if state == 1:
+			snapshot.system_state[ent_id] = 1
+		else:
+			state_bytes = bytearray(snapshot.system_state)
+			changed_ids += self._expire_ents([ent_id], state_bytes)
+			snapshot.system_state = list(state_bytes)
+			for dropped_id in changed_ids[1:]:
+				# unlike the observed entity, dependents can come up again once their
+				# dependencies do
+				self._cut_short_change(snapshot, dropped_id)
+				snapshot.consumed_durations.pop(dropped_id, None)
+		ids_to_check = set(changed_ids)
+		for changed_id in changed_ids:
+			if state == 0:
+				snapshot.drop_indices.append(len(snapshot.change_ids))
+			snapshot.change_ids.append(changed_id)
+			snapshot.change_times.append(snapshot.current_time)
+			ids_to_check.update(self._get_dependent_ids(changed_id))
+		if snapshot.ids_to_check is not None:
+			snapshot.ids_to_check = sorted(set(snapshot.ids_to_check) | ids_to_check)
+		
+	def _cut_short_change(self, snapshot, ent_id):
+		"""
+		Cut short the change of an entity underway in a progression, if any, taking as long as it
+		has so far.
+		
+		Arguments:
+		snapshot -- where the progression is (ProgressionSnapshot)
+		ent_id -- index of the entity in self.entities
 		"""
-		n_ent = len(self.entities)
-		ents_for_pa = []
-		p_a = 0.0
-		for i in range(n_ent):
-			ent = self.entities[i]
-			if ent in self.op_performance_levels.keys():
-				if system_state[i] == 1:
-					p_a += self.op_performance_levels[ent]
-					ents_for_pa.append(ent)
-		return p_a, ents_for_pa
+		if ent_id in snapshot.underway_ids:
+			k = snapshot.underway_ids.index(ent_id)
+			completion_time = snapshot.underway_times.pop(k)
+			del snapshot.underway_ids[k]
+			snapshot.consumed_durations[ent_id] -= completion_time - snapshot.current_time
+		
+	def _check_snapshot(self, snapshot):
+		"""
+		Exceptions:
+		ValueError -- raised when the snapshot is of a different model
+		"""
+		if snapshot.model_key != self._get_model_key():
+			raise ValueError('snapshot must be of the model of the runner')
 		
 	##
-	## ASSESS
+	## INCREMENTAL
 	##
-	def do_progression(self, scenario):
+	def start_incremental(self, scenario):
 		"""
-		Progress the system based on scenario conditions.
+		Progress the system based on scenario conditions, keeping what is needed to update the
+		progression as the conditions change one at a time.
+		
+		The worst possible system state follows the steps of _det_sys_wide_state_pessimistic, so
+		each update gives the same result as run_progression on the updated scenario. It is only
+		constructed again when an internal state or whether an entity takes time to change has
+		changed, and updates only redo the times downstream of those changes, unless a dependency
+		can exit, when each update progresses the system again.
 		
 		Arguments:
 		scenario -- GMORScenarioModel progression will be based on
 		
 		Exceptions:
 		ValueError -- raised when GMORScenarioModel is not ready for analysis
-					  or when there isn't enough time to meet a deadline
 		
 		Return values:
-		p_a -- performance a, the system level performance (float)
-		dep_changes -- entity state changes (list)
-		dep_timing -- times when changes occur (list)
-		tracked_resource_use -- amounts of resource usage by changed entities (dict)
+		result -- the progression and the first check it failed, if any (ProgressionResult)
 		"""
-		debug_print = False
 		if scenario.ready() == False:
 			raise ValueError('must send in a ready scenario')
-			
-		current_internal_states = scenario.current_internal_states
-		realized_timelines = scenario.realized_timelines
-		realized_exits = copy.copy(scenario.realized_exits)
-		effort_outputs = scenario.efforts
-		deadlines = scenario.deadlines
+		n_ent = len(self.entities)
+		session = _IncrementalProgression()
+		session.current_internal_states = dict(scenario.current_internal_states)
+		session.realized_timelines = dict(scenario.realized_timelines)
+		session.realized_exits = scenario.realized_exits
+		session.efforts = scenario.efforts
+		session.deadlines = scenario.deadlines
+		session.internal = bytearray(n_ent)
+		for ent in session.current_internal_states:
+			session.internal[self.entity_lookup[ent]] = session.current_internal_states[ent]
+		session.zero_duration = bytearray(session.realized_timelines.get(ent, 0) == 0 
+		                                  for ent in self.entities)
+		session.system_state = bytearray(n_ent)
+		self._settle_pessimistic_states(session)
+		
+		session.analytic = self._can_solve_analytically(session.realized_exits)
+		session.perf_ids = sorted(self.entity_lookup[ent]
+		                          for ent in self.op_performance_levels.keys())
+		if session.analytic:
+			session.kernel_lists = self._get_kernel_lists()
+			session.component_index = [0]*n_ent
+			for c, component in enumerate(self.dependency_components):
+				for ent_id in component:
+					session.component_index[ent_id] = c
+			session.keys, session.trigger_keys = self._get_earliest_keys(session.system_state,
+			                                                             session.realized_timelines)
+			session.key_times = np.array([key[0] for key in session.keys])
+			session.key_rounds = np.array([key[1] for key in session.keys])
+		self._incremental = session
+		return self._get_incremental_result()
+		
+	def flip_internal_state(self, ent):
+		"""
+		Flip the current internal state of an entity in the incremental session and update the
+		progression, redoing only the times downstream of the changes where possible.
 		
-		for ent in realized_exits.keys():
-			if realized_exits[ent] < 0:
-				del realized_exits[ent]
+		Arguments:
+		ent -- entity with an internal dependency
 		
-		#n_ent = len(self.entities)
-		#p_r = 1.0
-		#pm = self.pm
-		#ps = self.ps
+		Exceptions:
+		ValueError -- raised when no incremental session has been started, or when the entity does
+		              not have an internal dependency
 		
-		##
-		## Establish p_a
-		##
-		# ASSUMPTION: Start in the worst possible state given the internal state infor provided
-		#(cannnot assume enough time has passed for any benefits of these states to have propagated)
-		system_state = self._det_sys_wide_state_pessimistic(current_internal_states, 
-                                                      realized_timelines)
-		p_a, ents_for_pa = self._find_pa(system_state)
-		if debug_print:
-			print '\n>>> p_a...'
-			print 'system state:', system_state
-			print 'p_a: ', p_a, ents_for_pa
-
-		dep_changes, dep_timing, system_state_res = self._build_progression(system_state,
-                                                                      realized_timelines)
-		if debug_print:
-			print '\n>>> m, s, r...'
-			print '', dep_changes
-			print '', dep_timing
-		
-		
-		enough_time = self.check_changes_timing(p_a, ents_for_pa, dep_changes, dep_timing, deadlines)
-		if debug_print:
-			print '\n>>> enough time...', enough_time
-		if enough_time == False:
-			raise ValueError('Not enough time')
+		Return values:
+		result -- the progression and the first check it failed, if any (ProgressionResult)
+		"""
+		session = self._incremental
+		if session is None:
+			raise ValueError('must start an incremental session first')
+		if ent not in self.entity_lookup or ent not in self.dependencies[ent]:
+			raise ValueError('entity must have an internal dependency')
+		ent_id = self.entity_lookup[ent]
+		session.current_internal_states[ent] = 1 - session.current_internal_states.get(ent, 0)
+		session.internal[ent_id] = session.current_internal_states[ent]
+		return self._update_incremental([ent_id], [])
+		
+	def update_realized_timeline(self, ent, realized_timeline):
+		"""
+		Change the realized timeline of an entity in the incremental session and update the
+		progression, redoing only the times downstream of the entity where possible.
 		
-		# check that all completed before a dependency expired - like fuel refills.'
-		if debug_print:
-			print '\n>>> expires...'
-		self._disimprove_from_exits(dep_changes, dep_timing, realized_exits, system_state,
-									                     system_state_res)
+		Arguments:
+		ent -- entity whose timeline has changed
+		realized_timeline -- time it takes for the entity's state to change once it's dependencies
+		                     are met
 		
-		#see if there are enough resources
-		if debug_print:
-			print '\n>>> resources...'
-		tracked_resource_use = self._assess_resource_allotment(dep_changes, dep_timing,
-                                                         realized_timelines, effort_outputs)
+		Exceptions:
+		ValueError -- raised when no incremental session has been started, or when the entity is not
+		              in the model or the timeline is negative
+		
+		Return values:
+		result -- the progression and the first check it failed, if any; the deadline status is in
+		          result.status and result.failed_deadline (ProgressionResult)
+		p_s -- performance levels of the performance curve (list)
+		t_s -- times of the performance curve (list)
+		"""
+		session = self._incremental
+		if session is None:
+			raise ValueError('must start an incremental session first')
+		if ent not in self.entity_lookup:
+			raise ValueError('Not an entity of the model')
+		if not is_all_non_neg([realized_timeline]):
+			raise ValueError('Not all non-negative values')
+		ent_id = self.entity_lookup[ent]
+		session.realized_timelines[ent] = realized_timeline
+		zero_duration = int(realized_timeline == 0)
+		if zero_duration != session.zero_duration[ent_id]:
+			session.zero_duration[ent_id] = zero_duration
+			result = self._update_incremental([ent_id], [ent_id])
+		else:
+			result = self._update_incremental([], [ent_id])
+		p_s, t_s = self.get_performance_curve(result.p_a, result.dep_changes, result.dep_timing)
+		return result, p_s, t_s
+		
+	def _update_incremental(self, seed_ids, retimed_ids):
+		"""
+		Update the incremental session after the internal state or the timeline of some entities
+		has changed.
+		
+		Arguments:
+		seed_ids -- ids of the entities whose internal state or whether they take time to change
+		            has changed (the worst possible system state is only constructed again when
+		            there are some)
+		retimed_ids -- ids of the entities whose timeline has changed
+		
+		Return values:
+		result -- the progression and the first check it failed, if any (ProgressionResult)
+		"""
+		session = self._incremental
+		changed_ids = []
+		if len(seed_ids) > 0:
+			old_state = bytearray(session.system_state)
+			self._settle_pessimistic_states(session)
+			changed_ids = [ent_id for ent_id in range(len(self.entities)) 
+			               if session.system_state[ent_id] != old_state[ent_id]]
+		if session.analytic:
+			downstream_ids = self._get_downstream_ids(changed_ids + retimed_ids)
+			self._resolve_earliest_keys(session, downstream_ids)
+		return self._get_incremental_result()
+		
+	def _settle_pessimistic_states(self, session):
+		"""
+		Construct the worst possible system state of the incremental session from scratch.
+		
+		Arguments:
+		session -- the incremental session (_IncrementalProgression)
+		"""
+		internal_states = np.frombuffer(session.internal, dtype=np.uint8)[np.newaxis, :]
+		zero_durations = np.frombuffer(session.zero_duration, dtype=np.uint8)[np.newaxis, :]
+		seed_order = [self.entity_lookup[ent] for ent in session.current_internal_states]
+		system_states, unused_p_a = self._det_sys_wide_state_pessimistic_batch(internal_states,
+		                                                                         zero_durations,
+		                                                                         seed_order)
+		session.system_state[:] = bytearray(system_states[0].tostring())
+		
+	def _get_downstream_ids(self, ent_ids):
+		"""
+		Find the entities that depend on any of the given entities, directly or not.
+		
+		Arguments:
+		ent_ids -- ids of the entities
+		
+		Return values:
+		ids of the entities and those downstream of them (set)
+		"""
+		downstream_ids = set(ent_ids)
+		ids_to_check = list(downstream_ids)
+		while len(ids_to_check) > 0:
+			for dependent_id in self._get_dependent_ids(ids_to_check.pop()):
+				if dependent_id not in downstream_ids:
+					downstream_ids.add(dependent_id)
+					ids_to_check.append(dependent_id)
+		return downstream_ids
+		
+	def _resolve_earliest_keys(self, session, ent_ids):
+		"""
+		Solve the keys of the incremental session again for the components of the dependency graph
+		holding the given entities.
+		
+		Arguments:
+		session -- the incremental session (_IncrementalProgression)
+		ent_ids -- ids of the entities whose keys may have changed, along with all entities
+		           downstream of them
+		"""
+		never = (float('inf'), 0)
+		components = [self.dependency_components[c] for c in 
+		              sorted(set(session.component_index[ent_id] for ent_id in ent_ids))]
+		for component in components:
+			for ent_id in component:
+				session.keys[ent_id] = (0.0, 0) if session.system_state[ent_id] == 1 else never
+				session.trigger_keys[ent_id] = never
+		self._solve_earliest_keys(session.keys, session.trigger_keys, session.system_state,
+		                          session.realized_timelines, components, session.kernel_lists)
+		for component in components:
+			for ent_id in component:
+				session.key_times[ent_id], session.key_rounds[ent_id] = session.keys[ent_id]
+		
+	def _get_incremental_result(self):
+		"""
+		Check the current progression of the incremental session.
+		
+		Return values:
+		result -- the progression and the first check it failed, if any (ProgressionResult)
+		"""
+		session = self._incremental
+		if not session.analytic:
+			session.result = self._progress_from_state(list(session.system_state),
+			                                           session.realized_timelines,
+			                                           session.realized_exits, session.efforts,
+			                                           session.deadlines)[0]
+			return session.result
 		
-		return p_a, dep_changes, dep_timing, tracked_resource_use
+		p_a = 0.0
+		ents_for_pa = []
+		for ent_id in session.perf_ids:
+			if session.system_state[ent_id] == 1:
+				ent = self.entities[ent_id]
+				p_a += self.op_performance_levels[ent]
+				ents_for_pa.append(ent)
+		state = np.frombuffer(session.system_state, dtype=np.uint8)
+		change_ids = np.flatnonzero((state == 0) & (session.key_times < np.inf))
+		order = np.lexsort((change_ids, session.key_rounds[change_ids],
+		                   session.key_times[change_ids]))
+		result = ProgressionResult(self.entities, p_a, change_ids[order], 
+		                           session.key_times[change_ids[order]], state)
+		session.result = self._check_progression(result, ents_for_pa, session.realized_timelines,
+		                                         session.efforts, session.deadlines)
+		return session.result
 		
 	def plot_performance_curve(self, p_a, dep_changes, dep_timing, save=False, file_name='', path=''):
 		"""
@@ -2072,17 +6538,7 @@ class GMORRunner(object):#(GMORModel):
 		path -- absolute path to directory where file will be located (default '';
 				path will be to current working directory)
 		"""
-		perf = 0.0
-		p_s = [1.0, 1.0, p_a]
-		t_s = [-0.01*max(dep_timing), 0.0, 0.0]
-		for i in range(len(dep_changes)):
-			ent = dep_changes[i]
-			time_ = dep_timing[i]
-			if ent in self.op_performance_levels.keys():
-				perf += self.op_performance_levels[ent]
-				p_s.append(perf)
-				t_s.append(time_)
-		
+		p_s, t_s = self.get_performance_curve(p_a, dep_changes, dep_timing)
 		plt.plot(t_s, p_s)
 		if save:
 			if file_name == '':
@@ -2096,6 +6552,55 @@ class GMORRunner(object):#(GMORModel):
 			plt.show()
 		plt.close()
 		
+	def get_state_trajectory(self, result, checkpoint_interval=64):
+		"""
+		Get the states of all entities over the course of a progression.
+		
+		Arguments:
+		result -- the progression (ProgressionResult, with its initial_state)
+		
+		Keyword arguments:
+		checkpoint_interval -- number of changes between checkpoints (default 64)
+		
+		Exceptions:
+		ValueError -- raised when the initial state of the progression is not known
+		
+		Return values:
+		trajectory -- the states over time, reporting on the functions in model order
+		              (StateTrajectory)
+		"""
+		if result.initial_state is None:
+			raise ValueError('initial state of the progression must be known')
+		function_ids = [ent_id for ent_id, ent in enumerate(self.entities) 
+		                if self.ent_types[ent] == ENTTYPE.FUNCTION]
+		return StateTrajectory(self.entities, function_ids, result.initial_state, result.change_ids,
+		                       result.change_times, checkpoint_interval)
+		
+	def get_performance_curve(self, p_a, dep_changes, dep_timing):
+		"""
+		Get the points of the performance curve from the start of the scenario.
+		
+		Arguments:
+		p_a -- performance a, the system level performance
+		dep_changes -- entity state changes
+		dep_timing -- times when changes occur
+		
+		Return values:
+		p_s -- performance levels (list)
+		t_s -- times of the performance levels (list)
+		"""
+		perf = 0.0
+		p_s = [1.0, 1.0, p_a]
+		t_s = [-0.01*max(dep_timing + [0.0]), 0.0, 0.0]
+		for i in range(len(dep_changes)):
+			ent = dep_changes[i]
+			time_ = dep_timing[i]
+			if ent in self.op_performance_levels:
+				perf += self.op_performance_levels[ent]
+				p_s.append(perf)
+				t_s.append(time_)
+		return p_s, t_s
+		
 	def check_changes_timing(self, p_a, ents_for_pa, dep_changes, dep_timing, deadlines):
 	#p_a unused argument (unless perf variable below is used)
 		"""
@@ -2112,31 +6617,67 @@ class GMORRunner(object):#(GMORModel):
 		True -- if all deadlines have been met
 		False -- otherwise
 		"""
-		#perf = p_a
-		deadlines_met = {}
+		return self._find_missed_deadline(ents_for_pa, dep_changes, dep_timing, deadlines) is None
+		
+	def _find_missed_deadline(self, ents_for_pa, dep_changes, dep_timing, deadlines,
+	                          drop_indices=None):
+		"""
+		Find the first deadline of an entity that has not been met.
+		
+		Arguments:
+		ents_for_pa -- entities contributing to p_a
+		dep_changes -- entity state changes
+		dep_timing -- times when changes occur
+		deadlines -- for functions in the scenario, the time that the entity must be active by
+		
+		Keyword arguments:
+		drop_indices -- positions in dep_changes of the changes that took entities down on an
+		                observation (default None; see _get_deadline_drops)
+		
+		Return values:
+		the entity with the earliest missed deadline (None if all deadlines have been met)
+		"""
+		dropped_at = self._get_deadline_drops(dep_changes, dep_timing, deadlines, drop_indices)
 		
 		# any ents already okay at p_a automatically meet deadlines since deadlines are >=0
-		for ent in deadlines.keys():
-			if ent in ents_for_pa:
-				deadlines_met[ent] = 1
-			else:
-				deadlines_met[ent] = 0
+		deadlines_met = set(ent for ent in ents_for_pa
+		                    if ent in deadlines and ent not in dropped_at)
 		
-		#sum(deadlines_met.values()) == len(deadlines_met.keys())
 		# proceed through changes
 		for i in range(len(dep_changes)):
 			ent = dep_changes[i]
-			current_time = dep_timing[i]
-			if ent in deadlines.keys():
-				if current_time <= deadlines[ent]:
-					deadlines_met[ent] = 1
-					#perf += self.op_performance_levels[ent]
-		#if sum(deadlines_met.values()) == 0:
-		#	print '\n\n<<<<<<<\n', dep_changes, dep_timing, deadlines_met
-		if sum(deadlines_met.values()) == len(deadlines.keys()):#len(deadlines_met.keys()):
-			return True
-		else:
-			return False
+			if ent in deadlines and dep_timing[i] <= deadlines[ent] and i > dropped_at.get(ent, -1):
+				deadlines_met.add(ent)
+		
+		missed = [ent for ent in deadlines.keys() if ent not in deadlines_met]
+		if len(missed) == 0:
+			return None
+		return min(missed, key=lambda ent: (deadlines[ent], self.entity_lookup.get(ent, -1), ent))
+		
+	def _get_deadline_drops(self, dep_changes, dep_timing, deadlines, drop_indices=None):
+		"""
+		Find the entities taken down on an observation by their deadline. Being up at p_a or
+		changing before then no longer meets the deadline; the entity has to come up again after.
+		
+		Arguments:
+		dep_changes -- entity state changes
+		dep_timing -- times when changes occur
+		deadlines -- for functions in the scenario, the time that the entity must be active by
+		
+		Keyword arguments:
+		drop_indices -- positions in dep_changes of the changes that took entities down on an
+		                observation (default None)
+		
+		Return values:
+		dropped_at -- for each such entity, the position of the last change that took it down (dict)
+		"""
+		dropped_at = {}
+		if drop_indices is not None:
+			for k in drop_indices:
+				ent = dep_changes[k]
+				if ent in deadlines and dep_timing[k] <= deadlines[ent]:
+					dropped_at[ent] = max(k, dropped_at.get(ent, -1))
+		return dropped_at
 			
 	def _get_new_timeline(self, new_times, int_dep_funcs):
 		"""
@@ -2159,7 +6700,7 @@ class GMORRunner(object):#(GMORModel):
 		return realized_timelines
 	
 	def deterministic_progression(self, model, current_internal_states, realized_timelines,
-              	                  realized_exits, efforts, deadlines):
+              	                  realized_exits, efforts, deadlines, early_abort=False):
 		"""
 		Do progression with given initial scenario conditions.
 		
@@ -2172,6 +6713,10 @@ class GMORRunner(object):#(GMORModel):
 		efforts -- number of units of a resource dependency an entity requires
 		deadlines -- for function entities, the time at which the entity must be active by
 		
+		Keyword arguments:
+		early_abort -- stop progressing as soon as a deadline is missed or a resource limit is
+		               exceeded (default False)
+		
 		Return values:
 		p_a -- performance a, the system level performance (float)
 		dep_change -- entity state changes (list)
@@ -2180,7 +6725,7 @@ class GMORRunner(object):#(GMORModel):
 		"""
 		c_b = GMORScenarioModel(model, 'Scenario 1')
 		c_b.set_and_check(model, current_internal_states, realized_timelines, realized_exits, efforts, deadlines)
-		return self.do_progression(c_b)
+		return self.do_progression(c_b, early_abort)
 		
 	def next_deadline(self, current_time, system_state, deadlines):
 		"""
@@ -2237,7 +6782,7 @@ class GMORRunner(object):#(GMORModel):
 					
 					# has an internal dependency in undesirable state
 					# assumes realized state requires internal state of 1
-					if dep in self.dependencies[dep] and entity_states[dep] == 0:
+					if self.internal_dep[self.entity_lookup[dep]] and entity_states[dep] == 0:
 						deps.append(dep)
 					
 					#have_checked.append(dep)
@@ -2319,5 +6864,114 @@ class GMORRunner(object):#(GMORModel):
 				
 		return timings
 	
+class GMORIncidentSession(object):
+	"""
+	Follow an incident as it happens: take in observed states of entities in time order, and
+	forecast the rest of the recovery from the latest observation.
+	
+	Observed entities are pinned to their observed state from then on. An entity observed down
+	takes down the dependents that can no longer stay up without it, whose deadlines are then
+	only met if they come up again in time. Each forecast continues from where the progression is
+	at the latest observation, rather than from the start. Changes forecast for the time of an
+	observation come before the observation.
+	
+	Public methods:
+	observe, forecast, get_deadline_lateness
+	
+	Instance variables:
+	runner, scenario, snapshot, pinned_states, current_time, result
+	"""
+	def __init__(self, runner, scenario):
+		"""
+		Constructs a session for a scenario, starting from its worst possible system state.
+		
+		Arguments:
+		runner -- GMORRunner of the model of the scenario
+		scenario -- GMORScenarioModel of the incident, with the timelines, exits, efforts and
+		            deadlines expected before anything is observed
+		
+		Exceptions:
+		ValueError -- raised when GMORScenarioModel is not ready for analysis
+		"""
+		if scenario.ready() == False:
+			raise ValueError('must send in a ready scenario')
+		self.runner = runner
+		self.scenario = scenario
+		system_state = runner._det_sys_wide_state_pessimistic(scenario.current_internal_states, 
+		                                                       scenario.realized_timelines)
+		self.snapshot = runner._new_snapshot(system_state)
+		self.snapshot.model_key = runner._get_model_key()
+		self.pinned_states = {}
+		self.current_time = 0.0
+		self.result = None
+		self.forecast()
+		
+	def observe(self, ent, state, time):
+		"""
+		Take in the observed state of an entity, pin the entity to it, and forecast the rest of
+		the recovery.
+		
+		Arguments:
+		ent -- entity observed
+		state -- observed state of the entity (0 for unavailable, 1 for available)
+		time -- time of the observation, not before the latest observation
+		
+		Exceptions:
+		ValueError -- raised when the entity is not of the model, the state is not 0 or 1, or the
+		              observation is before the latest observation
+		
+		Return values:
+		result -- the forecast progression and the first check it fails, if any (ProgressionResult)
+		"""
+		if ent not in self.runner.entity_lookup:
+			raise ValueError('Not an entity of the model')
+		if state not in (0, 1):
+			raise ValueError('state must be 0 or 1')
+		if time < self.current_time:
+			raise ValueError('observations must be in time order')
+		self.runner._advance_snapshot(self.snapshot, self.scenario.realized_timelines, time,
+		                              self.scenario.realized_exits)
+		self.current_time = time
+		self.runner._pin_snapshot_state(self.snapshot, self.runner.entity_lookup[ent], state,
+		                                self.scenario.realized_exits)
+		self.pinned_states[ent] = state
+		return self.forecast()
+		
+	def forecast(self):
+		"""
+		Forecast the rest of the recovery from the latest observation.
+		
+		Return values:
+		result -- the forecast progression and the first check it fails, if any (ProgressionResult)
+		"""
+		self.result = self.runner.resume_progression(self.snapshot, self.scenario)
+		return self.result
+		
+	def get_deadline_lateness(self):
+		"""
+		Find how late the latest forecast has each entity with a deadline.
+		
+		Return values:
+		lateness -- for each entity with a deadline, the time it is forecast to be active after the
+		            deadline (dict; 0 if on time, infinite if never)
+		"""
+		deadlines = self.scenario.deadlines
+		ents = sorted(deadlines.keys())
+		p_a, ents_for_pa = self.runner._find_pa(self.snapshot.initial_state)
+		completion_times = self.runner._get_completion_times(ents, ents_for_pa, self.result)
+		# entities taken down on an observation by their deadline are active once they come up again
+		dep_changes = self.result.dep_changes
+		dep_timing = self.result.dep_timing
+		dropped_at = self.runner._get_deadline_drops(dep_changes, dep_timing, deadlines,
+		                                             self.snapshot.drop_indices)
+		lateness = {}
+		for ent, completion_time in zip(ents, completion_times.tolist()):
+			if ent in dropped_at:
+				later_times = [dep_timing[i] for i in range(dropped_at[ent]+1, len(dep_changes))
+				               if dep_changes[i] == ent]
+				completion_time = min(later_times) if len(later_times) > 0 else np.inf
+			lateness[ent] = max(completion_time - deadlines[ent], 0.0)
+		return lateness
+	
 if __name__ == '__main__':
 	pass
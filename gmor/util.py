@@ -11,7 +11,7 @@ __status__ = "Development"
 import numpy as np
 import itertools
 import copy
-from model import GMORModel, ENTTYPE, get_bin_lists, get_dec_from_bin_arr
+from model import GMORModel, ENTTYPE, GATETYPE, PackedTruthTable, BDDTruthTable, get_bin_lists, get_dec_from_bin_arr
 
 def lists_equal(L1,L2):
 	"""
@@ -86,7 +86,13 @@ def update_res_sts_after_treatment(model, ent, old_dep):
 	
 	Note: 
 	An OR relationship between old_dep and the new dependency will be reflected in the states.
+	For an entity with a gate, old_dep is replaced in the gate by an OR gate of the new dependency
+	and old_dep instead.
 	"""
+	if ent in model.gates:
+		# the treatments insert the new dependency first
+		model.gates[ent] = _add_gate_alternative(model.gates[ent], old_dep, model.dependencies[ent][0])
+		return
 	'''
 	deps = model.dependencies[ent]
 	n_dep = len(deps)
@@ -125,7 +131,31 @@ def update_res_sts_after_treatment(model, ent, old_dep):
 					del cur_st[ind_old_dep]
 					if ordered_lists_equal(state, cur_st): # (old_dep OR new_dep)
 						new_res_states[j] = 1
+	if isinstance(model.resultant_states[ent], PackedTruthTable):
+		new_res_states = PackedTruthTable(new_res_states) # keep the states packed
+	elif isinstance(model.resultant_states[ent], BDDTruthTable):
+		manager = model.resultant_states[ent].manager # keep the states in the same BDDs
+		new_res_states = BDDTruthTable(manager, manager.from_table(deps, new_res_states), deps)
 	model.resultant_states[ent] = copy.copy(new_res_states)
+
+def _add_gate_alternative(gate, old_dep, new_dep):
+	"""
+	Copy a gate with each input old_dep replaced by an OR gate of new_dep and old_dep.
+	"""
+	gate = copy.copy(gate)
+	gate['inputs'] = [_add_gate_alternative(gate_input, old_dep, new_dep) if isinstance(gate_input, dict) else
+	                  {'type': GATETYPE.OR, 'inputs': [new_dep, old_dep]} if gate_input == old_dep else
+	                  gate_input for gate_input in gate['inputs']]
+	return gate
+
+def _rename_gate_input(gate, old_dep, new_dep):
+	"""
+	Copy a gate with each input old_dep replaced by new_dep.
+	"""
+	gate = copy.copy(gate)
+	gate['inputs'] = [_rename_gate_input(gate_input, old_dep, new_dep) if isinstance(gate_input, dict) else
+	                  new_dep if gate_input == old_dep else gate_input for gate_input in gate['inputs']]
+	return gate
 	
 def add_redundancy(model_old, ent_to_copy, suffix=' red', select=[], weight=0.5):
 	"""
@@ -185,8 +215,11 @@ def add_redundancy(model_old, ent_to_copy, suffix=' red', select=[], weight=0.5)
 	# add parent
 	model.parents[ent_new] = model.parents[ent_to_copy]
 	
-	# add new ent resultant states
-	model.resultant_states[ent_new] = copy.deepcopy(model.resultant_states[ent_to_copy])
+	# add new ent resultant states, or gate
+	if ent_to_copy in model.gates:
+		model.gates[ent_new] = _rename_gate_input(model.gates[ent_to_copy], ent_to_copy, ent_new)
+	else:
+		model.resultant_states[ent_new] = copy.deepcopy(model.resultant_states[ent_to_copy])
 	
 	# add resource limits to new ent
 	if ent_to_copy in model.resource_limits:
@@ -314,7 +347,8 @@ def add_dispersion(model_old, model_new, dis_ents):#, deps_keep=[]):
 		model.entities.remove(ent)
 		#old_deps[ent] = model.dependencies.pop(ent)
 		model.dependencies.pop(ent)
-		model.resultant_states.pop(ent)
+		model.resultant_states.pop(ent, None)
+		model.gates.pop(ent, None)
 		
 	model.merge_models(model_new)  # add entities of model_new
 	
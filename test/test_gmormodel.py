@@ -10,8 +10,9 @@ __status__ = "Development"
 #pylint: disable=trailing-whitespace
 #pylint: disable=global-variable-undefined
 #from nose2.tools import *
+import copy
 import nose2
-from gmor.model import GMORModel #import gmor
+from gmor.model import GMORModel, GMORRunner, PackedTruthTable, BDDManager, BDDTruthTable, GATETYPE, pack_lanes, unpack_lanes #import gmor
 import numpy as np
 from gmor.util import lists_equal, ordered_lists_equal
 
@@ -858,4 +859,252 @@ def test_gmormodel_edit_entity():
 	assert model.edit_entity('Entity A', 'function', 'parent')
 	assert model.ent_types['Entity A'] == 'function'	
 test_gmormodel_edit_entity.setup = setup
-test_gmormodel_edit_entity.teardown = teardown
\ No newline at end of file
+test_gmormodel_edit_entity.teardown = teardown
+
+
+def test_gmormodel_get_ent_id():
+	"""
+	"""
+	print 'test_gmormodel_get_ent_id'
+	
+	assert model.get_ent_id('Entity C') == 2
+	assert list(model.get_dep_ids('Entity B')) == [1, 2]
+	index = model._get_index()
+	try:
+		model.get_ent_id('Entity D')
+		assert False
+	except ValueError:
+		assert True
+	
+	assert model.add_entity('Entity D', 'system')
+	assert model.add_dep('Entity D', 'Entity A')
+	assert model.get_ent_id('Entity D') == 3
+	assert list(model.get_dep_ids('Entity D')) == [0]
+	assert model.del_dep('Entity B', 'Entity C')
+	assert list(model.get_dep_ids('Entity B')) == [1]
+	
+	# direct edits of the public attributes are seen by the index
+	model.dependencies['Entity D'].append('Entity D')
+	assert model.is_dep('Entity D', 'Entity D')
+	model.entities.append('Entity E')
+	assert model.is_ent('Entity E')
+	assert model.are_ents(['Entity A', 'Entity E'])
+	model.entities.remove('Entity E')
+	assert not model.is_ent('Entity E')
+	
+	assert model.del_entity('Entity A') == ['Entity D']
+	assert model.get_ent_id('Entity D') == 2
+	assert list(model.get_dep_ids('Entity D')) == [2]
+	assert not model.is_dep('Entity D', 'Entity A')
+	assert model._get_index() is index  # updated in place rather than rebuilt
+	
+	model.dependencies['Entity B'] = ['Entity A', 'Entity B']
+	assert list(model.get_dep_ids('Entity B')) == [-1, 0]
+	assert model.add_entity('Entity A', 'system')
+	assert list(model.get_dep_ids('Entity B')) == [3, 0]
+	assert model._get_index() is index
+	
+	model2 = copy.deepcopy(model)
+	model2.entities.append('Entity E')
+	assert model2.is_ent('Entity E')
+	assert not model.is_ent('Entity E')
+	assert type(copy.copy(model2.entities)) is list
+test_gmormodel_get_ent_id.setup = setup3
+test_gmormodel_get_ent_id.teardown = teardown
+
+
+
+def test_gmormodel_version():
+	"""
+	"""
+	print 'test_gmormodel_version'
+	
+	version = model.version
+	assert model.ready()
+	calls = []
+	check = model._res_sts_ready
+	model._res_sts_ready = lambda verbose=False: calls.append(verbose) or check(verbose)
+	assert model.ready() and model.res_sts_ready()
+	assert calls == []  # cached while the model is unchanged
+	assert model.version == version
+	
+	assert model.add_entity('Entity D', 'system')
+	assert model.version > version
+	assert not model.ready()  # Entity D has no dependencies
+	try:
+		model.ready(verbose=True)  # a cached failure still raises in verbose mode
+		assert False
+	except ValueError:
+		assert True
+	
+	assert model.add_dep('Entity D', 'Entity D')
+	assert model.set_res_sts('Entity D', np.array([0, 1]))
+	assert model.ready()
+	assert calls == [False]
+	
+	version = model.version
+	model.resource_limits['Entity C'] = -1  # direct edits are counted as well
+	assert model.version > version
+	assert not model.res_lm_ready()
+	model.resource_limits['Entity C'] = 1
+	assert model.ready()
+	
+	try:
+		model.resultant_states['Entity D'][1] = 2  # tables are read-only, so they cannot go stale
+		assert False
+	except ValueError:
+		assert True
+	table = PackedTruthTable([0, 1])
+	model.resultant_states['Entity D'] = table
+	assert model.res_sts_ready()
+	try:
+		table[1] = 0
+		assert False
+	except ValueError:
+		assert True
+	table.set_from_json(PackedTruthTable([1, 1, 0]).to_json())  # other in place changes are marked
+	assert model.res_sts_ready()
+	model.mark_changed()
+	assert not model.res_sts_ready()
+	
+	assert model.set_gate('Entity D', {'type': GATETYPE.OR, 'inputs': ['Entity D']})
+	assert model.ready()
+	model.gates['Entity D']['inputs'].append('Entity E')  # gates edited in place are seen
+	assert not model.gates_ready() and not model.ready()
+	model.gates['Entity D']['inputs'].pop()
+	assert model.ready()
+test_gmormodel_version.setup = setup3
+test_gmormodel_version.teardown = teardown
+
+
+
+def test_gmormodel_packed_truth_table():
+	"""
+	"""
+	print 'test_gmormodel_packed_truth_table'
+	
+	table = PackedTruthTable([0, 0, 1, 1])
+	assert len(table) == 4
+	assert table[2] == 1 and table[-4] == 0
+	assert list(table) == [0, 0, 1, 1]
+	table[0] = 1
+	assert (np.asarray(table) == np.array([1, 0, 1, 1])).all()
+	table[0] = 0
+	
+	assert model.valid_res_sts('Entity B', table)
+	assert not model.valid_res_sts('Entity B', PackedTruthTable([0, 1]))
+	assert model.set_res_sts('Entity B', table)
+	assert model.ready()
+	
+	table2 = PackedTruthTable()
+	table2.set_from_json(table.to_json())
+	assert table2 == table
+	try:
+		table2.set_from_json('{"length": 100, "words": "00"}')
+		assert False
+	except ValueError:
+		assert True
+	
+	# packed resultant states are written by formatted_json_text and read back
+	model2 = GMORModel()
+	assert model2.set_and_check_json(model.formatted_json_text())
+	assert isinstance(model2.resultant_states['Entity B'], PackedTruthTable)
+	assert model2.resultant_states['Entity B'] == table
+	
+	runner = GMORRunner(model)
+	assert list(runner.res_sts_flat[runner.res_sts_ptr[1]:runner.res_sts_ptr[2]]) == [0, 0, 1, 1]
+test_gmormodel_packed_truth_table.setup = setup3
+test_gmormodel_packed_truth_table.teardown = teardown
+
+
+
+def test_gmormodel_gates():
+	"""
+	"""
+	print 'test_gmormodel_gates'
+	
+	gate = {'type':'threshold', 'inputs':['Entity B', 'Entity C'], 'weights':[0.5, 0.5], 'threshold':1.0}
+	assert model.valid_gate('Entity B', gate)
+	assert not model.valid_gate('Entity B', {'type':'or', 'inputs':['Entity A']})
+	assert not model.valid_gate('Entity B', {'type':'k_of_n', 'inputs':['Entity B'], 'k':2})
+	try:
+		model.valid_gate('Entity B', {'type':'xor', 'inputs':['Entity B']}, True)
+		assert False
+	except ValueError:
+		assert True
+	
+	assert model.set_gate('Entity B', gate)
+	assert 'Entity B' not in model.resultant_states
+	assert model.ready()
+	
+	# gates are written by formatted_json_text and read back
+	model2 = GMORModel()
+	assert model2.set_and_check_json(model.formatted_json_text())
+	assert model2.gates == model.gates
+	
+	# the runner evaluates the gate as the table it replaces
+	runner = GMORRunner(model)
+	for system_state in [[0, 0, 0], [0, 1, 0], [0, 0, 1], [0, 1, 1]]:
+		assert runner._get_ent_resul_st_by_id(1, np.array(system_state)) == system_state[1]*system_state[2]
+		assert runner._get_sys_resul_sts(np.array(system_state, dtype=np.uint8))[1] == system_state[1]*system_state[2]
+	
+	# gates are evaluated bitwise across scenarios as they are one scenario at a time
+	states = np.array([[0, b, c] for b in range(2) for c in range(2)]*20, dtype=np.uint8)
+	inputs = ['Entity B', {'type':'or', 'inputs':['Entity C']}]
+	for packed_gate in [{'type':'and', 'inputs':inputs}, {'type':'or', 'inputs':inputs}, 
+	             {'type':'k_of_n', 'inputs':inputs+['Entity B'], 'k':2},
+	             {'type':'threshold', 'inputs':inputs, 'weights':[2, 3], 'threshold':2.5},
+	             {'type':'threshold', 'inputs':inputs, 'weights':[0.1, 0.1], 'threshold':0.2},
+	             {'type':'threshold', 'inputs':inputs, 'weights':[0.3, 0.7], 'threshold':0.7},
+	             {'type':'threshold', 'inputs':inputs, 'weights':[0, 0], 'threshold':0}]:
+		assert model.set_gate('Entity B', packed_gate)
+		runner = GMORRunner(model)
+		packed = runner._get_ent_resul_sts_packed(1, pack_lanes(states))
+		assert (unpack_lanes(packed[np.newaxis], len(states))[:, 0] == 
+		        [runner._get_ent_resul_st_by_id(1, state) for state in states]).all()
+	assert model.set_gate('Entity B', gate)
+	
+	# removing an input prunes the gate
+	model.del_dep('Entity B', 'Entity C')
+	assert model.gates['Entity B']['inputs'] == ['Entity B']
+	assert model.ready()
+test_gmormodel_gates.setup = setup3
+test_gmormodel_gates.teardown = teardown
+
+
+def test_gmormodel_compile_bdds():
+	"""
+	"""
+	print 'test_gmormodel_compile_bdds'
+	
+	manager = model.compile_bdds()
+	for ent in entities:
+		assert isinstance(model.resultant_states[ent], BDDTruthTable)
+		assert model.resultant_states[ent].manager is manager
+		assert (np.asarray(model.resultant_states[ent]) == resultant_states[ent]).all()
+	assert model.ready()
+	assert list(model.resultant_states['Entity B']) == [0, 0, 0, 1]
+	
+	# the runner evaluates the BDDs as the tables they replace
+	runner = GMORRunner(model)
+	for system_state in [[0, 0, 0], [0, 1, 0], [0, 0, 1], [0, 1, 1]]:
+		assert runner._get_ent_resul_st_by_id(1, np.array(system_state)) == system_state[1]*system_state[2]
+		assert runner._get_sys_resul_sts(np.array(system_state, dtype=np.uint8))[1] == system_state[1]*system_state[2]
+	
+	assert model.get_cut_sets('Entity B') == [['Entity B'], ['Entity C']]
+	assert model.get_up_probability('Entity B', {'Entity B':0.5, 'Entity C':0.8}) == 0.4
+	try:
+		model.get_up_probability('Entity B', {'Entity B':0.5})
+		assert False
+	except ValueError:
+		assert True
+	
+	# a k of n gate over 40 inputs takes a few hundred nodes rather than 2**40 states
+	manager = BDDManager()
+	inputs = ['Input %d' % k for k in range(40)]
+	root = manager.from_gate({'type':'k_of_n', 'inputs':inputs, 'k':30})
+	assert manager.count_nodes(root) == 30*11
+	root = manager.from_gate({'type':'k_of_n', 'inputs':inputs[:5], 'k':4})
+	assert len(manager.cut_sets(root)) == 10
+test_gmormodel_compile_bdds.setup = setup3
+test_gmormodel_compile_bdds.teardown = teardown
\ No newline at end of file
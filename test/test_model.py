@@ -17,6 +17,11 @@ from gmor.model import get_bin_lists
 from gmor.model import get_dec_from_bin_arr
 from gmor.model import valid_state
 from gmor.model import is_all_non_neg
+from gmor.model import pack_lanes
+from gmor.model import unpack_lanes
+from gmor.model import add_lanes
+from gmor.model import lanes_at_least
+import numpy as np
 
 def test_get_bin_list():
 	"""
@@ -88,3 +93,35 @@ def test_is_all_non_neg():
 	assert is_all_non_neg([1,0])
 	assert not is_all_non_neg([-1])
 	assert not is_all_non_neg([0,-1])
+	
+def test_pack_lanes():
+	"""
+	test_pack_lanes
+	"""
+	print 'test_pack_lanes'
+	
+	words = pack_lanes([[1, 0], [0, 0], [1, 1]])
+	assert words.dtype == np.uint64
+	assert lists_equal(words.shape, [2, 1])
+	assert words[0, 0] == 5 and words[1, 0] == 4
+	
+	states = np.array([[i % 2, (i//3) % 2, 1] for i in range(130)])
+	words = pack_lanes(states)
+	assert lists_equal(words.shape, [3, 3])
+	assert (unpack_lanes(words, 130) == states).all()
+
+def test_add_lanes():
+	"""
+	test_add_lanes
+	"""
+	print 'test_add_lanes'
+	
+	states = np.array([[i % 2, (i//2) % 2, (i//4) % 2] for i in range(100)])
+	weights = [1, 6, 3]
+	sums = states.dot(weights)
+	sum_words = add_lanes(pack_lanes(states), weights)
+	assert len(sum_words) == 4  # sums up to 10
+	assert (unpack_lanes(sum_words, 100).dot([1, 2, 4, 8]) == sums).all()
+	for k in [-1, 0, 1, 4, 7, 10, 11, 16]:
+		assert (unpack_lanes([lanes_at_least(sum_words, k, 2)], 100)[:, 0] == (sums >= k)).all()
+	assert add_lanes(pack_lanes(states), [0, 0, 0]) == []
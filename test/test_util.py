@@ -11,7 +11,7 @@ import nose2
 import numpy as np
 import copy
 from gmor.util import *
-from gmor.model import GMORModel
+from gmor.model import GMORModel, BDDManager, BDDTruthTable, GATETYPE
 
 def setup():
 	"""
@@ -66,6 +66,20 @@ def teardown():
 	model = GMORModel()
 	model2 = GMORModel()
 
+def gate_states(model, ent):
+	"""
+	the table of resultant states given by the gate of an entity, over its dependencies
+	"""
+	manager = BDDManager()
+	root = manager.from_gate(model.gates[ent])
+	return BDDTruthTable(manager, root, model.dependencies[ent]).to_array()
+
+def table_states(func, n_dep):
+	"""
+	the table of resultant states of func, called with the state of each dependency in order
+	"""
+	return np.array([int(func(*state)) for state in get_bin_lists(n_dep)])
+
 def test_lists_equal():
 	print 'test_lists_equal'
 	
@@ -130,6 +144,29 @@ def test_update_res_sts_after_treatment():
 test_update_res_sts_after_treatment.setup = setup
 test_update_res_sts_after_treatment.teardown = teardown
 
+def test_update_res_sts_after_treatment_gate():
+	print 'test_update_res_sts_after_treatment_gate'
+	
+	gates = {'Entity A':{'type':GATETYPE.AND, 'inputs':['Entity C', 'Entity D']},
+	         'Entity C':{'type':GATETYPE.OR, 'inputs':[{'type':GATETYPE.AND, 'inputs':['Entity B', 'Entity C']}]}}
+	cases = [('Entity A', 'Entity C', lambda a, c, d: (a or c) and d),
+	         ('Entity A', 'Entity D', lambda a, c, d: c and (a or d)),
+	         ('Entity C', 'Entity C', lambda a, b, c: b and (a or c))]
+	for ent, old_dep, func in cases:
+		gate_model = copy.deepcopy(model)
+		assert gate_model.set_gate(ent, gates[ent])
+		assert ordered_lists_equal(gate_states(gate_model, ent), model.resultant_states[ent])
+		gate_model.dependencies[ent].insert(0, 'Entity A')
+		update_res_sts_after_treatment(gate_model, ent, old_dep)
+		assert ent not in gate_model.resultant_states
+		assert gate_model.valid_gate(ent, gate_model.gates[ent])
+		assert ordered_lists_equal(gate_states(gate_model, ent), table_states(func, 3))
+	assert gate_model.gates['Entity C'] == {'type':GATETYPE.OR, 'inputs':[{'type':GATETYPE.AND, 'inputs':[
+		'Entity B', {'type':GATETYPE.OR, 'inputs':['Entity A', 'Entity C']}]}]}
+	assert gates['Entity C']['inputs'][0]['inputs'] == ['Entity B', 'Entity C']  # not changed in place
+test_update_res_sts_after_treatment_gate.setup = setup
+test_update_res_sts_after_treatment_gate.teardown = teardown
+
 def test_add_redundancy():
 	print 'test_add_redundancy'
 	
@@ -178,6 +215,29 @@ def test_add_redundancy():
 test_add_redundancy.setup = setup
 test_add_redundancy.teardown = teardown
 
+def test_add_redundancy_gate():
+	print 'test_add_redundancy_gate'
+	
+	gate_model = copy.deepcopy(model)
+	assert gate_model.set_gate('Entity A', {'type':GATETYPE.AND, 'inputs':['Entity C', 'Entity D']})
+	assert gate_model.set_gate('Entity D', {'type':GATETYPE.AND, 'inputs':['Entity C', 'Entity D']})
+	dense_model = add_redundancy(model, 'Entity D')
+	new_model = add_redundancy(gate_model, 'Entity D')
+	new_ent = 'Entity D red'
+	assert new_model.ready()
+	funcs = {'Entity A':lambda d_red, c, d: c and (d_red or d), 'Entity D':lambda c, d: c and d,
+	         new_ent:lambda c, d_red: c and d_red}
+	for ent in funcs.keys():
+		assert ordered_lists_equal(new_model.dependencies[ent], dense_model.dependencies[ent])
+		assert ent in new_model.gates and ent not in new_model.resultant_states
+		n_dep = len(new_model.dependencies[ent])
+		assert ordered_lists_equal(gate_states(new_model, ent), table_states(funcs[ent], n_dep))
+	assert new_model.gates[new_ent] == {'type':GATETYPE.AND, 'inputs':['Entity C', new_ent]}
+	assert ordered_lists_equal(new_model.resultant_states['Entity B'], dense_model.resultant_states['Entity B'])
+	assert gate_model.gates['Entity A'] == {'type':GATETYPE.AND, 'inputs':['Entity C', 'Entity D']}
+test_add_redundancy_gate.setup = setup
+test_add_redundancy_gate.teardown = teardown
+
 def test_add_flexibility():
 	print 'test_add_flexibility'
 	
@@ -313,4 +373,29 @@ def test_add_dispersion():
 	assert lists_equal(new_model.dependencies['Entity C'], dependencies['Entity C'])
 	assert lists_equal(new_model.dependencies['Entity D'], dependencies['Entity D'])
 test_add_dispersion.setup = setup
-test_add_dispersion.teardown = teardown
\ No newline at end of file
+test_add_dispersion.teardown = teardown
+
+def test_add_dispersion_gate():
+	print 'test_add_dispersion_gate'
+	
+	gate_model = copy.deepcopy(model)
+	assert gate_model.set_gate('Entity A', {'type':GATETYPE.AND, 'inputs':['Entity C', 'Entity D']})
+	assert gate_model.set_gate('Entity C', {'type':GATETYPE.AND, 'inputs':['Entity B', 'Entity C']})
+	
+	dis_model = GMORModel()
+	ents = ['Entity A', 'Entity B', 'Entity E']
+	types = {'Entity A':'time', 'Entity B':'event', 'Entity E':'function'}
+	pts = {'Entity A':'time', 'Entity B':'event', 'Entity E':'function'}
+	deps = {'Entity A':['Entity E'], 'Entity B':['Entity E'], 'Entity E':['Entity E']}
+	res_states = {'Entity A':np.array([0, 1]), 'Entity B':np.array([0, 1]), 'Entity E':np.array([0, 1])}
+	dis_model.set_and_check(ents, types, pts, deps, res_states, {}, {'Entity E':1.0})
+	
+	dense_model = add_dispersion(model, dis_model, ['Entity A', 'Entity B'])
+	new_model = add_dispersion(gate_model, dis_model, ['Entity A', 'Entity B'])
+	assert new_model.ready()
+	assert 'Entity A' not in new_model.gates  # replaced along with the rest of the dispersed entity
+	assert ordered_lists_equal(new_model.resultant_states['Entity A'], dense_model.resultant_states['Entity A'])
+	assert ordered_lists_equal(gate_states(new_model, 'Entity C'), table_states(lambda b, c: b and c, 2))
+	assert 'Entity A' in gate_model.gates
+test_add_dispersion_gate.setup = setup
+test_add_dispersion_gate.teardown = teardown
\ No newline at end of file